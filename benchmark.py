@@ -0,0 +1,489 @@
+import random
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+from bus import BusArbiter
+from cache import Cache, State
+from cacheManager import CacheManager
+from concurrency import ConcurrentCacheManager, ConcurrentParkingManager
+from memory import Memory
+from parking import ParkingLot
+from processor import Processor
+from replacement import POLICIES
+from replay import replay
+from sharding import ShardedParkingManager
+from simulator import Simulator
+from stats import WRITE_BACKS
+from workload import WorkloadGenerator
+
+
+def bench_search_scaling(sizes=(8, 64, 512, 4096, 32768, 65536), lookups=100000, seed=0):
+    """
+    Mede a latência média de Cache.search conforme o número de linhas cresce.
+
+    :param sizes: Tamanhos de cache (número de linhas) a serem medidos.
+    :param lookups: Número de buscas realizadas para cada tamanho.
+    :param seed: Semente do gerador aleatório usado para escolher os endereços.
+    :return: Lista de tuplas (tamanho, nanossegundos por busca).
+    """
+    rng = random.Random(seed)
+    results = []
+    for size in sizes:
+        cache = Cache(size)
+        for address in range(size):
+            cache.write(address, address, State.EXCLUSIVE)
+        addresses = [rng.randrange(size) for _ in range(lookups)]
+        search = cache.search
+        start = time.perf_counter_ns()
+        for address in addresses:
+            search(address)
+        elapsed = time.perf_counter_ns() - start
+        results.append((size, elapsed / lookups))
+    return results
+
+
+def bench_cache_memory(size=65536):
+    """
+    Mede a memória alocada por um cache cheio e o número de alocações feitas durante substituições.
+
+    :param size: Número de linhas do cache.
+    :return: Tupla (bytes por linha do cache cheio, bytes alocados em `size` substituições).
+    """
+    tracemalloc.start()
+    cache = Cache(size)
+    for address in range(size):
+        cache.write(address, address, State.EXCLUSIVE)
+    filled = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    for address in range(size, 2 * size):
+        cache.write(address, address, State.EXCLUSIVE)
+    replaced = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return filled / size, replaced
+
+
+def bench_coherence_modes(processor_counts=(2, 8, 32, 128), cache_size=64, memory_size=4096, operations=20000, seed=0):
+    """
+    Compara a vazão do CacheManager nos modos broadcast e diretório conforme o número de processadores cresce.
+
+    :param processor_counts: Quantidades de processadores a serem medidas.
+    :param cache_size: Número de linhas do cache de cada processador.
+    :param memory_size: Tamanho da memória principal.
+    :param operations: Número de operações (metade leituras, metade escritas) por medição.
+    :param seed: Semente do gerador aleatório.
+    :return: Lista de tuplas (processadores, operações/s broadcast, operações/s diretório).
+    """
+    results = []
+    for processors in processor_counts:
+        rates = []
+        for directory in (False, True):
+            rng = random.Random(seed)
+            memory = Memory(memory_size)
+            manager = CacheManager(memory, directory=directory)
+            for pid in range(processors):
+                manager.register_cache(pid, Cache(cache_size))
+            accesses = [(rng.randrange(processors), rng.randrange(memory_size), rng.random() < 0.5)
+                        for _ in range(operations)]
+            start = time.perf_counter()
+            for pid, address, is_read in accesses:
+                if is_read:
+                    manager.handle_read(pid, address, memory)
+                else:
+                    manager.handle_write(pid, address, pid + 1, memory)
+            elapsed = time.perf_counter() - start
+            rates.append(operations / elapsed)
+        results.append((processors, rates[0], rates[1]))
+    return results
+
+
+def bench_replacement_policies(cache_size=256, address_space=2048, operations=200000, seed=0):
+    """
+    Compara taxa de acerto e vazão das políticas de substituição sobre a mesma sequência de acessos.
+    Metade dos acessos vai para 10% dos endereços, para que haja reuso a ser aproveitado.
+
+    :param cache_size: Número de linhas do cache.
+    :param address_space: Número de endereços distintos acessados.
+    :param operations: Número de acessos.
+    :param seed: Semente do gerador aleatório.
+    :return: Lista de tuplas (política, taxa de acerto, acessos/s).
+    """
+    rng = random.Random(seed)
+    hot = max(1, address_space // 10)
+    accesses = [rng.randrange(hot) if rng.random() < 0.5 else rng.randrange(address_space) for _ in range(operations)]
+    results = []
+    for policy in sorted(POLICIES):
+        cache = Cache(cache_size, policy, seed)
+        hits = 0
+        start = time.perf_counter()
+        for address in accesses:
+            if cache.search(address):
+                hits += 1
+            cache.write(address, address, State.MODIFIED)
+        elapsed = time.perf_counter() - start
+        results.append((policy, hits / operations, operations / elapsed))
+    return results
+
+
+def bench_geometries(geometries=((64, None, 1), (64, 8, 1), (64, 2, 1), (64, 8, 4), (64, 4, 8), (256, 8, 4)),
+                     processors=4, memory_size=4096, operations=50000, seed=0):
+    """
+    Mede taxa de acerto no próprio cache e vazão do CacheManager para diferentes geometrias de cache,
+    com acessos sequenciais em trechos curtos para que blocos maiores aproveitem a localidade espacial.
+
+    :param geometries: Tuplas (linhas, linhas por conjunto, endereços por bloco); None indica totalmente associativo.
+    :param processors: Número de processadores.
+    :param memory_size: Tamanho da memória principal.
+    :param operations: Número de acessos (70% leituras).
+    :param seed: Semente do gerador aleatório.
+    :return: Lista de tuplas (linhas, linhas por conjunto, endereços por bloco, taxa de acerto, acessos/s).
+    """
+    rng = random.Random(seed)
+    accesses = []
+    while len(accesses) < operations:
+        pid, start = rng.randrange(processors), rng.randrange(memory_size - 16)
+        for offset in range(rng.randrange(1, 16)):
+            accesses.append((pid, start + offset, rng.random() < 0.7))
+    results = []
+    for size, ways, block_size in geometries:
+        memory = Memory(memory_size)
+        manager = CacheManager(memory)
+        for pid in range(processors):
+            manager.register_cache(pid, Cache(size, 'lru', seed, ways, block_size))
+        hits = 0
+        start = time.perf_counter()
+        for pid, address, is_read in accesses:
+            line = manager.caches[pid].search(address)
+            if line and line.state != State.INVALID:
+                hits += 1
+            if is_read:
+                manager.handle_read(pid, address, memory)
+            else:
+                manager.handle_write(pid, address, pid + 1, memory)
+        elapsed = time.perf_counter() - start
+        results.append((size, ways or size, block_size, hits / len(accesses), len(accesses) / elapsed))
+    return results
+
+
+def bench_concurrent_parking(worker_counts=(1, 2, 4, 8, 16, 32, 64), operations_per_worker=2000, num_slots=512,
+                             cache_size=64, ways=4, seed=0):
+    """
+    Teste de estresse do modo multi-thread: cada trabalhador é uma thread com seu próprio processador,
+    estacionando, removendo, mudando e verificando carros no mesmo estacionamento. Ao final, confere que
+    nenhuma vaga foi ocupada duas vezes e que o conteúdo visto pela coerência corresponde ao estacionamento.
+
+    :param worker_counts: Quantidades de threads a serem medidas.
+    :param operations_per_worker: Número de operações de cada thread.
+    :param num_slots: Número de vagas (e de endereços da memória).
+    :param cache_size: Número de linhas do cache de cada processador.
+    :param ways: Linhas por conjunto; cada conjunto tem sua própria trava.
+    :param seed: Semente dos geradores aleatórios.
+    :return: Lista de tuplas (threads, operações/s, erros de consistência encontrados).
+    """
+    results = []
+    for workers in worker_counts:
+        memory = Memory(num_slots)
+        cache_manager = ConcurrentCacheManager(memory, directory=True)
+        parking_lot = ParkingLot(num_slots)
+        parking_manager = ConcurrentParkingManager(parking_lot, cache_manager)
+        processors = [Processor(pid, cache_size, memory, cache_manager, ways=ways) for pid in range(1, workers + 1)]
+        failures = []
+
+        def worker(processor_id):
+            rng = random.Random(seed * 1000 + processor_id)
+            try:
+                for _ in range(operations_per_worker):
+                    op = rng.random()
+                    slot = rng.randrange(num_slots)
+                    car = rng.randrange(1, num_slots)  # Carros compartilhados entre as threads
+                    if op < 0.3:
+                        parking_manager.park_car_result(processor_id, car, slot)
+                    elif op < 0.4:
+                        parking_manager.park_any_result(processor_id, car)
+                    elif op < 0.7:
+                        parking_manager.remove_car_result(processor_id, slot)
+                    elif op < 0.8:
+                        parking_manager.move_car_result(processor_id, slot, rng.randrange(num_slots))
+                    else:
+                        parking_manager.check_slot_result(processor_id, slot)
+            except Exception as error:  # Vaga ocupada duas vezes ou carro em duas vagas
+                failures.append(error)
+
+        threads = [threading.Thread(target=worker, args=(processor.id,)) for processor in processors]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        errors = len(failures)
+        seen = {}
+        for slot in parking_lot.slots:
+            car_id = slot.occupied_by.id if slot.occupied_by else 0
+            if car_id and (car_id in seen or parking_lot.car_slots.get(car_id) != slot.id):
+                errors += 1
+            seen[car_id] = slot.id
+            if cache_manager.handle_read(processors[0].id, slot.id, memory)[0] != car_id:
+                errors += 1
+        results.append((workers, workers * operations_per_worker / elapsed, errors))
+    return results
+
+
+def bench_bus_contention(processor_counts=(1, 2, 4, 8, 16), operations_per_processor=2000, cache_size=32,
+                         shared_addresses=64, private_addresses=256, shared_fraction=0.3, seed=0):
+    """
+    Simula a contenção no barramento com o árbitro asyncio: cada processador lê e escreve em endereços
+    privados e compartilhados, e mede-se os ciclos simulados, a utilização do barramento e o atraso médio na
+    fila, sem e com pipeline.
+
+    :param processor_counts: Quantidades de processadores a serem medidas.
+    :param operations_per_processor: Número de operações de cada processador.
+    :param cache_size: Número de linhas do cache de cada processador.
+    :param shared_addresses: Número de endereços acessados por todos os processadores.
+    :param private_addresses: Número de endereços privados de cada processador.
+    :param shared_fraction: Fração dos acessos que vão para endereços compartilhados.
+    :param seed: Semente do gerador aleatório.
+    :return: Lista de tuplas (processadores, com pipeline, ciclos, utilização, atraso médio na fila).
+    """
+    results = []
+    for processors in processor_counts:
+        rng = random.Random(seed)
+        workloads = {}
+        for pid in range(processors):
+            base = shared_addresses + pid * private_addresses
+            workloads[pid] = [('read' if rng.random() < 0.7 else 'write',
+                               rng.randrange(shared_addresses) if rng.random() < shared_fraction
+                               else base + rng.randrange(private_addresses), pid + 1)
+                              for _ in range(operations_per_processor)]
+        for pipelined in (False, True):
+            memory = Memory(shared_addresses + processors * private_addresses)
+            manager = CacheManager(memory, directory=True)
+            for pid in range(processors):
+                manager.register_cache(pid, Cache(cache_size, 'lru'))
+            report = BusArbiter(manager, pipelined=pipelined).run(workloads)
+            delays = [p['mean_queue_delay'] for p in report['processors'].values()]
+            results.append((processors, pipelined, report['cycles'], report['bus_utilization'],
+                            sum(delays) / len(delays)))
+    return results
+
+
+def bench_write_buffer(capacities=(0, 4, 16, 64, 256), operations=50000, processors=4, num_slots=256, cache_size=16,
+                       seed=0):
+    """
+    Mede quanto tráfego de escrita na memória o buffer de escrita remove numa carga de chegadas e saídas
+    (park/remove) com horários de pico. Cada medição termina com fence, para que as escritas pendentes sejam
+    contadas.
+
+    :param capacities: Capacidades do buffer a serem medidas (0 para sem buffer).
+    :param operations: Número de operações da carga.
+    :param processors: Número de processadores.
+    :param num_slots: Número de vagas (e de endereços da memória).
+    :param cache_size: Número de linhas do cache de cada processador.
+    :param seed: Semente do gerador de carga.
+    :return: Lista de tuplas (capacidade, escritas na memória, escritas coalescidas, leituras atendidas pelo buffer,
+             operações/s).
+    """
+    records = list(WorkloadGenerator(processors, num_slots, seed, operations, read_ratio=0.2, rush_period=5000,
+                                     rush_length=1500))
+    results = []
+    for capacity in capacities:
+        simulator = Simulator(processors, cache_size, num_slots, num_slots, directory=True, policy='lru',
+                              write_buffer=capacity)
+        manager = simulator.cache_manager
+        start = time.perf_counter()
+        replay(simulator, records)
+        manager.fence()
+        elapsed = time.perf_counter() - start
+        buffer = manager.write_buffer
+        results.append((capacity, manager.stats.memory_writes, buffer.coalesced if buffer else 0,
+                        buffer.read_hits if buffer else 0, len(records) / elapsed))
+    return results
+
+
+def bench_import_time(modules=('simulator', 'replay', 'sweep', 'main', 'interface'), repeats=5):
+    """
+    Mede o tempo de importação a frio de cada módulo, num interpretador novo a cada repetição
+    (python -X importtime), e verifica se o Tk foi carregado.
+
+    :param modules: Módulos a serem medidos.
+    :param repeats: Número de repetições; o menor tempo é mantido.
+    :return: Lista de tuplas (módulo, milissegundos, Tk importado).
+    """
+    results = []
+    for module in modules:
+        best = None
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                    capture_output=True, text=True, check=True).stderr
+            imported = {line.split("|")[-1].strip(): int(line.split("|")[1]) for line in output.splitlines()
+                        if line.startswith("import time:") and not line.endswith("package")}
+            best = imported[module] if best is None else min(best, imported[module])
+        results.append((module, best / 1000, "tkinter" in imported))
+    return results
+
+
+def bench_sharding(shard_counts=(1, 2, 4, 8), operations=200000, processors=4, num_slots=4096, cache_size=64, seed=0):
+    """
+    Mede a vazão agregada do estacionamento dividido em shards, cada um num processo próprio. A vazão só cresce
+    com o número de shards se houver núcleos livres para os processos.
+
+    :param shard_counts: Números de shards a serem medidos.
+    :param operations: Número de operações da carga.
+    :param processors: Número de processadores de cada shard.
+    :param num_slots: Número total de vagas.
+    :param cache_size: Número de linhas do cache de cada processador, em cada shard.
+    :param seed: Semente do gerador de carga.
+    :return: Lista de tuplas (shards, operações/s).
+    """
+    records = list(WorkloadGenerator(processors, num_slots, seed, operations, move_ratio=0.1))
+    results = []
+    for shards in shard_counts:
+        with ShardedParkingManager(shards, num_slots, processes=True, num_processors=processors,
+                                   cache_size=cache_size, directory=True) as manager:
+            start = time.perf_counter()
+            for _ in manager.run(records):
+                pass
+            elapsed = time.perf_counter() - start
+        results.append((shards, len(records) / elapsed))
+    return results
+
+
+def bench_batch_operations(processor_counts=(4, 32, 128), events=20, cars_per_event=1000, num_slots=4096,
+                           cache_size=256, seed=0):
+    """
+    Compara, em eventos de entrada e saída em massa (estacionar, verificar e remover muitos carros de um
+    processador), as operações uma a uma com park_many, check_many e remove_many, no modo broadcast.
+
+    :param processor_counts: Números de processadores a serem medidos.
+    :param events: Número de eventos.
+    :param cars_per_event: Número de carros de cada evento.
+    :param num_slots: Número de vagas (e de endereços da memória).
+    :param cache_size: Número de linhas do cache de cada processador.
+    :param seed: Semente da escolha de processadores e vagas.
+    :return: Lista de tuplas (processadores, operações/s uma a uma, operações/s em lote).
+    """
+    results = []
+    for processors in processor_counts:
+        rates = []
+        for batched in (False, True):
+            rng = random.Random(seed)
+            parking_manager = Simulator(processors, cache_size, num_slots, num_slots, policy='lru').parking_manager
+            start = time.perf_counter()
+            for event in range(events):
+                pid = rng.randrange(1, processors + 1)
+                slots = rng.sample(range(num_slots), cars_per_event)
+                cars = range(event * cars_per_event + 1, (event + 1) * cars_per_event + 1)
+                if batched:
+                    parking_manager.park_many(pid, zip(cars, slots))
+                    parking_manager.check_many(pid, slots)
+                    parking_manager.remove_many(pid, slots)
+                else:
+                    for car_id, slot_id in zip(cars, slots):
+                        parking_manager.park_car_result(pid, car_id, slot_id)
+                    for slot_id in slots:
+                        parking_manager.check_slot_result(pid, slot_id)
+                    for slot_id in slots:
+                        parking_manager.remove_car_result(pid, slot_id)
+            rates.append(3 * events * cars_per_event / (time.perf_counter() - start))
+        results.append((processors, rates[0], rates[1]))
+    return results
+
+
+def bench_protocols(protocols=(None, 'mesi', 'moesi', 'mesif'), operations=100000, processors=8, num_slots=512,
+                    cache_size=32, seed=0):
+    """
+    Compara os protocolos de coerência numa carga de estacionamento com vagas populares (Zipf): tráfego com a
+    memória, transferências entre caches e a latência simulada no barramento (BusArbiter), em que as escritas
+    de park, remove e move viram escritas nas vagas e as verificações viram leituras.
+
+    :param protocols: Protocolos a serem medidos (None para a implementação MESI original).
+    :param operations: Número de operações da carga.
+    :param processors: Número de processadores.
+    :param num_slots: Número de vagas (e de endereços da memória).
+    :param cache_size: Número de linhas do cache de cada processador.
+    :param seed: Semente do gerador de carga.
+    :return: Lista de tuplas (protocolo, leituras na memória, escritas na memória, write-backs, leituras atendidas
+             por outro cache, ciclos simulados, operações/s).
+    """
+    records = list(WorkloadGenerator(processors, num_slots, seed, operations, read_ratio=0.6, distribution='zipf',
+                                     move_ratio=0.1))
+    workloads = {pid: [] for pid in range(1, processors + 1)}
+    for pid, op, slot, value in records:
+        if op in ('read', 'check'):
+            workloads[pid].append(('read', slot, 0))
+        elif op == 'move':
+            workloads[pid].append(('write', slot, 0))
+            workloads[pid].append(('write', value, pid))
+        else:
+            workloads[pid].append(('write', slot, 0 if op == 'remove' else value))
+    results = []
+    for protocol in protocols:
+        simulator = Simulator(processors, cache_size, num_slots, num_slots, directory=True, policy='lru',
+                              protocol=protocol)
+        manager = simulator.cache_manager
+        start = time.perf_counter()
+        replay(simulator, records)
+        elapsed = time.perf_counter() - start
+        stats = manager.stats
+        write_backs = sum(counters[WRITE_BACKS] for counters in stats.processors.values())
+        bus_manager = Simulator(processors, cache_size, num_slots, num_slots, directory=True, policy='lru',
+                                protocol=protocol).cache_manager
+        cycles = BusArbiter(bus_manager).run(workloads)['cycles']
+        results.append((protocol or 'original', stats.memory_reads, stats.memory_writes, write_backs,
+                        stats.transactions['RH'], cycles, len(records) / elapsed))
+    return results
+
+
+if __name__ == "__main__":
+    print("Cache.search: latência por busca")
+    for size, ns in bench_search_scaling():
+        print(f"{size:>8} linhas: {ns:8.1f} ns")
+    print()
+    per_line, replaced = bench_cache_memory()
+    print(f"Cache de 65536 linhas: {per_line:.1f} bytes/linha, {replaced} bytes alocados em 65536 substituições")
+    print()
+    print("CacheManager: operações/s (broadcast x diretório)")
+    for processors, broadcast, directory in bench_coherence_modes():
+        print(f"{processors:>8} processadores: {broadcast:10.0f} {directory:10.0f}")
+    print()
+    print("Políticas de substituição: taxa de acerto e acessos/s")
+    for policy, hit_rate, rate in bench_replacement_policies():
+        print(f"{policy:>8}: {hit_rate:6.1%} {rate:10.0f}")
+    print()
+    print("Geometrias (linhas x vias x bloco): taxa de acerto e acessos/s")
+    for size, ways, block_size, hit_rate, rate in bench_geometries():
+        print(f"{size:>5} x {ways:>3} x {block_size:>2}: {hit_rate:6.1%} {rate:10.0f}")
+    print()
+    print("Estacionamento multi-thread: operações/s e erros de consistência")
+    for workers, rate, errors in bench_concurrent_parking():
+        print(f"{workers:>3} threads: {rate:10.0f} {errors:>3} erros")
+    print()
+    print("Barramento simulado: ciclos, utilização e atraso médio na fila")
+    for processors, pipelined, cycles, utilization, delay in bench_bus_contention():
+        mode = "pipeline" if pipelined else "serial"
+        print(f"{processors:>3} processadores ({mode:>8}): {cycles:>9} ciclos {utilization:6.1%} {delay:8.1f}")
+    print()
+    print("Tempo de importação a frio (ms) e se o Tk é carregado")
+    for module, milliseconds, tk_loaded in bench_import_time():
+        print(f"{module:>10}: {milliseconds:6.1f} ms {'Tk' if tk_loaded else ''}")
+    print()
+    print("Buffer de escrita (chegadas e saídas): escritas na memória, coalescidas, leituras do buffer e operações/s")
+    for capacity, writes, coalesced, read_hits, rate in bench_write_buffer():
+        print(f"{capacity:>4} endereços: {writes:>7} {coalesced:>7} {read_hits:>7} {rate:10.0f}")
+    print()
+    print("Estacionamento em shards (um processo por shard): operações/s")
+    for shards, rate in bench_sharding():
+        print(f"{shards:>3} shards: {rate:10.0f}")
+    print()
+    print("Entradas e saídas em massa: operações/s uma a uma x em lote")
+    for processors, single, batched in bench_batch_operations():
+        print(f"{processors:>4} processadores: {single:10.0f} {batched:10.0f}")
+    print()
+    print("Protocolos (carga Zipf): leituras e escritas na memória, write-backs, leituras de outro cache, ciclos, "
+          "operações/s")
+    for name, reads, writes, write_backs, transfers, cycles, rate in bench_protocols():
+        print(f"{name:>8}: {reads:>7} {writes:>7} {write_backs:>7} {transfers:>7} {cycles:>10} {rate:10.0f}")
@@ -0,0 +1,297 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+
+from cache import Cache, State
+from cacheManager import CacheManager
+from memory import Memory
+from replay import replay
+from simulator import Simulator
+from workload import WorkloadGenerator
+
+# Casos registrados: nome -> função de preparação (veja case)
+CASES = {}
+
+def case(name):
+    """
+    Registra um caso do conjunto de benchmarks.
+
+    A função registrada recebe a semente e um fator de escala, prepara todo o estado necessário (fora da
+    medição) e retorna uma tupla (função a ser medida, número de operações que ela executa).
+
+    :param name: Nome do caso, usado nas linhas de base.
+    :return: Decorador.
+    """
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+def scaled(operations, scale):
+    """
+    Ajusta o número de operações de um caso pelo fator de escala.
+
+    :param operations: Número de operações na escala 1.
+    :param scale: Fator de escala.
+    :return: Número de operações ajustado (pelo menos 1).
+    """
+    return max(1, int(operations * scale))
+
+@case('cache.search')
+def setup_cache_search(seed, scale):
+    cache = Cache(4096, 'lru')
+    for address in range(4096):
+        cache.write(address, address, State.EXCLUSIVE)
+    rng = random.Random(seed)
+    addresses = [rng.randrange(8192) for _ in range(scaled(200000, scale))]  # Metade acertos, metade faltas
+    search = cache.search
+
+    def run():
+        for address in addresses:
+            search(address)
+    return run, len(addresses)
+
+@case('cache.write')
+def setup_cache_write(seed, scale):
+    cache = Cache(1024, 'lru', seed, 8)
+    rng = random.Random(seed)
+    addresses = [rng.randrange(4096) for _ in range(scaled(100000, scale))]
+    write = cache.write
+
+    def run():
+        for address in addresses:
+            write(address, address, State.MODIFIED)
+    return run, len(addresses)
+
+@case('cache.replace_line_in_cache')
+def setup_cache_replace(seed, scale):
+    cache = Cache(1024, 'fifo')
+    for address in range(1024):
+        cache.write(address, address, State.EXCLUSIVE)
+    operations = scaled(100000, scale)
+    replace = cache.replace_line_in_cache
+
+    def run():
+        for address in range(1024, 1024 + operations):
+            replace(address, address, State.EXCLUSIVE)
+    return run, operations
+
+@case('memory.read_write')
+def setup_memory(seed, scale):
+    memory = Memory(65536)
+    rng = random.Random(seed)
+    addresses = [rng.randrange(65536) for _ in range(scaled(200000, scale))]
+    read, write = memory.read, memory.write
+
+    def run():
+        for address in addresses:
+            write(address, read(address) + 1)
+    return run, len(addresses)
+
+@case('memory.block')
+def setup_memory_block(seed, scale):
+    memory = Memory(65536)
+    rng = random.Random(seed)
+    addresses = [rng.randrange(65536 // 8) * 8 for _ in range(scaled(100000, scale))]
+
+    def run():
+        for address in addresses:
+            memory.write_block(address, memory.read_block(address, 8))
+    return run, len(addresses)
+
+def setup_cache_manager(processors, directory, seed, scale):
+    """
+    Prepara um caso de CacheManager: 70% leituras e 30% escritas aleatórias de todos os processadores.
+
+    :param processors: Número de processadores.
+    :param directory: Se True, usa o modo diretório.
+    :param seed: Semente do gerador aleatório.
+    :param scale: Fator de escala do número de operações.
+    :return: Tupla (função a ser medida, número de operações).
+    """
+    memory = Memory(8192)
+    manager = CacheManager(memory, directory=directory)
+    for pid in range(processors):
+        manager.register_cache(pid, Cache(64, 'lru', seed, 8))
+    rng = random.Random(seed)
+    accesses = [(rng.randrange(processors), rng.randrange(8192), rng.random() < 0.7)
+                for _ in range(scaled(50000, scale))]
+    handle_read, handle_write = manager.handle_read, manager.handle_write
+
+    def run():
+        for pid, address, is_read in accesses:
+            if is_read:
+                handle_read(pid, address, memory)
+            else:
+                handle_write(pid, address, pid + 1, memory)
+    return run, len(accesses)
+
+for _processors in (2, 8, 32, 128):
+    for _directory, _mode in ((False, 'broadcast'), (True, 'directory')):
+        case(f'cache_manager.{_mode}.p{_processors}')(
+            lambda seed, scale, processors=_processors, directory=_directory:
+                setup_cache_manager(processors, directory, seed, scale))
+
+def setup_parking(seed, scale, **workload):
+    """
+    Prepara um caso de ponta a ponta: um trace de WorkloadGenerator reproduzido no simulador.
+
+    :param seed: Semente do gerador de carga e das políticas.
+    :param scale: Fator de escala do número de operações.
+    :param workload: Parâmetros adicionais de WorkloadGenerator.
+    :return: Tupla (função a ser medida, número de operações).
+    """
+    simulator = Simulator(8, 16, 1024, 1024, directory=True, policy='lru', seed=seed, ways=4)
+    records = list(WorkloadGenerator(8, 1024, seed, scaled(50000, scale), **workload))
+
+    def run():
+        replay(simulator, records)
+    return run, len(records)
+
+case('parking.uniform')(lambda seed, scale: setup_parking(seed, scale))
+case('parking.zipf_affinity')(lambda seed, scale: setup_parking(seed, scale, distribution='zipf', affinity=0.8))
+case('parking.rush_hour')(lambda seed, scale: setup_parking(seed, scale, read_ratio=0.3, rush_period=5000,
+                                                            rush_length=1500))
+
+def measure(setup, seed=0, scale=1.0, repeats=5):
+    """
+    Mede um caso, repetindo-o com estado novo a cada vez e guardando o menor tempo, que é o menos afetado
+    por ruído do sistema. A coleta de lixo fica desligada durante cada medição.
+
+    :param setup: Função de preparação do caso.
+    :param seed: Semente passada à preparação.
+    :param scale: Fator de escala do número de operações.
+    :param repeats: Número de repetições.
+    :return: Tupla (nanossegundos por operação, número de operações).
+    """
+    best = None
+    for _ in range(repeats):
+        run, operations = setup(seed, scale)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            run()
+            elapsed = time.perf_counter_ns() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best / operations, operations
+
+def run_suite(names=None, seed=0, scale=1.0, repeats=5, progress=None):
+    """
+    Executa os casos do conjunto.
+
+    :param names: Nomes dos casos a executar. Se None, executa todos.
+    :param seed: Semente dos casos.
+    :param scale: Fator de escala do número de operações.
+    :param repeats: Número de repetições de cada caso.
+    :param progress: Função chamada com (nome, ns por operação) ao fim de cada caso, ou None.
+    :return: Dicionário nome -> {'ns_per_op': ..., 'operations': ...}.
+    :raises ValueError: Se um nome não corresponder a nenhum caso.
+    """
+    names = list(CASES) if names is None else names
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError(f"Casos desconhecidos: {', '.join(unknown)}")
+    results = {}
+    for name in names:
+        ns_per_op, operations = measure(CASES[name], seed, scale, repeats)
+        results[name] = {'ns_per_op': round(ns_per_op, 2), 'operations': operations}
+        if progress is not None:
+            progress(name, ns_per_op)
+    return results
+
+def save_baseline(results, path):
+    """
+    Salva resultados como linha de base em JSON, junto com a identificação do ambiente em que foram medidos.
+
+    :param results: Resultados de run_suite.
+    :param path: Arquivo de destino.
+    """
+    baseline = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(path, 'w') as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+
+def load_baseline(path):
+    """
+    Carrega uma linha de base salva por save_baseline.
+
+    :param path: Arquivo da linha de base.
+    :return: Dicionário nome -> {'ns_per_op': ..., 'operations': ...}.
+    """
+    with open(path) as file:
+        return json.load(file)['results']
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Compara resultados com uma linha de base. Casos ausentes em um dos lados são ignorados.
+
+    :param results: Resultados de run_suite.
+    :param baseline: Resultados da linha de base.
+    :param threshold: Aumento relativo do tempo por operação a partir do qual há regressão (0.2 = 20%).
+    :return: Lista de tuplas (nome, ns por operação na base, ns por operação agora, razão, regressão),
+             na ordem dos resultados.
+    """
+    rows = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result['ns_per_op'] / base['ns_per_op'] if base['ns_per_op'] else float('inf')
+        rows.append((name, base['ns_per_op'], result['ns_per_op'], ratio, ratio > 1 + threshold))
+    return rows
+
+def main(argv=None):
+    """
+    Ponto de entrada de linha de comando: executa o conjunto, opcionalmente salva a linha de base e compara
+    com uma linha de base anterior. Termina com código 1 se houver regressão.
+    """
+    parser = argparse.ArgumentParser(description="Conjunto de benchmarks do simulador MESI com linhas de base.")
+    parser.add_argument("cases", nargs="*", help="Casos a executar (padrão: todos); aceita prefixos como 'cache.'")
+    parser.add_argument("--list", action="store_true", help="Lista os casos e termina")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="Fator de escala do número de operações")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="Salva os resultados como linha de base neste arquivo JSON")
+    parser.add_argument("--baseline", help="Linha de base JSON com a qual comparar")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Aumento relativo considerado regressão")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        return 0
+    names = None
+    if args.cases:
+        names = [name for name in CASES if any(name == c or name.startswith(c) for c in args.cases)]
+        if not names:
+            parser.error(f"Nenhum caso corresponde a {' '.join(args.cases)}")
+
+    results = run_suite(names, args.seed, args.scale, args.repeats,
+                        lambda name, ns: print(f"{name:<36} {ns:12.1f} ns/op", flush=True))
+    if args.save:
+        save_baseline(results, args.save)
+    if not args.baseline:
+        return 0
+
+    rows = compare(results, load_baseline(args.baseline), args.threshold)
+    print()
+    print(f"Comparação com {args.baseline} (limite de {args.threshold:.0%}):")
+    for name, base, now, ratio, regression in rows:
+        flag = "REGRESSÃO" if regression else ""
+        print(f"{name:<36} {base:12.1f} {now:12.1f} {ratio:6.2f}x {flag}")
+    regressions = sum(row[4] for row in rows)
+    print(f"Regressões: {regressions}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
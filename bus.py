@@ -0,0 +1,229 @@
+import asyncio
+import heapq
+
+from cache import State
+
+class BusCosts:
+    """
+    Custos, em ciclos, de cada tipo de transação no barramento.
+    """
+    def __init__(self, hit=1, cache_to_cache=20, memory_read=100, write_back=100, upgrade=10, address_phase=2):
+        """
+        Inicializa os custos.
+
+        :param hit: Acerto no próprio cache (não usa o barramento).
+        :param cache_to_cache: Transferência de uma linha a partir de outro cache.
+        :param memory_read: Leitura de uma linha da memória principal.
+        :param write_back: Escrita de uma linha na memória principal.
+        :param upgrade: Pedido de exclusividade para uma linha já presente (invalidação das outras cópias).
+        :param address_phase: Ciclos em que o barramento fica ocupado por transação no modo com pipeline.
+        """
+        self.hit = hit
+        self.cache_to_cache = cache_to_cache
+        self.memory_read = memory_read
+        self.write_back = write_back
+        self.upgrade = upgrade
+        self.address_phase = address_phase
+
+class ProcessorTiming:
+    """
+    Relógio simulado e métricas de um processador.
+    """
+    def __init__(self, processor_id):
+        """
+        Inicializa o relógio e as métricas zerados.
+
+        :param processor_id: Identificador do processador.
+        """
+        self.processor_id = processor_id
+        self.clock = 0
+        self.operations = 0
+        self.bus_requests = 0
+        self.queue_delay = 0
+
+class BusArbiter:
+    """
+    Barramento de snooping simulado com asyncio. Cada processador é uma corrotina que executa sua carga de
+    trabalho e envia cada operação ao árbitro, que as executa em ordem de chegada no tempo simulado. Acertos
+    locais só avançam o relógio do próprio processador; as demais operações usam o barramento, um de cada vez
+    (serializado) ou sobrepondo as latências e ocupando o barramento apenas na fase de endereço (com pipeline).
+
+    As transições de coerência continuam sendo feitas pelo CacheManager; o árbitro apenas decide quando
+    cada transação acontece e quanto custa.
+    """
+    def __init__(self, cache_manager, costs=None, pipelined=False):
+        """
+        Inicializa o árbitro.
+
+        :param cache_manager: Instância de CacheManager cujos caches serão usados.
+        :param costs: Instância de BusCosts. Se None, usa os custos padrão.
+        :param pipelined: Se True, transações sobrepõem suas latências no barramento.
+        """
+        self.cache_manager = cache_manager
+        self.costs = BusCosts() if costs is None else costs
+        self.pipelined = pipelined
+        self.timings = {}
+        self.bus_free_at = 0
+        self.busy_cycles = 0
+        self.active = 0  # Processadores que ainda têm operações a executar
+
+    def classify_read(self, processor_id, address):
+        """
+        Verifica se uma leitura pode ser atendida pelo próprio cache, sem usar o barramento.
+
+        :param processor_id: Identificador do processador.
+        :param address: Endereço lido.
+        :return: True para acerto local.
+        """
+        line = self.cache_manager.caches[processor_id].search(address)
+        return bool(line) and line.state != State.INVALID
+
+    def classify_write(self, processor_id, address):
+        """
+        Determina o custo de barramento de uma escrita antes de ela ser executada.
+
+        :param processor_id: Identificador do processador.
+        :param address: Endereço escrito.
+        :return: Ciclos de barramento da escrita (0 quando a linha já está em MODIFIED ou EXCLUSIVE).
+        """
+        line = self.cache_manager.caches[processor_id].search(address)
+        if line and line.state in (State.MODIFIED, State.EXCLUSIVE):
+            return 0
+        if line and line.state in (State.SHARED, State.OWNED, State.FORWARD):
+            return self.costs.upgrade
+        for _, _, other in self.cache_manager.caches_holding(address, processor_id):
+            if other.state != State.INVALID:
+                return self.costs.cache_to_cache
+        return self.costs.memory_read
+
+    def execute(self, processor_id, op, address, value):
+        """
+        Executa uma operação no CacheManager e calcula seu custo de barramento.
+
+        :param processor_id: Identificador do processador.
+        :param op: 'read' ou 'write'.
+        :param address: Endereço acessado.
+        :param value: Valor escrito (ignorado nas leituras).
+        :return: Ciclos de barramento da operação (0 quando ela é atendida pelo próprio cache sem tráfego, como
+                 as leituras de linhas válidas e as escritas em MODIFIED ou EXCLUSIVE que não vão à memória).
+        """
+        manager = self.cache_manager
+        memory = manager.memory
+        writes_before = manager.stats.memory_writes
+        if op == 'read':
+            local = self.classify_read(processor_id, address)
+            _, transaction = manager.handle_read(processor_id, address, memory)
+            if local:
+                cost = 0
+            else:
+                cost = self.costs.cache_to_cache if transaction == 'RH' else self.costs.memory_read
+        else:
+            cost = self.classify_write(processor_id, address)
+            manager.handle_write(processor_id, address, value, memory)
+        return cost + (manager.stats.memory_writes - writes_before) * self.costs.write_back
+
+    async def processor_task(self, processor_id, operations, requests, wakeup):
+        """
+        Corrotina de um processador: envia cada operação ao árbitro e espera que ela seja executada. Mesmo os
+        acertos locais passam pelo árbitro, para serem executados na ordem do tempo simulado: um acerto num
+        instante posterior a uma invalidação pendente de outro processador vê a linha já invalidada.
+
+        :param processor_id: Identificador do processador.
+        :param operations: Iterável de tuplas (operação, endereço, valor), com operação 'read' ou 'write'.
+        :param requests: Heap compartilhado de pedidos pendentes.
+        :param wakeup: Evento usado para avisar o árbitro de que há um novo pedido.
+        """
+        timing = self.timings[processor_id]
+        loop = asyncio.get_running_loop()
+        for op, address, value in operations:
+            timing.operations += 1
+            done = loop.create_future()
+            heapq.heappush(requests, (timing.clock, processor_id, op, address, value, done))
+            wakeup.set()
+            await done
+        self.active -= 1
+        wakeup.set()
+
+    async def arbiter_task(self, requests, wakeup):
+        """
+        Corrotina do árbitro: atende, em ordem de tempo simulado, o pedido mais antigo assim que todos os
+        processadores ativos estão esperando. Operações sem custo de barramento só avançam o relógio do
+        processador em costs.hit.
+
+        :param requests: Heap compartilhado de pedidos pendentes.
+        :param wakeup: Evento sinalizado pelos processadores a cada novo pedido ou ao terminar.
+        """
+        while self.active:
+            if len(requests) < self.active:
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+            arrival, processor_id, op, address, value, done = heapq.heappop(requests)
+            timing = self.timings[processor_id]
+            cost = self.execute(processor_id, op, address, value)
+            if not cost:
+                # Acerto local: não ocupa o barramento nem espera por ele
+                timing.clock = arrival + self.costs.hit
+                done.set_result(None)
+                await asyncio.sleep(0)
+                continue
+            grant = max(arrival, self.bus_free_at)
+            occupancy = min(cost, self.costs.address_phase) if self.pipelined else cost
+            self.bus_free_at = grant + occupancy
+            self.busy_cycles += occupancy
+            timing.queue_delay += grant - arrival
+            timing.bus_requests += 1
+            timing.clock = grant + cost
+            done.set_result(None)
+            await asyncio.sleep(0)  # Deixa o processador atendido enviar seu próximo pedido
+
+    async def run_async(self, workloads):
+        """
+        Executa as cargas de trabalho de todos os processadores até o fim.
+
+        :param workloads: Dicionário processor_id -> iterável de tuplas (operação, endereço, valor).
+        :return: Relatório, como em report().
+        """
+        requests = []
+        wakeup = asyncio.Event()
+        self.timings = {pid: ProcessorTiming(pid) for pid in workloads}
+        self.bus_free_at = 0
+        self.busy_cycles = 0
+        self.active = len(workloads)
+        tasks = [asyncio.create_task(self.processor_task(pid, ops, requests, wakeup)) for pid, ops in workloads.items()]
+        await self.arbiter_task(requests, wakeup)
+        await asyncio.gather(*tasks)
+        return self.report()
+
+    def run(self, workloads):
+        """
+        Versão síncrona de run_async.
+
+        :param workloads: Dicionário processor_id -> iterável de tuplas (operação, endereço, valor).
+        :return: Relatório, como em report().
+        """
+        return asyncio.run(self.run_async(workloads))
+
+    def report(self):
+        """
+        Resume a última execução.
+
+        :return: Dicionário com os ciclos simulados, a utilização do barramento e, para cada processador,
+                 operações, pedidos ao barramento, ciclos e atraso total e médio na fila.
+        """
+        cycles = max((timing.clock for timing in self.timings.values()), default=0)
+        return {
+            'cycles': cycles,
+            'bus_busy_cycles': self.busy_cycles,
+            'bus_utilization': self.busy_cycles / cycles if cycles else 0.0,
+            'processors': {
+                pid: {
+                    'operations': timing.operations,
+                    'bus_requests': timing.bus_requests,
+                    'cycles': timing.clock,
+                    'queue_delay': timing.queue_delay,
+                    'mean_queue_delay': timing.queue_delay / timing.bus_requests if timing.bus_requests else 0.0,
+                }
+                for pid, timing in self.timings.items()
+            },
+        }
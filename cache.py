@@ -1,5 +1,6 @@
 from enum import Enum
-import random
+
+from replacement import make_policy
 
 class State(Enum):
     """
@@ -9,15 +10,22 @@ class State(Enum):
     EXCLUSIVE = 'E' # Estado exclusivo: A linha está na cache e não está em nenhuma outra cache.
     SHARED = 'S'    # Estado compartilhado: A linha está presente em uma ou mais caches e não foi modificada.
     INVALID = 'I'   # Estado inválido: A linha não contém dados válidos.
+    OWNED = 'O'     # Estado dono (MOESI): A linha foi alterada e é compartilhada; este cache responde por ela.
+    FORWARD = 'F'   # Estado encaminhador (MESIF): Cópia compartilhada que responde aos pedidos das outras caches.
 
 class CacheLine:
     """
-    Representa uma linha de cache.
+    Representa uma linha de cache. Usa __slots__ para evitar um __dict__ por linha.
     """
-    def __init__(self):
+    __slots__ = ('address', 'data', 'state', 'position')
+
+    def __init__(self, position=None):
         """
         Inicializa uma nova linha de cache com endereço, dados e estado como inválidos.
+
+        :param position: Índice da linha dentro do cache.
         """
+        self.position = position
         self.address = None
         self.data = None
         self.state = State.INVALID
@@ -34,6 +42,14 @@ class CacheLine:
         self.data = data
         self.state = state
 
+    def reset(self):
+        """
+        Esvazia a linha de cache, deixando endereço e dados vazios e o estado como inválido.
+        """
+        self.address = None
+        self.data = None
+        self.state = State.INVALID
+
     def print_line(self, line_index):
         """
         Imprime as informações da linha de cache.
@@ -45,80 +61,187 @@ class CacheLine:
 
 class Cache:
     """
-    Representa um cache com um conjunto de linhas e controle de substituição FIFO.
+    Representa um cache associativo por conjuntos (sets x ways), com blocos de um ou mais endereços e uma
+    política de substituição configurável (FIFO por padrão) em cada conjunto. Por padrão o cache é totalmente
+    associativo (um único conjunto) com blocos de um endereço.
+
+    Cada linha guarda o endereço inicial do bloco. Com blocos de um endereço, o dado da linha é o próprio valor;
+    com blocos maiores, é uma lista com os valores de cada endereço do bloco.
     """
-    def __init__(self, size):
+    def __init__(self, size, policy='fifo', seed=None, ways=None, block_size=1):
         """
-        Inicializa um cache com um tamanho específico e uma fila FIFO para controle de substituição de linhas.
+        Inicializa um cache com um tamanho específico, sua geometria e a política de substituição de linhas escolhida.
         
         :param size: Número de linhas no cache.
+        :param policy: Nome da política de substituição ('fifo', 'lru', 'plru', 'clock' ou 'random').
+        :param seed: Semente da política 'random'.
+        :param ways: Número de linhas por conjunto (associatividade). None torna o cache totalmente associativo.
+        :param block_size: Número de endereços consecutivos em cada linha.
+        :raises ValueError: Se o tamanho não for múltiplo da associatividade ou se block_size for menor que 1.
         """
-        self.lines = [CacheLine() for _ in range(size)]
+        ways = size if ways is None else ways
+        if ways < 1 or size % ways:
+            raise ValueError(f"O tamanho do cache ({size}) deve ser múltiplo da associatividade ({ways})")
+        if block_size < 1:
+            raise ValueError(f"Tamanho de bloco inválido: {block_size}")
+        self.lines = [CacheLine(i) for i in range(size)]
         self.size = size
-        self.fifoQueue = []  # FIFO para controle de substituição de linhas
+        self.ways = ways
+        self.num_sets = size // ways
+        self.block_size = block_size
+        self.policy = policy
+        self.policies = [make_policy(policy, ways, None if seed is None else seed + s) for s in range(self.num_sets)]
+        self.index = {}  # Índice endereço do bloco -> linha para busca em O(1)
+        # Pilha de índices das linhas vazias de cada conjunto
+        self.free_lines = [list(range((s + 1) * ways - 1, s * ways - 1, -1)) for s in range(self.num_sets)]
+        self.listeners = []  # Funções chamadas com (cache, índice da linha) quando uma linha muda
+        self.dirty_states = None  # Estados cujas linhas são escritas de volta ao serem removidas (None: todos os válidos)
+
+    def notify(self, line):
+        """
+        Avisa os ouvintes de que uma linha mudou (endereço, dados ou estado). Quem altera uma linha fora do cache
+        deve chamar este método, de preferência só quando houver ouvintes (`if cache.listeners`).
+
+        :param line: Linha alterada.
+        """
+        for listener in self.listeners:
+            listener(self, line.position)
+
+    def block_address(self, address):
+        """
+        Calcula o endereço inicial do bloco que contém o endereço fornecido.
+
+        :param address: Endereço de memória.
+        :return: Endereço inicial do bloco.
+        """
+        return address - address % self.block_size
+
+    def set_index(self, address):
+        """
+        Calcula o conjunto em que o endereço fornecido deve ser colocado.
+
+        :param address: Endereço de memória.
+        :return: Índice do conjunto.
+        """
+        return (address // self.block_size) % self.num_sets
 
     def search(self, address):
         """
-        Procura uma linha de cache pelo endereço fornecido.
+        Procura a linha de cache que contém o endereço fornecido.
         
         :param address: Endereço para procurar.
         :return: A linha de cache correspondente ao endereço, ou None se não encontrada.
         """
-        return next((line for line in self.lines if line.address == address), None)
+        if self.block_size == 1:
+            return self.index.get(address)
+        return self.index.get(address - address % self.block_size)
+
+    def read_word(self, line, address):
+        """
+        Lê o valor de um endereço dentro de uma linha de cache.
 
-    def write(self, address, data, state):
+        :param line: Linha de cache que contém o endereço.
+        :param address: Endereço a ser lido.
+        :return: Valor armazenado para o endereço.
+        """
+        if self.block_size == 1:
+            return line.data
+        return line.data[address - line.address]
+
+    def write(self, address, data, state, block=None):
         """
         Escreve dados em uma linha de cache no endereço fornecido. Se o endereço já existe, atualiza a linha existente,
-        caso contrário, substitui uma linha existente ou adiciona uma nova linha, se disponível.
+        caso contrário, substitui uma linha existente do conjunto ou adiciona uma nova linha, se disponível.
         
         :param address: Endereço da linha de cache.
         :param data: Dados a serem escritos.
         :param state: Estado a ser definido para a linha de cache.
+        :param block: Conteúdo atual do bloco, usado para preencher uma nova linha quando block_size > 1.
         :return: Uma tupla indicando o resultado da operação (código de operação, endereço removido, dados removidos).
+        :raises ValueError: Se for necessário preencher uma nova linha com block_size > 1 sem informar o bloco.
         """
         line = self.search(address)
         if line:
-            return self.update_existing_line(line, address, data)
-        else:
-            line = self.search(None)
-            if line:
-                empty_lines = [l for l in self.lines if l.address is None]
-                if empty_lines:
-                    line = random.choice(empty_lines)
-                    line.update(address, data, state)
-                    self.fifoQueue.append(self.lines.index(line))
-                    return "WM", None, None
-            elif self.is_full():
-                return self.replace_line_in_cache(address, data, state)
-        return "WM", None, None
-
-    def update_existing_line(self, line, address, data):
+            return self.update_existing_line(line, address, data, block)
+        free_lines = self.free_lines[self.set_index(address)]
+        if free_lines:
+            self.fill_line(free_lines.pop(), address, data, state, block)
+            return "WM", None, None
+        return self.replace_line_in_cache(address, data, state, block)
+
+    def update_existing_line(self, line, address, data, block=None):
         """
         Atualiza uma linha de cache existente com novos dados e estado.
         
         :param line: Linha de cache a ser atualizada.
         :param address: Endereço da linha de cache.
         :param data: Dados a serem atualizados.
+        :param block: Conteúdo atual do bloco; se informado, recarrega uma linha inválida antes da escrita.
         :return: Uma tupla indicando o resultado da operação (código de operação, endereço removido, dados removidos).
         """
-        if line.state != State.INVALID:
-            line.update(address, data, State.MODIFIED)
-            return "WH", None, None
+        ways = self.ways
+        self.policies[line.position // ways].touch(line.position % ways)
+        if self.block_size == 1:
+            line.data = data
+        else:
+            if block is not None and line.state == State.INVALID:
+                line.data = list(block)
+            line.data[address - line.address] = data
+        transaction = "WH" if line.state != State.INVALID else "WM"
+        # Linha presente porém invalidada: trata como falta e reaproveita a linha
+        line.state = State.MODIFIED
+        if self.listeners:
+            self.notify(line)
+        return transaction, None, None
+
+    def fill_line(self, index, address, data, state, block=None):
+        """
+        Preenche a linha vazia com o índice especificado e a registra no índice de endereços e na política de substituição.
+
+        :param index: Índice da linha vazia.
+        :param address: Endereço da linha de cache.
+        :param data: Dados a serem escritos.
+        :param state: Estado a ser definido para a linha de cache.
+        :param block: Conteúdo atual do bloco, obrigatório quando block_size > 1.
+        :raises ValueError: Se block_size > 1 e o bloco não for informado.
+        """
+        line = self.lines[index]
+        if self.block_size == 1:
+            line.update(address, data, state)
+        else:
+            if block is None:
+                raise ValueError(f"O conteúdo do bloco é necessário para preencher o endereço {address}")
+            base = address - address % self.block_size
+            words = list(block)
+            words[address - base] = data
+            line.update(base, words, state)
+        self.index[line.address] = line
+        self.policies[index // self.ways].insert(index % self.ways)
+        if self.listeners:
+            self.notify(line)
 
-    def replace_line_in_cache(self, address, data, state):
+    def replace_line_in_cache(self, address, data, state, block=None):
         """
-        Substitui uma linha de cache existente utilizando o algoritmo FIFO e escreve os novos dados.
+        Substitui uma linha do conjunto do endereço, escolhida pela política de substituição, e escreve os novos dados.
+        A linha removida é reaproveitada, sem alocar uma nova CacheLine.
         
         :param address: Endereço da nova linha de cache.
         :param data: Dados a serem escritos.
         :param state: Estado a ser definido para a nova linha de cache.
+        :param block: Conteúdo atual do bloco, obrigatório quando block_size > 1.
         :return: Uma tupla indicando o resultado da operação (código de operação, endereço removido, dados removidos).
         """
-        index = self.fifoQueue.pop(0)
+        set_index = self.set_index(address)
+        index = set_index * self.ways + self.policies[set_index].victim()
         line_to_remove = self.lines[index]
         address_to_remove, data_to_remove = line_to_remove.address, line_to_remove.data
-        self.lines[index] = CacheLine()
-        self.write(address, data, state)
+        if line_to_remove.state == State.INVALID:
+            data_to_remove = None  # Linhas inválidas não têm dados a serem escritos de volta na memória
+        elif self.dirty_states is not None and line_to_remove.state not in self.dirty_states:
+            data_to_remove = None  # Linha limpa: a memória já tem os mesmos dados
+        self.index.pop(address_to_remove, None)
+        line_to_remove.reset()
+        self.fill_line(index, address, data, state, block)
         return "WM", address_to_remove, data_to_remove
 
     def update_state(self, address, new_state):
@@ -132,6 +255,8 @@ class Cache:
         line = self.search(address)
         if line:
             line.state = new_state
+            if self.listeners:
+                self.notify(line)
             return True
 
     def print_cache(self, processor_id):
@@ -151,4 +276,4 @@ class Cache:
         
         :return: True se o cache estiver cheio, False caso contrário.
         """
-        return all(line.address is not None for line in self.lines)
+        return len(self.index) >= self.size
@@ -1,17 +1,46 @@
+import logging
+import time
+
 from cache import CacheLine, State
+from protocol import READ, SNOOP_READ, SNOOP_WRITE, get_protocol
+from stats import (CoherenceStats, READ_HITS, READ_MISSES, WRITE_HITS, WRITE_MISSES, INVALIDATIONS_SENT,
+                   WRITE_BACKS, DOWNGRADES, EVICTIONS, BUS_TRANSACTIONS, ADDRESS_READS, ADDRESS_WRITES,
+                   ADDRESS_INVALIDATIONS)
+from writebuffer import WriteBackBuffer
+
+logger = logging.getLogger(__name__)
 
 class CacheManager:
     """
     Gerencia múltiplos caches de processadores e controla a comunicação entre eles e a memória principal.
     """
-    def __init__(self, memory):
+    def __init__(self, memory, directory=False, stats=None, write_buffer=0, protocol=None):
         """
         Inicializa o gerenciador de cache com a memória principal.
 
         :param memory: Instância do componente de memória principal.
+        :param directory: Se True, usa um diretório central (endereço -> bitmask de caches que possuem a linha)
+                          em vez de consultar todos os caches a cada acesso (modo broadcast).
+        :param stats: Instância de CoherenceStats onde as estatísticas serão coletadas. Se None, uma nova é criada.
+        :param write_buffer: Capacidade, em endereços, do buffer de escrita entre os caches e a memória.
+                             Se 0, as escritas vão direto para a memória.
+        :param protocol: Protocolo de coerência ('mesi', 'moesi', 'mesif' ou uma instância de protocol.Protocol),
+                         aplicado pela sua tabela de transições. Se None, usa a implementação MESI original deste
+                         gerenciador, em que toda linha válida removida é escrita de volta na memória.
+        :raises ValueError: Se o protocolo não existir.
         """
         self.caches = {}
         self.memory = memory
+        self.directory = {} if directory else None
+        self.processor_bits = {}  # processor_id -> bit do processador no diretório
+        self.bit_processors = []  # posição do bit -> processor_id
+        self.stats = CoherenceStats() if stats is None else stats
+        self.block_size = 1  # Tamanho de bloco comum a todos os caches registrados
+        self.write_buffer = WriteBackBuffer(memory, write_buffer) if write_buffer else None
+        self.recorder = None  # TraceRecorder que grava cada leitura e escrita, se houver
+        self.protocol = get_protocol(protocol)
+        # Estados sujos: blocos nesses estados são escritos de volta antes de serem invalidados
+        self.dirty_states = frozenset((State.MODIFIED,)) if self.protocol is None else self.protocol.dirty
 
     def register_cache(self, processor_id, cache):
         """
@@ -19,8 +48,21 @@ class CacheManager:
 
         :param processor_id: Identificador do processador.
         :param cache: Instância do cache a ser registrada.
+        :raises ValueError: Se o tamanho de bloco do cache for diferente do tamanho dos caches já registrados.
         """
+        others = [c for pid, c in self.caches.items() if pid != processor_id]
+        if others and cache.block_size != self.block_size:
+            raise ValueError(f"Todos os caches devem ter o mesmo tamanho de bloco ({self.block_size})")
+        self.block_size = cache.block_size
         self.caches[processor_id] = cache
+        if self.protocol is not None:
+            cache.dirty_states = self.protocol.dirty
+        if processor_id not in self.processor_bits:
+            self.processor_bits[processor_id] = 1 << len(self.bit_processors)
+            self.bit_processors.append(processor_id)
+        if self.directory is not None:
+            for address in cache.index:
+                self.directory[address] = self.directory.get(address, 0) | self.processor_bits[processor_id]
 
     def get_cache(self, processor_id):
         """
@@ -31,16 +73,167 @@ class CacheManager:
         """
         return self.caches.get(processor_id)
 
+    def caches_holding(self, address, excluding_processor_id=None):
+        """
+        Percorre os caches que possuem uma linha com o bloco do endereço especificado, em qualquer estado.
+        No modo broadcast todos os caches são consultados; no modo diretório apenas os caches
+        marcados no bitmask do endereço são visitados. A ordem de visita é a ordem de registro.
+
+        :param address: Endereço da linha de cache.
+        :param excluding_processor_id: Identificador do processador cujo cache não deve ser visitado.
+        :return: Gerador de tuplas (processor_id, cache, linha).
+        """
+        if self.directory is None:
+            for pid, cache in self.caches.items():
+                if pid != excluding_processor_id:
+                    line = cache.search(address)
+                    if line:
+                        yield pid, cache, line
+            return
+
+        mask = self.directory.get(address - address % self.block_size, 0)
+        if excluding_processor_id in self.processor_bits:
+            mask &= ~self.processor_bits[excluding_processor_id]
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            pid = self.bit_processors[low.bit_length() - 1]
+            cache = self.caches[pid]
+            yield pid, cache, cache.search(address)
+
+    def sharers(self, address):
+        """
+        Retorna o bitmask dos processadores cujos caches possuem o endereço especificado.
+
+        :param address: Endereço da linha de cache.
+        :return: Inteiro em que cada bit ligado corresponde a um processador (ver processor_bits).
+        """
+        if self.directory is not None:
+            return self.directory.get(address - address % self.block_size, 0)
+        mask = 0
+        for pid, _, _ in self.caches_holding(address):
+            mask |= self.processor_bits[pid]
+        return mask
+
+    def write_to_cache(self, processor_id, address, data, state, block=None):
+        """
+        Escreve no cache do processador especificado, mantendo o diretório atualizado com a linha inserida
+        e com a linha eventualmente removida.
+
+        :param processor_id: Identificador do processador.
+        :param address: Endereço da linha de cache.
+        :param data: Dados a serem escritos.
+        :param state: Estado a ser definido para a linha de cache.
+        :param block: Conteúdo atual do bloco, usado quando o tamanho de bloco é maior que 1.
+        :return: Uma tupla (código de operação, endereço removido, dados removidos), como em Cache.write.
+        """
+        result = self.caches[processor_id].write(address, data, state, block)
+        if result[1] is not None:
+            self.stats.processor(processor_id)[EVICTIONS] += 1
+        if self.directory is not None:
+            bit = self.processor_bits[processor_id]
+            base = address - address % self.block_size
+            self.directory[base] = self.directory.get(base, 0) | bit
+            removed_address = result[1]
+            if removed_address is not None:
+                mask = self.directory.get(removed_address, 0) & ~bit
+                if mask:
+                    self.directory[removed_address] = mask
+                else:
+                    self.directory.pop(removed_address, None)
+        return result
+
+    def fetch_block(self, address):
+        """
+        Lê da memória principal o bloco inteiro que contém o endereço, numa única operação.
+
+        :param address: Endereço contido no bloco.
+        :return: Lista com os valores do bloco, ou None quando o tamanho de bloco é 1.
+        """
+        if self.block_size == 1:
+            return None
+        self.stats.memory_reads += 1
+        source = self.memory if self.write_buffer is None else self.write_buffer
+        return source.read_block(address - address % self.block_size, self.block_size)
+
+    def write_memory(self, address, data):
+        """
+        Escreve na memória principal, passando pelo buffer de escrita quando ele existe.
+
+        :param address: Endereço inicial da escrita.
+        :param data: Um valor, ou uma lista de valores para endereços consecutivos.
+        """
+        if self.write_buffer is not None:
+            self.stats.memory_writes += self.write_buffer.write(address, data)
+        elif isinstance(data, list):
+            self.memory.write_block(address, data)
+            self.stats.memory_writes += 1
+        else:
+            self.memory.write(address, data)
+            self.stats.memory_writes += 1
+
+    def fence(self):
+        """
+        Esvazia o buffer de escrita, garantindo que todas as escritas pendentes cheguem à memória principal.
+        Não faz nada quando não há buffer.
+        """
+        if self.write_buffer is not None:
+            self.stats.memory_writes += self.write_buffer.drain()
+
+    def snoop_read(self, address):
+        """
+        Lê o valor atual de um endereço sem participar do protocolo: nenhuma linha é preenchida, removida ou
+        rebaixada, as políticas de substituição não são tocadas e nenhuma estatística é contada. O valor vem da
+        primeira cópia válida em algum cache ou, se não houver, do buffer de escrita ou da memória.
+        Feita para consultas de monitoramento.
+
+        :param address: Endereço a ser lido.
+        :return: Valor que handle_read leria no mesmo momento.
+        """
+        for _, cache, line in self.caches_holding(address):
+            if line.state != State.INVALID:
+                return cache.read_word(line, address)
+        if self.write_buffer is not None:
+            value = self.write_buffer.entries.get(address)  # Sem WriteBackBuffer.read, que conta o acerto
+            if value is not None:
+                return value
+        return self.memory.read(address)
+
+    def write_back(self, processor_id, address, data):
+        """
+        Escreve na memória principal o conteúdo de uma linha de cache (removida ou descarregada).
+
+        :param processor_id: Identificador do processador dono da linha.
+        :param address: Endereço inicial do bloco da linha.
+        :param data: Dados da linha (um valor, ou uma lista de valores quando o tamanho de bloco é maior que 1).
+        """
+        self.stats.processor(processor_id)[WRITE_BACKS] += 1
+        self.write_memory(address, data)
+
     def invalidate_other_caches(self, address, excluding_processor_id):
         """
         Invalida as linhas de cache em todos os caches, exceto no cache do processador especificado.
+        Com blocos de mais de um endereço, blocos sujos são escritos na memória antes de serem invalidados,
+        para que os demais endereços do bloco não se percam.
 
         :param address: Endereço da linha de cache a ser invalidada.
         :param excluding_processor_id: Identificador do processador cujo cache não deve ser invalidado.
         """
-        for pid, cache in self.caches.items():
-            if pid != excluding_processor_id:
-                cache.update_state(address, State.INVALID)
+        invalidated = 0
+        protocol = self.protocol
+        for pid, cache, line in self.caches_holding(address, excluding_processor_id):
+            if line.state != State.INVALID:
+                invalidated += 1
+                if self.block_size > 1 and line.state in self.dirty_states:
+                    self.write_back(pid, line.address, line.data)
+                line.state = State.INVALID if protocol is None else protocol.transitions[line.state, SNOOP_WRITE]
+                if cache.listeners:
+                    cache.notify(line)
+        if invalidated:
+            stats = self.stats
+            stats.processor(excluding_processor_id)[INVALIDATIONS_SENT] += invalidated
+            if stats.per_address:
+                stats.address(address)[ADDRESS_INVALIDATIONS] += invalidated
 
     def is_shared(self, address, excluding_processor_id):
         """
@@ -50,7 +243,7 @@ class CacheManager:
         :param excluding_processor_id: Identificador do processador cujo cache não deve ser considerado.
         :return: True se o endereço for compartilhado em outros caches, False caso contrário.
         """
-        return any(self.is_line_shared(pid, address) for pid in self.caches if pid != excluding_processor_id)
+        return any(line.state != State.INVALID for _, _, line in self.caches_holding(address, excluding_processor_id))
 
     def is_line_shared(self, processor_id, address):
         """
@@ -58,10 +251,10 @@ class CacheManager:
 
         :param processor_id: Identificador do processador.
         :param address: Endereço da linha de cache.
-        :return: True se a linha de cache está compartilhada (estado SHARED, EXCLUSIVE ou MODIFIED), False caso contrário.
+        :return: True se a linha de cache está compartilhada (em qualquer estado válido), False caso contrário.
         """
         line = self.caches[processor_id].search(address)
-        return line and line.state in {State.SHARED, State.EXCLUSIVE, State.MODIFIED}
+        return line and line.state != State.INVALID
 
     def update_state_to_shared_if_exclusive(self, address, excluding_processor_id):
         """
@@ -71,11 +264,12 @@ class CacheManager:
         :param address: Endereço da linha de cache.
         :param excluding_processor_id: Identificador do processador cujo cache não deve ser atualizado.
         """
-        for pid, cache in self.caches.items():
-            if pid != excluding_processor_id:
-                line = cache.search(address)
-                if line and line.state == State.EXCLUSIVE:
-                    line.state = State.SHARED
+        for pid, cache, line in self.caches_holding(address, excluding_processor_id):
+            if line.state == State.EXCLUSIVE:
+                line.state = State.SHARED
+                self.stats.processor(pid)[DOWNGRADES] += 1
+                if cache.listeners:
+                    cache.notify(line)
 
     def handle_read(self, processor_id, address, memory):
         """
@@ -86,47 +280,175 @@ class CacheManager:
         :param memory: Instância do componente de memória principal.
         :return: Dados lidos e um código de operação ('RH' para leitura do cache ou 'RM' para leitura da memória).
         """
-        def update_all_caches(self, address, data, processor_id):
+        stats = self.stats
+        own_line = self.caches[processor_id].search(address)
+        counters = stats.processor(processor_id)
+        if own_line and own_line.state != State.INVALID:
+            counters[READ_HITS] += 1
+        else:
+            counters[READ_MISSES] += 1
+            counters[BUS_TRANSACTIONS] += 1
+        if stats.per_address:
+            stats.address(address)[ADDRESS_READS] += 1
+        recorder = self.recorder
+        if not stats.latency and recorder is None:
+            return self.perform_read(processor_id, address, memory)
+        if recorder is not None:
+            before = recorder.begin(address)
+        start = time.perf_counter_ns()
+        result = self.perform_read(processor_id, address, memory)
+        if stats.latency:
+            stats.record_latency('read', time.perf_counter_ns() - start)
+        if recorder is not None:
+            recorder.record(processor_id, 'read', address, result[0], result[1], before)
+        return result
+
+    def perform_read(self, processor_id, address, memory):
+        """
+        Realiza a leitura para handle_read, aplicando as transições MESI.
+
+        :param processor_id: Identificador do processador que está realizando a leitura.
+        :param address: Endereço a ser lido.
+        :param memory: Instância do componente de memória principal.
+        :return: Dados lidos e um código de operação ('RH' ou 'RM').
+        """
+        if self.protocol is not None:
+            return self.perform_protocol_read(processor_id, address, memory)
+
+        def update_all_caches(self, address, data, processor_id, block):
             """
             Atualiza todos os caches com os novos dados e estados.
 
             :param address: Endereço da linha de cache.
             :param data: Dados a serem atualizados.
             :param processor_id: Identificador do processador que está realizando a operação.
+            :param block: Conteúdo do bloco, usado quando o tamanho de bloco é maior que 1.
             """
             is_shared = self.is_shared(address, processor_id)
             new_state = State.SHARED if is_shared else State.EXCLUSIVE
-            state, add_to_memory, data_to_memory = self.caches[processor_id].write(address, data, new_state)
-            for cache in self.caches.values():
-                if cache.search(address):
-                    cache.update_state(address, new_state)
+            state, add_to_memory, data_to_memory = self.write_to_cache(processor_id, address, data, new_state, block)
+            for pid, cache, line in self.caches_holding(address):
+                if line.state != State.INVALID:
+                    if line.state == State.EXCLUSIVE and new_state == State.SHARED:
+                        self.stats.processor(pid)[DOWNGRADES] += 1
+                    line.state = new_state
+                    if cache.listeners:
+                        cache.notify(line)
             self.update_state_to_shared_if_exclusive(address, processor_id)
 
             if add_to_memory is not None and data_to_memory is not None:
-                memory.write(add_to_memory, data_to_memory)
+                self.write_back(processor_id, add_to_memory, data_to_memory)
 
         # Verificar se o dado está presente em qualquer cache
-        for pid, cache in self.caches.items():
-            line = cache.search(address)
-            if line and line.state != State.INVALID:
+        for pid, cache, line in self.caches_holding(address):
+            if line.state != State.INVALID:
                 # Dado encontrado em outra cache
-                print(f"Processador {processor_id} lê o endereço {address} com dado {line.data} ({'RH'})")
-                if self.caches[processor_id].update_state(address, State.SHARED) != True:
-                    state, add_to_memory, data_to_memory = self.caches[processor_id].write(address, line.data, State.SHARED)
+                data = cache.read_word(line, address)
+                block = None
+                if self.block_size > 1:
+                    block = line.data
+                    if line.state == State.MODIFIED:
+                        # O bloco passará a ser compartilhado: a memória precisa refletir os demais endereços
+                        self.write_back(pid, line.address, line.data)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Processador %s lê o endereço %s com dado %s (RH)", processor_id, address, data)
+                own_line = self.caches[processor_id].search(address)
+                if own_line is None:
+                    state, add_to_memory, data_to_memory = self.write_to_cache(processor_id, address, data, State.SHARED, block)
                     if add_to_memory is not None and data_to_memory is not None:
-                        memory.write(add_to_memory, data_to_memory)
-                update_all_caches(self, address, line.data, processor_id)
-                return line.data, 'RH'
+                        self.write_back(processor_id, add_to_memory, data_to_memory)
+                elif own_line.state != State.INVALID:
+                    if own_line.state == State.EXCLUSIVE:
+                        self.stats.processor(processor_id)[DOWNGRADES] += 1
+                    own_line.state = State.SHARED
+                    own_cache = self.caches[processor_id]
+                    if own_cache.listeners:
+                        own_cache.notify(own_line)
+                update_all_caches(self, address, data, processor_id, block)
+                self.stats.transactions['RH'] += 1
+                return data, 'RH'
 
         # Cache Miss: Read from memory and update all caches
-        data = memory.read(address)
-        is_shared = self.is_shared(address, processor_id)
-
-        update_all_caches(self, address, data, processor_id)
+        data = memory.read(address) if self.write_buffer is None else self.write_buffer.read(address)
+        self.stats.memory_reads += 1
+        update_all_caches(self, address, data, processor_id, self.fetch_block(address))
 
-        print(f"Processador {processor_id} lê o endereço {address} com dado {data} ({'RM'})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processador %s lê o endereço %s com dado %s (RM)", processor_id, address, data)
+        self.stats.transactions['RM'] += 1
         return data, 'RM'
 
+    def perform_protocol_read(self, processor_id, address, memory):
+        """
+        Realiza a leitura para handle_read pela tabela de transições do protocolo.
+
+        Um acerto só aplica a transição READ. Numa falta, o primeiro cache em estado fornecedor entrega os dados
+        (ou a memória, se nenhum estiver); cada cópia válida dos outros caches recebe a transição SNOOP_READ,
+        escrevendo os dados de volta na memória quando sai de um estado sujo para um limpo; e a linha lida fica
+        em shared_fill, ou EXCLUSIVE se não houver outras cópias.
+
+        :param processor_id: Identificador do processador que está realizando a leitura.
+        :param address: Endereço a ser lido.
+        :param memory: Instância do componente de memória principal.
+        :return: Dados lidos e um código de operação ('RH' para dados vindos de um cache ou 'RM' para a memória).
+        """
+        protocol = self.protocol
+        transitions = protocol.transitions
+        cache = self.caches[processor_id]
+        own_line = cache.search(address)
+        if own_line is not None and own_line.state != State.INVALID:
+            position = own_line.position
+            cache.policies[position // cache.ways].touch(position % cache.ways)
+            state = transitions[own_line.state, READ]
+            if state != own_line.state:
+                own_line.state = state
+                if cache.listeners:
+                    cache.notify(own_line)
+            self.stats.transactions['RH'] += 1
+            return cache.read_word(own_line, address), 'RH'
+
+        holders = []
+        supplier = None
+        for pid, other, line in self.caches_holding(address, processor_id):
+            if line.state != State.INVALID:
+                holders.append((pid, other, line))
+                if supplier is None and line.state in protocol.suppliers:
+                    supplier = other, line
+        if supplier is not None:
+            other, line = supplier
+            data = other.read_word(line, address)
+            block = list(line.data) if self.block_size > 1 else None
+            transaction = 'RH'
+        else:
+            data = memory.read(address) if self.write_buffer is None else self.write_buffer.read(address)
+            self.stats.memory_reads += 1
+            block = self.fetch_block(address)
+            transaction = 'RM'
+
+        dirty = protocol.dirty
+        for pid, other, line in holders:
+            state = transitions[line.state, SNOOP_READ]
+            if line.state in dirty and state not in dirty:
+                self.write_back(pid, line.address, line.data)
+            if line.state == State.EXCLUSIVE and state != State.EXCLUSIVE:
+                self.stats.processor(pid)[DOWNGRADES] += 1
+            line.state = state
+            if other.listeners:
+                other.notify(line)
+
+        state = protocol.shared_fill if holders else State.EXCLUSIVE
+        _, add_to_memory, data_to_memory = self.write_to_cache(processor_id, address, data, state, block)
+        own_line = cache.search(address)
+        own_line.state = state  # Uma linha inválida reaproveitada volta de Cache.write como MODIFIED
+        if cache.listeners:
+            cache.notify(own_line)
+        if add_to_memory is not None and data_to_memory is not None:
+            self.write_back(processor_id, add_to_memory, data_to_memory)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processador %s lê o endereço %s com dado %s (%s)", processor_id, address, data, transaction)
+        self.stats.transactions[transaction] += 1
+        return data, transaction
+
     def handle_write(self, processor_id, address, data, memory):
         """
         Processa uma operação de escrita para o endereço especificado. Invalida outras caches e atualiza a memória principal conforme necessário.
@@ -137,11 +459,212 @@ class CacheManager:
         :param memory: Instância do componente de memória principal.
         :return: Código de operação ('WM' para escrita na memória e 'WH' para escrita no cache).
         """
+        stats = self.stats
+        own_line = self.caches[processor_id].search(address)
+        counters = stats.processor(processor_id)
+        if own_line and own_line.state != State.INVALID:
+            counters[WRITE_HITS] += 1
+            if own_line.state != State.MODIFIED:
+                counters[BUS_TRANSACTIONS] += 1  # Pedido de exclusividade para invalidar as outras cópias
+        else:
+            counters[WRITE_MISSES] += 1
+            counters[BUS_TRANSACTIONS] += 1
+        if stats.per_address:
+            stats.address(address)[ADDRESS_WRITES] += 1
+        recorder = self.recorder
+        if not stats.latency and recorder is None:
+            return self.perform_write(processor_id, address, data, memory)
+        if recorder is not None:
+            before = recorder.begin(address)
+        start = time.perf_counter_ns()
+        result = self.perform_write(processor_id, address, data, memory)
+        if stats.latency:
+            stats.record_latency('write', time.perf_counter_ns() - start)
+        if recorder is not None:
+            recorder.record(processor_id, 'write', address, data, result, before)
+        return result
+
+    def perform_write(self, processor_id, address, data, memory):
+        """
+        Realiza a escrita para handle_write, aplicando as transições MESI. Com um protocolo por tabela, as outras
+        cópias recebem a transição SNOOP_WRITE e a linha escrita fica em MODIFIED, destino de WRITE em todo protocolo.
+
+        :param processor_id: Identificador do processador que está realizando a escrita.
+        :param address: Endereço a ser escrito.
+        :param data: Dados a serem escritos.
+        :param memory: Instância do componente de memória principal.
+        :return: Código de operação ('WM' ou 'WH').
+        """
         self.invalidate_other_caches(address, processor_id)
-        cache = self.get_cache(processor_id)
-        transaction, old_address, old_data = cache.write(address, data, State.MODIFIED)
+        block = None
+        if self.block_size > 1:
+            own_line = self.caches[processor_id].search(address)
+            if own_line is None or own_line.state == State.INVALID:
+                block = self.fetch_block(address)
+        transaction, old_address, old_data = self.write_to_cache(processor_id, address, data, State.MODIFIED, block)
         if data == 0:
-            memory.write(address, data)
+            self.write_memory(address, data)
         if transaction == 'WM' and old_address is not None and old_data is not None:
-            memory.write(old_address, old_data)
+            self.write_back(processor_id, old_address, old_data)
+        self.stats.transactions[transaction] += 1
         return transaction
+
+    def holders_by_address(self, addresses, excluding_processor_id):
+        """
+        Obtém, numa única passada por cache, as linhas que outros caches possuem para um conjunto de endereços.
+        No modo broadcast cada cache é consultado uma vez, pela interseção do seu índice com os endereços, em vez
+        de uma busca por cache para cada endereço. Supõe blocos de um endereço.
+
+        :param addresses: Iterável de endereços.
+        :param excluding_processor_id: Identificador do processador cujo cache não deve ser consultado.
+        :return: Dicionário endereço -> lista de tuplas (processor_id, cache, linha), em qualquer estado,
+                 na ordem de registro dos caches.
+        """
+        holders = {address: [] for address in addresses}
+        if self.directory is not None:
+            for address in holders:
+                holders[address] = list(self.caches_holding(address, excluding_processor_id))
+            return holders
+        for pid, cache in self.caches.items():
+            if pid != excluding_processor_id:
+                index = cache.index
+                for address in holders.keys() & index.keys():
+                    holders[address].append((pid, cache, index[address]))
+        return holders
+
+    def handle_reads(self, processor_id, addresses):
+        """
+        Processa uma sequência de leituras de um processador, com o mesmo resultado (dados, estados, memória e
+        estatísticas) que handle_read chamado para cada endereço, na ordem.
+
+        As linhas dos outros caches são buscadas uma única vez para todos os endereços do lote: durante o lote só
+        este processador acessa os caches, e suas leituras apenas rebaixam as cópias dos outros, sem trocá-las de
+        lugar. Com blocos de mais de um endereço, com medição de latência, com um gravador de transações ou com
+        um protocolo por tabela, cada leitura passa por handle_read.
+
+        :param processor_id: Identificador do processador que está realizando as leituras.
+        :param addresses: Iterável de endereços a serem lidos.
+        :return: Lista de tuplas (dado lido, código de operação 'RH' ou 'RM'), na ordem dos endereços.
+        """
+        stats = self.stats
+        memory = self.memory
+        if self.block_size > 1 or stats.latency or self.recorder is not None or self.protocol is not None:
+            return [self.handle_read(processor_id, address, memory) for address in addresses]
+
+        addresses = list(addresses)
+        if not addresses:
+            return []  # Como nenhuma chamada a handle_read: nem o contador do processador é criado
+        holders = self.holders_by_address(addresses, processor_id)
+        cache = self.caches[processor_id]
+        counters = stats.processor(processor_id)
+        per_address = stats.per_address
+        transactions = stats.transactions
+        source = memory if self.write_buffer is None else self.write_buffer
+        results = []
+        for address in addresses:
+            own_line = cache.search(address)
+            own_valid = own_line is not None and own_line.state != State.INVALID
+            others = [holder for holder in holders[address] if holder[2].state != State.INVALID]
+            if own_valid:
+                counters[READ_HITS] += 1
+            else:
+                counters[READ_MISSES] += 1
+                counters[BUS_TRANSACTIONS] += 1
+            if per_address:
+                stats.address(address)[ADDRESS_READS] += 1
+
+            if own_valid or others:
+                # Cópias válidas têm o mesmo dado, então qualquer uma serve como fonte
+                data = own_line.data if own_valid else others[0][2].data
+                if own_line is None:
+                    _, add_to_memory, data_to_memory = self.write_to_cache(processor_id, address, data, State.SHARED)
+                    if add_to_memory is not None and data_to_memory is not None:
+                        self.write_back(processor_id, add_to_memory, data_to_memory)
+                elif own_valid and own_line.state == State.EXCLUSIVE:
+                    counters[DOWNGRADES] += 1
+                transaction = 'RH'
+            else:
+                data = source.read(address)
+                stats.memory_reads += 1
+                transaction = 'RM'
+
+            # Mesmas transições de update_all_caches em perform_read
+            new_state = State.SHARED if others else State.EXCLUSIVE
+            _, add_to_memory, data_to_memory = self.write_to_cache(processor_id, address, data, new_state)
+            own_line = cache.search(address)
+            own_line.state = new_state
+            if cache.listeners:
+                cache.notify(own_line)
+            for pid, other_cache, line in others:
+                if line.state == State.EXCLUSIVE and new_state == State.SHARED:
+                    stats.processor(pid)[DOWNGRADES] += 1
+                line.state = new_state
+                if other_cache.listeners:
+                    other_cache.notify(line)
+            if add_to_memory is not None and data_to_memory is not None:
+                self.write_back(processor_id, add_to_memory, data_to_memory)
+
+            transactions[transaction] += 1
+            results.append((data, transaction))
+        return results
+
+    def handle_writes(self, processor_id, writes):
+        """
+        Processa uma sequência de escritas de um processador, com o mesmo resultado (dados, estados, memória e
+        estatísticas) que handle_write chamado para cada escrita, na ordem.
+
+        As cópias dos outros caches são invalidadas de uma vez, antes das escritas: como só este processador
+        acessa os caches durante o lote, invalidá-las antes ou entre as escritas leva ao mesmo estado final.
+        Com blocos de mais de um endereço, com medição de latência, com um gravador de transações ou com um
+        protocolo por tabela, cada escrita passa por handle_write.
+
+        :param processor_id: Identificador do processador que está realizando as escritas.
+        :param writes: Iterável de tuplas (endereço, dado).
+        :return: Lista de códigos de operação ('WH' ou 'WM'), na ordem das escritas.
+        """
+        stats = self.stats
+        if self.block_size > 1 or stats.latency or self.recorder is not None or self.protocol is not None:
+            return [self.handle_write(processor_id, address, data, self.memory) for address, data in writes]
+
+        writes = list(writes)
+        if not writes:
+            return []  # Como nenhuma chamada a handle_write: nem o contador do processador é criado
+        invalidated = 0
+        for address, holders in self.holders_by_address([address for address, _ in writes], processor_id).items():
+            count = 0
+            for pid, cache, line in holders:
+                if line.state != State.INVALID:
+                    count += 1
+                    line.state = State.INVALID
+                    if cache.listeners:
+                        cache.notify(line)
+            if count:
+                invalidated += count
+                if stats.per_address:
+                    stats.address(address)[ADDRESS_INVALIDATIONS] += count
+        counters = stats.processor(processor_id)
+        counters[INVALIDATIONS_SENT] += invalidated
+
+        cache = self.caches[processor_id]
+        per_address = stats.per_address
+        transactions = stats.transactions
+        results = []
+        for address, data in writes:
+            own_line = cache.search(address)
+            if own_line and own_line.state != State.INVALID:
+                counters[WRITE_HITS] += 1
+                if own_line.state != State.MODIFIED:
+                    counters[BUS_TRANSACTIONS] += 1
+            else:
+                counters[WRITE_MISSES] += 1
+                counters[BUS_TRANSACTIONS] += 1
+            if per_address:
+                stats.address(address)[ADDRESS_WRITES] += 1
+            transaction, old_address, old_data = self.write_to_cache(processor_id, address, data, State.MODIFIED)
+            if data == 0:
+                self.write_memory(address, data)
+            if transaction == 'WM' and old_address is not None and old_data is not None:
+                self.write_back(processor_id, old_address, old_data)
+            transactions[transaction] += 1
+            results.append(transaction)
+        return results
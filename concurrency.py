@@ -0,0 +1,177 @@
+import threading
+
+from cacheManager import CacheManager
+from parking import Car, ParkingManager, ParkingResult, ParkingStatus
+
+class ConcurrentCacheManager(CacheManager):
+    """
+    CacheManager seguro para uso por várias threads, uma por processador.
+
+    Em vez de uma trava global, cada conjunto de cache tem sua própria trava: como todos os caches têm a mesma
+    geometria, uma operação sobre um endereço só lê ou altera linhas do conjunto desse endereço (inclusive nas
+    remoções), e operações em conjuntos diferentes podem prosseguir em paralelo. Caches totalmente associativos
+    têm um único conjunto e, portanto, uma única trava.
+
+    Os contadores de CoherenceStats são atualizados sem trava própria e podem ficar ligeiramente imprecisos
+    quando várias threads atualizam o mesmo contador ao mesmo tempo.
+    """
+    def __init__(self, memory, directory=False, stats=None):
+        """
+        Inicializa o gerenciador de cache com a memória principal.
+
+        :param memory: Instância do componente de memória principal.
+        :param directory: Se True, usa o modo diretório.
+        :param stats: Instância de CoherenceStats onde as estatísticas serão coletadas.
+        """
+        super().__init__(memory, directory, stats)
+        self.num_sets = None
+        self.set_locks = [threading.RLock()]
+
+    def register_cache(self, processor_id, cache):
+        """
+        Registra um cache para um processador específico. Deve ser chamado antes de as threads começarem.
+
+        :param processor_id: Identificador do processador.
+        :param cache: Instância do cache a ser registrada.
+        :raises ValueError: Se a geometria do cache for diferente da dos caches já registrados.
+        """
+        if self.caches and cache.num_sets != self.num_sets:
+            raise ValueError(f"Todos os caches devem ter o mesmo número de conjuntos ({self.num_sets})")
+        super().register_cache(processor_id, cache)
+        self.stats.processor(processor_id)
+        if self.num_sets != cache.num_sets:
+            self.num_sets = cache.num_sets
+            self.set_locks = [threading.RLock() for _ in range(cache.num_sets)]
+
+    def set_index(self, address):
+        """
+        Calcula o conjunto de cache que contém o endereço.
+
+        :param address: Endereço de memória.
+        :return: Índice do conjunto.
+        """
+        return (address // self.block_size) % len(self.set_locks)
+
+    def lock_for(self, address):
+        """
+        Obtém a trava do conjunto que contém o endereço.
+
+        :param address: Endereço de memória.
+        :return: Trava reentrante do conjunto.
+        """
+        return self.set_locks[self.set_index(address)]
+
+    def handle_read(self, processor_id, address, memory):
+        with self.lock_for(address):
+            return super().handle_read(processor_id, address, memory)
+
+    def handle_write(self, processor_id, address, data, memory):
+        with self.lock_for(address):
+            return super().handle_write(processor_id, address, data, memory)
+
+    def snoop_read(self, address):
+        with self.lock_for(address):
+            return super().snoop_read(address)
+
+    def handle_reads(self, processor_id, addresses):
+        # O caminho em lote consulta vários conjuntos de uma vez; aqui cada leitura trava apenas o seu conjunto
+        return [self.handle_read(processor_id, address, self.memory) for address in addresses]
+
+    def handle_writes(self, processor_id, writes):
+        return [self.handle_write(processor_id, address, data, self.memory) for address, data in writes]
+
+class ConcurrentParkingManager(ParkingManager):
+    """
+    ParkingManager seguro para uso por várias threads sobre um ConcurrentCacheManager.
+
+    Cada operação trava o conjunto de cache das vagas envolvidas durante toda a verificação e escrita, de modo
+    que verificar e estacionar é atômico por vaga. A unicidade de cada carro é garantida por uma trava curta
+    do estacionamento, usada apenas para consultar e atualizar os índices de ParkingLot, nunca durante o
+    tráfego de coerência.
+    """
+    def __init__(self, parking_lot, cache_manager):
+        """
+        Inicializa o gerenciador de estacionamento com o estacionamento e o gerenciador de cache.
+
+        :param parking_lot: Instância do estacionamento.
+        :param cache_manager: Instância de ConcurrentCacheManager.
+        """
+        super().__init__(parking_lot, cache_manager)
+        self.lot_lock = threading.Lock()
+
+    def park_car_result(self, processor_id, car_id, slot_id):
+        with self.cache_manager.lock_for(slot_id):
+            with self.lot_lock:
+                if self.parking_lot.is_car_parked(car_id):
+                    return ParkingResult(ParkingStatus.CAR_ALREADY_PARKED, processor_id, slot_id, car_id)
+                occupant = self.parking_lot.slots[slot_id].occupied_by
+                if occupant is not None:
+                    return ParkingResult(ParkingStatus.SLOT_OCCUPIED, processor_id, slot_id, occupant.id)
+                car = Car(car_id)
+                car.processor_id = processor_id
+                self.parking_lot.occupy(slot_id, car)  # Reserva a vaga e o carro antes da escrita
+            try:
+                transaction = self.cache_manager.handle_write(processor_id, slot_id, car_id, self.cache_manager.memory)
+            except Exception:
+                with self.lot_lock:
+                    self.parking_lot.release(slot_id)
+                raise
+        return ParkingResult(ParkingStatus.PARKED, processor_id, slot_id, car_id, transaction)
+
+    def park_any_result(self, processor_id, car_id):
+        while True:
+            with self.lot_lock:
+                if self.parking_lot.is_car_parked(car_id):
+                    return ParkingResult(ParkingStatus.CAR_ALREADY_PARKED, processor_id, None, car_id)
+                slot_id = self.parking_lot.lowest_free_slot()
+                if slot_id is None:
+                    return ParkingResult(ParkingStatus.LOT_FULL, processor_id, None, car_id)
+            result = self.park_car_result(processor_id, car_id, slot_id)
+            if result.status != ParkingStatus.SLOT_OCCUPIED:
+                return result
+            # Outra thread ocupou a vaga entre a escolha e a reserva: tenta a próxima
+
+    def remove_car_result(self, processor_id, slot_id):
+        with self.cache_manager.lock_for(slot_id):
+            car = self.parking_lot.slots[slot_id].occupied_by
+            if car is None:
+                return ParkingResult(ParkingStatus.SLOT_FREE, processor_id, slot_id)
+            if car.processor_id != processor_id:
+                return ParkingResult(ParkingStatus.NOT_OWNER, processor_id, slot_id, car.id, owner_id=car.processor_id)
+            transaction = self.cache_manager.handle_write(processor_id, slot_id, 0, self.cache_manager.memory)
+            with self.lot_lock:
+                self.parking_lot.release(slot_id)
+        return ParkingResult(ParkingStatus.REMOVED, processor_id, slot_id, car.id, transaction)
+
+    def move_car_result(self, processor_id, from_slot_id, to_slot_id):
+        cache_manager = self.cache_manager
+        # As travas são obtidas em ordem crescente de conjunto para evitar impasse entre duas mudanças cruzadas
+        locks = [cache_manager.set_locks[i] for i in sorted({cache_manager.set_index(from_slot_id),
+                                                             cache_manager.set_index(to_slot_id)})]
+        for lock in locks:
+            lock.acquire()
+        try:
+            car = self.parking_lot.slots[from_slot_id].occupied_by
+            if not car:
+                return ParkingResult(ParkingStatus.SLOT_FREE, processor_id, from_slot_id, to_slot_id=to_slot_id)
+            if self.parking_lot.slots[to_slot_id].occupied_by:
+                return ParkingResult(ParkingStatus.SLOT_OCCUPIED, processor_id, from_slot_id, car.id, to_slot_id=to_slot_id)
+            if car.processor_id != processor_id:
+                return ParkingResult(ParkingStatus.NOT_OWNER, processor_id, from_slot_id, car.id, owner_id=car.processor_id)
+            cache_manager.handle_write(processor_id, from_slot_id, 0, cache_manager.memory)
+            cache_manager.handle_write(processor_id, to_slot_id, car.id, cache_manager.memory)
+            with self.lot_lock:
+                self.parking_lot.release(from_slot_id)
+                self.parking_lot.occupy(to_slot_id, car)
+            return ParkingResult(ParkingStatus.MOVED, processor_id, from_slot_id, car.id, to_slot_id=to_slot_id)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def park_many(self, processor_id, requests):
+        # A validação antecipada do lote não vale com outras threads alterando o estacionamento
+        return [self.park_car_result(processor_id, car_id, slot_id) if slot_id is not None
+                else self.park_any_result(processor_id, car_id) for car_id, slot_id in requests]
+
+    def remove_many(self, processor_id, slot_ids):
+        return [self.remove_car_result(processor_id, slot_id) for slot_id in slot_ids]
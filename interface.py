@@ -5,15 +5,15 @@ from cacheManager import CacheManager
 from processor import Processor
 from parking import ParkingLot
 from parking import ParkingManager
-import sys
-import io
+from runner import BackgroundRun
+from views import VirtualTable
 
 class ParkingApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Simulador de Estacionamento com Protocolo MESI")
 
-        self.root.geometry("480x580")
+        self.root.geometry("1000x660")
         self.root.resizable(False, False)
 
         self.memory = Memory(50)
@@ -27,6 +27,7 @@ class ParkingApp:
         self.processors = [self.processor1, self.processor2, self.processor3]
 
         self.selected_processor = None
+        self.background_run = None
 
         self.create_widgets()
 
@@ -65,6 +66,146 @@ class ParkingApp:
         self.output_text.grid(row=10, column=0, columnspan=2, pady=5, padx=5)
         self.output_text.config(state=tk.DISABLED)
 
+        self.run_button = ttk.Button(self.root, text="Executar Carga em Segundo Plano", command=self.start_background_run)
+        self.run_button.grid(row=11, column=0, pady=5, padx=5, sticky=tk.W)
+
+        self.stop_button = ttk.Button(self.root, text="Interromper Carga", command=self.stop_background_run,
+                                      state=tk.DISABLED)
+        self.stop_button.grid(row=11, column=1, pady=5, sticky=tk.W)
+
+        self.create_views()
+        self.create_metrics_panel()
+
+    def create_views(self):
+        """
+        Cria as abas com as vagas, a memória e o cache de cada processador. Cada aba é uma tabela virtualizada
+        atualizada pelos eventos de mudança do estacionamento, da memória e dos caches, de modo que só as
+        linhas alteradas e visíveis são redesenhadas.
+        """
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.grid(row=0, column=2, rowspan=12, pady=5, padx=5, sticky=tk.NSEW)
+
+        self.slots_view = VirtualTable(self.notebook, [("Vaga", 60), ("Ocupação", 180), ("Processador", 100)],
+                                       len(self.parking_lot.slots), self.slot_row)
+        self.notebook.add(self.slots_view, text="Vagas")
+        self.parking_lot.listeners.append(self.slots_view.invalidate)
+
+        self.memory_view = VirtualTable(self.notebook, [("Endereço", 100), ("Valor", 240)], self.memory.size,
+                                        lambda address: (address, self.memory.read(address)))
+        self.notebook.add(self.memory_view, text="Memória")
+        self.memory.listeners.append(self.memory_view.invalidate)
+
+        self.cache_views = {}
+        for processor in self.processors:
+            cache = processor.cache
+            view = VirtualTable(self.notebook, [("Linha", 60), ("Endereço", 80), ("Dado", 140), ("Estado", 60)],
+                                cache.size, lambda index, cache=cache: self.cache_row(cache, index))
+            self.notebook.add(view, text=f"Cache P{processor.id}")
+            cache.listeners.append(lambda cache, position, view=view: view.invalidate(position))
+            self.cache_views[processor.id] = view
+
+    def create_metrics_panel(self):
+        """
+        Cria a aba de métricas da carga em segundo plano: vazão, taxa de acerto por processador e distribuição
+        dos estados MESI, atualizadas enquanto a carga executa.
+        """
+        self.metrics_panel = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(self.metrics_panel, text="Métricas")
+        ttk.Label(self.metrics_panel, text="Carga em segundo plano (num simulador separado, com a mesma configuração)"
+                  ).grid(row=0, column=0, sticky=tk.W, pady=(0, 10))
+        self.metrics_text = tk.StringVar(value="Nenhuma carga executada.")
+        ttk.Label(self.metrics_panel, textvariable=self.metrics_text, justify=tk.LEFT, font="TkFixedFont"
+                  ).grid(row=1, column=0, sticky=tk.W)
+
+    def start_background_run(self):
+        if self.background_run is not None and not self.background_run.finished:
+            messagebox.showerror("Erro", "Já há uma carga em execução.")
+            return
+        operations = simpledialog.askinteger("Executar Carga", "Número de operações:", minvalue=1,
+                                             initialvalue=1000000)
+        if operations is None:
+            return
+        config = {'num_processors': len(self.processors), 'cache_size': self.processors[0].cache.size,
+                  'memory_size': self.memory.size, 'num_slots': len(self.parking_lot.slots)}
+        workload = {'processors': len(self.processors), 'slots': len(self.parking_lot.slots),
+                    'operations': operations}
+        self.background_run = BackgroundRun(config, workload)
+        self.run_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.NORMAL)
+        self.metrics_text.set("Iniciando...")
+        self.notebook.select(self.metrics_panel)
+        self.root.after(100, self.poll_background_run)
+
+    def stop_background_run(self):
+        if self.background_run is not None:
+            self.background_run.stop()
+
+    def poll_background_run(self):
+        """
+        Lê o andamento da carga em segundo plano e atualiza o painel; chamado periodicamente por root.after
+        enquanto a carga executa, sem nunca bloquear o laço do Tk.
+        """
+        run = self.background_run
+        updates = run.poll()
+        if updates:
+            self.metrics_text.set(self.format_metrics(updates[-1]))
+        if run.finished:
+            self.run_button.config(state=tk.NORMAL)
+            self.stop_button.config(state=tk.DISABLED)
+        else:
+            self.root.after(100, self.poll_background_run)
+
+    def format_metrics(self, update):
+        """
+        Formata um resumo de andamento da carga para o painel de métricas.
+
+        :param update: Dicionário produzido por runner.progress.
+        :return: Texto do painel.
+        """
+        if update['done']:
+            status = f"Erro: {update['error']}" if 'error' in update else "Concluída"
+        else:
+            status = "Executando..."
+        lines = [f"Estado: {status}"]
+        if 'operations' in update:
+            lines.append(f"Operações: {update['operations']}")
+            lines.append(f"Vazão: {update['rate']:.0f} ops/s")
+            lines.append("")
+            lines.append("Taxa de acerto por processador:")
+            for pid, hit_rate in sorted(update['hit_rates'].items()):
+                lines.append(f"  Processador {pid}: {hit_rate:6.1%}")
+            lines.append("")
+            total = sum(update['states'].values())
+            lines.append("Linhas de cache por estado MESI:")
+            for state, count in update['states'].items():
+                lines.append(f"  {state}: {count:>6} ({count / total if total else 0:6.1%})")
+        return "\n".join(lines)
+
+    def slot_row(self, slot_id):
+        """
+        Monta os valores de uma vaga para a tabela de vagas.
+
+        :param slot_id: Identificador da vaga.
+        :return: Tupla (vaga, ocupação, processador).
+        """
+        car = self.parking_lot.slots[slot_id].occupied_by
+        if car is None:
+            return slot_id, "Vaga Livre", ""
+        return slot_id, f"Ocupada por Carro {car.id}", car.processor_id
+
+    def cache_row(self, cache, index):
+        """
+        Monta os valores de uma linha de cache para a tabela do cache.
+
+        :param cache: Instância do cache.
+        :param index: Índice da linha.
+        :return: Tupla (linha, endereço, dado, estado).
+        """
+        line = cache.lines[index]
+        if line.address is None:
+            return index, "", "", line.state.value
+        return index, line.address, line.data, line.state.value
+
     def select_processor(self):
         processor_id = int(tk.simpledialog.askstring("Selecionar Processador", "Digite o ID do processador:"))
         self.selected_processor = None
@@ -112,25 +253,12 @@ class ParkingApp:
         self.show_output(result)
 
     def show_parking_slots(self):
-        self.output_text.config(state=tk.NORMAL)
-        self.output_text.delete(1.0, tk.END)
-        output = "Estado das Vagas no Estacionamento:\n\n"
-        output += self.parking_lot.print_slots()  # Chama o método print_slots da classe ParkingLot
-        self.output_text.insert(tk.END, output)
-        self.output_text.config(state=tk.DISABLED)
+        # As abas já estão sempre atualizadas: basta mostrar a aba das vagas
+        self.notebook.select(self.slots_view)
 
     def show_status(self):
-        old_stdout = sys.stdout
-        result = io.StringIO()
-        sys.stdout = result
-
-        for processor in self.processors:
-            processor.print_cache()
-        self.memory.print_memory()
-
-        output = result.getvalue()
-        sys.stdout = old_stdout
-        self.show_output(output)
+        processor = self.selected_processor or self.processors[0]
+        self.notebook.select(self.cache_views[processor.id])
 
     def show_output(self, output):
         self.output_text.config(state=tk.NORMAL)
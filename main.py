@@ -1,7 +1,49 @@
-from interface import ParkingApp
-import tkinter as tk
+import argparse
+import importlib
+import logging
+import sys
 
-if __name__ == "__main__":
+# Subcomandos de linha de comando: nome -> módulo cuja função main recebe os argumentos restantes
+COMMANDS = {
+    'replay': 'replay',
+    'workload': 'workload',
+    'sweep': 'sweep',
+    'bench': 'benchsuite',
+    'recording': 'recorder',
+}
+
+def run_gui():
+    """
+    Abre a interface gráfica. O Tk só é importado aqui, para que os comandos sem interface funcionem em
+    máquinas sem display e não paguem o custo de importá-lo.
+    """
+    import tkinter as tk
+    from interface import ParkingApp
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     root = tk.Tk()
     app = ParkingApp(root)
     root.mainloop()
+
+def main(argv=None):
+    """
+    Ponto de entrada: sem argumentos (ou com 'gui') abre a interface gráfica; os demais subcomandos executam
+    o simulador sem interface.
+
+    :param argv: Argumentos de linha de comando (padrão: sys.argv[1:]).
+    :return: Código de saída do subcomando.
+    """
+    parser = argparse.ArgumentParser(description="Simulador de estacionamento com protocolo MESI.",
+                                     epilog="Use '<comando> --help' para ver as opções de cada comando.")
+    parser.add_argument("command", nargs="?", default="gui", choices=['gui'] + list(COMMANDS),
+                        help="gui (padrão), replay, workload, sweep, bench ou recording")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Argumentos do comando")
+    args = parser.parse_args(argv)
+
+    if args.command == 'gui':
+        run_gui()
+        return 0
+    return importlib.import_module(COMMANDS[args.command]).main(args.args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,70 @@
+from array import array
+import mmap
+import os
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele a memória usa array('q') ou mmap
+    np = None
+
+WORD_SIZE = 8  # Cada endereço guarda um inteiro de 64 bits
+
 class Memory:
     """
     Representa a memória principal de um sistema com um tamanho fixo e operações de leitura e escrita.
+
+    Os valores são guardados como inteiros de 64 bits num vetor contíguo (NumPy, quando disponível, ou array('q')).
+    Se um arquivo for informado, a memória é mapeada nele, o que permite salvar e recarregar imagens de memória
+    maiores que a RAM disponível. No modo cópia na escrita o arquivo nunca é alterado: as páginas são
+    compartilhadas com o arquivo até serem escritas, o que permite várias memórias independentes a partir da
+    mesma imagem sem copiá-la.
     """
-    def __init__(self, size):
+    def __init__(self, size, path=None, offset=0, copy_on_write=False):
         """
         Inicializa a memória com um tamanho específico e preenche com zeros.
 
         :param size: Tamanho da memória (número de endereços).
+        :param path: Arquivo onde a memória será mapeada. Se já existir, seu conteúdo é carregado
+                     (e ampliado com zeros se for menor que size).
+        :param offset: Posição, em bytes, da imagem dentro do arquivo. Deve ser múltiplo de
+                       mmap.ALLOCATIONGRANULARITY.
+        :param copy_on_write: Se True, mapeia o arquivo em modo cópia na escrita; o arquivo deve conter
+                              a imagem inteira.
         """
         self.size = size
-        self.data = [0 for _ in range(size)]  # Inicializa a memória com 0s
+        self.path = path
+        self.copy_on_write = copy_on_write
+        self.mmap = None
+        self.listeners = []  # Funções chamadas com (endereço inicial, número de endereços) a cada escrita
+        if path is None:
+            if np is not None:
+                self.data = np.zeros(size, dtype=np.int64)
+            else:
+                self.data = array('q', bytes(size * WORD_SIZE))  # Inicializa a memória com 0s
+            return
+
+        if not copy_on_write:
+            with open(path, 'ab') as file:
+                if os.path.getsize(path) < offset + size * WORD_SIZE:
+                    file.truncate(offset + size * WORD_SIZE)
+        if np is not None:
+            self.data = np.memmap(path, dtype=np.int64, mode='c' if copy_on_write else 'r+', offset=offset,
+                                  shape=(size,))
+        else:
+            with open(path, 'rb' if copy_on_write else 'r+b') as file:
+                self.mmap = mmap.mmap(file.fileno(), size * WORD_SIZE, offset=offset,
+                                      access=mmap.ACCESS_COPY if copy_on_write else mmap.ACCESS_WRITE)
+            self.data = memoryview(self.mmap).cast('q')
+
+    @classmethod
+    def open(cls, path):
+        """
+        Recarrega uma imagem de memória salva em arquivo, com o tamanho determinado pelo próprio arquivo.
+
+        :param path: Arquivo da imagem de memória.
+        :return: Instância de Memory mapeada no arquivo.
+        """
+        return cls(os.path.getsize(path) // WORD_SIZE, path)
 
     def read(self, address):
         """
@@ -19,8 +74,8 @@ class Memory:
         :return: Valor armazenado no endereço especificado.
         :raises IndexError: Se o endereço estiver fora dos limites da memória.
         """
-        return self.data[address]
-    
+        return int(self.data[address])
+
     def write(self, address, data):
         """
         Escreve um valor no endereço especificado.
@@ -30,12 +85,72 @@ class Memory:
         :raises IndexError: Se o endereço estiver fora dos limites da memória.
         """
         self.data[address] = data
+        if self.listeners:
+            self.notify(address, 1)
+
+    def read_block(self, address, size):
+        """
+        Lê um bloco de endereços consecutivos de uma só vez.
+
+        :param address: Endereço inicial do bloco.
+        :param size: Número de endereços do bloco.
+        :return: Lista com os valores do bloco.
+        :raises IndexError: Se o bloco ultrapassar os limites da memória.
+        """
+        if address < 0 or address + size > self.size:
+            raise IndexError(f"Bloco [{address}, {address + size}) fora dos limites da memória")
+        return self.data[address:address + size].tolist()
+
+    def write_block(self, address, values):
+        """
+        Escreve um bloco de valores em endereços consecutivos de uma só vez.
+
+        :param address: Endereço inicial do bloco.
+        :param values: Valores a serem escritos.
+        :raises IndexError: Se o bloco ultrapassar os limites da memória.
+        """
+        if address < 0 or address + len(values) > self.size:
+            raise IndexError(f"Bloco [{address}, {address + len(values)}) fora dos limites da memória")
+        if np is None:
+            values = array('q', values)
+        self.data[address:address + len(values)] = values
+        if self.listeners:
+            self.notify(address, len(values))
+
+    def notify(self, address, count):
+        """
+        Avisa os ouvintes de que um trecho da memória foi escrito.
+
+        :param address: Endereço inicial do trecho.
+        :param count: Número de endereços do trecho.
+        """
+        for listener in self.listeners:
+            listener(address, count)
+
+    def flush(self):
+        """
+        Grava no arquivo as alterações pendentes de uma memória mapeada. Não faz nada para memórias em RAM
+        nem para memórias em modo cópia na escrita.
+        """
+        if self.path is None or self.copy_on_write:
+            return
+        if np is not None:
+            self.data.flush()
+        else:
+            self.mmap.flush()
+
+    def save(self, path):
+        """
+        Salva o conteúdo da memória num arquivo binário, que pode ser recarregado com Memory.open.
+
+        :param path: Arquivo de destino.
+        """
+        with open(path, 'wb') as file:
+            file.write(memoryview(self.data).cast('B'))
 
     def print_memory(self):
         """
         Imprime o conteúdo da memória principal, mostrando o valor de cada endereço.
         """
-        print("Memória Principal:")
-        for i, value in enumerate(self.data):
-            print(f"Endereço {i}: {value}")
-        print()
+        lines = [f"Endereço {i}: {value}" for i, value in enumerate(self.data.tolist())]
+        print("Memória Principal:\n" + "\n".join(lines) + "\n")
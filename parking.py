@@ -1,3 +1,9 @@
+from enum import Enum
+import heapq
+
+# Número de vagas de cada bloco com contador próprio de vagas livres (veja ParkingLot.count_free)
+COUNT_BLOCK = 64
+
 class Car:
     """
     Representa um carro que pode ser estacionado em uma vaga.
@@ -44,6 +50,9 @@ class ParkingSlot:
 class ParkingLot:
     """
     Representa um estacionamento composto por várias vagas.
+
+    Além das vagas, mantém um índice carro -> vaga e um heap das vagas livres (com remoção preguiçosa),
+    para que as consultas por carro e a busca pela menor vaga livre não precisem percorrer todas as vagas.
     """
     def __init__(self, size):
         """
@@ -52,6 +61,23 @@ class ParkingLot:
         :param size: Número de vagas no estacionamento.
         """
         self.slots = [ParkingSlot(i) for i in range(size)]
+        self.car_slots = {}  # car_id -> slot_id dos carros estacionados
+        self.free_slots = list(range(size))  # Heap de vagas candidatas a livres (pode conter vagas já ocupadas)
+        self.queued = bytearray(b'\x01' * size)  # Indica se a vaga está no heap, para não duplicá-la
+        self.occupied = bytearray(size)  # Mapa de ocupação: 1 para vaga ocupada, 0 para vaga livre
+        self.free_count = size
+        # Vagas livres por bloco de COUNT_BLOCK vagas, para contar intervalos sem percorrer o mapa de ocupação
+        self.block_free = [min(COUNT_BLOCK, size - start) for start in range(0, size, COUNT_BLOCK)]
+        self.listeners = []  # Funções chamadas com o identificador da vaga quando sua ocupação muda
+
+    def notify(self, slot_id):
+        """
+        Avisa os ouvintes de que a ocupação de uma vaga mudou.
+
+        :param slot_id: Identificador da vaga.
+        """
+        for listener in self.listeners:
+            listener(slot_id)
 
     def print_slots(self):
         """
@@ -59,11 +85,9 @@ class ParkingLot:
 
         :return: String representando o estado de todas as vagas.
         """
-        status = "Estado das Vagas:\n"
-        for slot in self.slots:
-            car_id = slot.occupied_by.id if slot.occupied_by else "Nenhum"
-            status += f"Vaga {slot.id}: Ocupada por Carro {car_id}\n" if slot.occupied_by else f"Vaga {slot.id}: Vaga Livre\n"
-        return status
+        lines = [f"Vaga {slot.id}: Ocupada por Carro {slot.occupied_by.id}" if slot.occupied_by else f"Vaga {slot.id}: Vaga Livre"
+                 for slot in self.slots]
+        return "Estado das Vagas:\n" + "".join(line + "\n" for line in lines)
 
     def is_car_parked(self, car_id):
         """
@@ -72,10 +96,16 @@ class ParkingLot:
         :param car_id: Identificador do carro.
         :return: True se o carro estiver estacionado, False caso contrário.
         """
-        for slot in self.slots:
-            if slot.occupied_by and slot.occupied_by.id == car_id:
-                return True
-        return False
+        return car_id in self.car_slots
+
+    def slot_of(self, car_id):
+        """
+        Obtém a vaga onde um carro está estacionado.
+
+        :param car_id: Identificador do carro.
+        :return: Identificador da vaga, ou None se o carro não estiver estacionado.
+        """
+        return self.car_slots.get(car_id)
     
     def is_slot_free(self, slot_id):
         """
@@ -96,9 +126,193 @@ class ParkingLot:
         """
         return self.slots[slot_id].is_occupied_by(car_id)
 
+    def occupy(self, slot_id, car):
+        """
+        Ocupa uma vaga livre com um carro, atualizando os índices.
+
+        :param slot_id: Identificador da vaga.
+        :param car: Instância do carro.
+        :raises ValueError: Se a vaga já estiver ocupada ou se o carro já estiver estacionado.
+        """
+        slot = self.slots[slot_id]
+        if slot.occupied_by is not None:
+            raise ValueError(f"Vaga {slot_id} já está ocupada pelo carro {slot.occupied_by.id}")
+        if car.id in self.car_slots:
+            raise ValueError(f"Carro {car.id} já está estacionado na vaga {self.car_slots[car.id]}")
+        slot.occupied_by = car
+        self.car_slots[car.id] = slot_id
+        self.occupied[slot_id] = 1
+        self.free_count -= 1
+        self.block_free[slot_id // COUNT_BLOCK] -= 1
+        if self.listeners:
+            self.notify(slot_id)
+
+    def release(self, slot_id):
+        """
+        Libera uma vaga ocupada, atualizando os índices.
+
+        :param slot_id: Identificador da vaga.
+        :return: O carro que ocupava a vaga.
+        """
+        slot = self.slots[slot_id]
+        car = slot.occupied_by
+        slot.occupied_by = None
+        del self.car_slots[car.id]
+        self.occupied[slot_id] = 0
+        self.free_count += 1
+        self.block_free[slot_id // COUNT_BLOCK] += 1
+        if not self.queued[slot_id]:
+            self.queued[slot_id] = 1
+            heapq.heappush(self.free_slots, slot_id)
+        if self.listeners:
+            self.notify(slot_id)
+        return car
+
+    def lowest_free_slot(self):
+        """
+        Obtém a vaga livre de menor identificador, em O(log n) amortizado.
+
+        :return: Identificador da vaga, ou None se o estacionamento estiver lotado.
+        """
+        free_slots = self.free_slots
+        while free_slots:
+            slot_id = free_slots[0]
+            if self.slots[slot_id].occupied_by is None:
+                return slot_id
+            heapq.heappop(free_slots)
+            self.queued[slot_id] = 0
+        return None
+
+    def count_free(self, start=0, stop=None):
+        """
+        Conta as vagas livres de um intervalo pelos contadores mantidos em occupy e release: o do estacionamento
+        inteiro, em O(1), ou os de cada bloco de COUNT_BLOCK vagas, de modo que só as vagas das pontas do intervalo
+        que não completam um bloco são contadas no mapa de ocupação (O(intervalo / COUNT_BLOCK + COUNT_BLOCK)).
+
+        :param start: Primeira vaga do intervalo.
+        :param stop: Vaga seguinte à última do intervalo (padrão: fim do estacionamento).
+        :return: Número de vagas livres no intervalo.
+        """
+        size = len(self.occupied)
+        stop = size if stop is None else min(stop, size)
+        start = max(start, 0)
+        if start == 0 and stop == size:
+            return self.free_count
+        if start >= stop:
+            return 0
+        first = -(-start // COUNT_BLOCK)  # Primeiro bloco inteiro do intervalo
+        last = stop // COUNT_BLOCK        # Bloco seguinte ao último bloco inteiro
+        if first >= last:
+            return stop - start - self.occupied.count(1, start, stop)
+        head = first * COUNT_BLOCK - start - self.occupied.count(1, start, first * COUNT_BLOCK)
+        tail = stop - last * COUNT_BLOCK - self.occupied.count(1, last * COUNT_BLOCK, stop)
+        return head + sum(self.block_free[first:last]) + tail
+
+    def free_slots_in_range(self, start=0, stop=None):
+        """
+        Lista as vagas livres de um intervalo, saltando as ocupadas pelo mapa de ocupação.
+
+        :param start: Primeira vaga do intervalo.
+        :param stop: Vaga seguinte à última do intervalo (padrão: fim do estacionamento).
+        :return: Lista dos identificadores das vagas livres, em ordem crescente.
+        """
+        occupied = self.occupied
+        stop = len(occupied) if stop is None else min(stop, len(occupied))
+        free = []
+        slot_id = occupied.find(0, max(start, 0), stop)
+        while slot_id != -1:
+            free.append(slot_id)
+            slot_id = occupied.find(0, slot_id + 1, stop)
+        return free
+
+class ParkingStatus(Enum):
+    """
+    Enumeração que representa os possíveis resultados de uma operação do estacionamento.
+    """
+    PARKED = 'parked'                        # Carro estacionado com sucesso.
+    REMOVED = 'removed'                      # Carro removido com sucesso.
+    CHECKED = 'checked'                      # Vaga verificada (leitura).
+    MOVED = 'moved'                          # Carro mudou de vaga.
+    CAR_ALREADY_PARKED = 'car_already_parked'  # Erro: o carro já está em outra vaga.
+    SLOT_OCCUPIED = 'slot_occupied'          # Erro: a vaga já está ocupada.
+    SLOT_FREE = 'slot_free'                  # Erro: a vaga de origem está livre.
+    NOT_OWNER = 'not_owner'                  # Erro: outro processador estacionou o carro.
+    LOT_FULL = 'lot_full'                    # Erro: não há vagas livres.
+
+class ParkingResult:
+    """
+    Resultado estruturado de uma operação do estacionamento. A mensagem em texto só é montada
+    quando solicitada através de `message`.
+    """
+    __slots__ = ('status', 'processor_id', 'slot_id', 'car_id', 'transaction', 'to_slot_id', 'owner_id')
+
+    def __init__(self, status, processor_id, slot_id, car_id=None, transaction=None, to_slot_id=None, owner_id=None):
+        """
+        Inicializa o resultado de uma operação.
+
+        :param status: Valor de ParkingStatus que descreve o resultado.
+        :param processor_id: Identificador do processador que realizou a operação.
+        :param slot_id: Identificador da vaga envolvida (vaga de origem, no caso de mudança de vaga).
+        :param car_id: Identificador do carro envolvido, se houver (0 indica vaga livre em uma verificação).
+        :param transaction: Código da transação realizada pelo cache ('RH', 'RM', 'WH' ou 'WM'), se houver.
+        :param to_slot_id: Identificador da vaga de destino, no caso de mudança de vaga.
+        :param owner_id: Identificador do processador que estacionou o carro, nos erros de permissão.
+        """
+        self.status = status
+        self.processor_id = processor_id
+        self.slot_id = slot_id
+        self.car_id = car_id
+        self.transaction = transaction
+        self.to_slot_id = to_slot_id
+        self.owner_id = owner_id
+
+    @property
+    def ok(self):
+        """
+        Indica se a operação foi realizada com sucesso.
+        """
+        return self.status in (ParkingStatus.PARKED, ParkingStatus.REMOVED, ParkingStatus.CHECKED, ParkingStatus.MOVED)
+
+    @property
+    def message(self):
+        """
+        Mensagem em texto descrevendo o resultado da operação.
+        """
+        status = self.status
+        if status == ParkingStatus.PARKED:
+            return f"Carro {self.car_id} estacionado na Vaga {self.slot_id} pelo Processador {self.processor_id}  {self.transaction}"
+        if status == ParkingStatus.REMOVED:
+            return f"Carro removido da Vaga {self.slot_id} pelo Processador {self.processor_id} - {self.transaction}"
+        if status == ParkingStatus.CHECKED:
+            state = f"Ocupada por Carro {self.car_id}" if self.car_id != 0 else "Livre"
+            if self.transaction is None:
+                return f"Vaga {self.slot_id} está {state}"
+            return f"Vaga {self.slot_id} está {state} {self.transaction}"
+        if status == ParkingStatus.MOVED:
+            return "Carro alterado de vaga"
+        if status == ParkingStatus.CAR_ALREADY_PARKED:
+            return f"Erro: Carro {self.car_id} já está estacionado em outra vaga"
+        if status == ParkingStatus.SLOT_OCCUPIED:
+            if self.to_slot_id is not None:
+                return f"Erro: Vaga {self.to_slot_id} já está ocupada"
+            return f"Erro: Vaga {self.slot_id} já está ocupada pelo carro {self.car_id}"
+        if status == ParkingStatus.SLOT_FREE:
+            if self.to_slot_id is not None:
+                return f"Erro: Vaga {self.slot_id} está livre"
+            return f"Erro: Vaga {self.slot_id} já está livre"
+        if status == ParkingStatus.LOT_FULL:
+            return "Erro: Não há vagas livres"
+        return f"Erro: Somente o Processador {self.owner_id} pode remover o Carro {self.car_id}"
+
+    def __str__(self):
+        return self.message
+
 class ParkingManager:
     """
     Gerencia operações de estacionamento e remoção de carros, e interage com o sistema de cache.
+
+    Os métodos park_car, remove_car, check_slot e move_car retornam mensagens em texto; as variantes
+    terminadas em _result retornam um ParkingResult, sem montar nenhuma mensagem.
     """
     def __init__(self, parking_lot, cache_manager):
         """
@@ -119,18 +333,52 @@ class ParkingManager:
         :param slot_id: Identificador da vaga onde o carro será estacionado.
         :return: Mensagem indicando o resultado da operação.
         """
-        texto = ""
+        return self.park_car_result(processor_id, car_id, slot_id).message
+
+    def park_car_result(self, processor_id, car_id, slot_id):
+        """
+        Tenta estacionar um carro em uma vaga específica.
+
+        :param processor_id: Identificador do processador que está realizando a operação.
+        :param car_id: Identificador do carro a ser estacionado.
+        :param slot_id: Identificador da vaga onde o carro será estacionado.
+        :return: ParkingResult com o resultado da operação.
+        """
         if self.parking_lot.is_car_parked(car_id):
-            texto = f"Erro: Carro {car_id} já está estacionado em outra vaga"
-            return texto
+            return ParkingResult(ParkingStatus.CAR_ALREADY_PARKED, processor_id, slot_id, car_id)
 
         if not self.parking_lot.is_slot_free(slot_id):
-            texto = f"Erro: Vaga {slot_id} já está ocupada pelo carro {self.parking_lot.slots[slot_id].occupied_by.id}"
-            return texto
+            return ParkingResult(ParkingStatus.SLOT_OCCUPIED, processor_id, slot_id,
+                                 self.parking_lot.slots[slot_id].occupied_by.id)
+
+        transaction = self.perform_park_car(processor_id, car_id, slot_id)
+        return ParkingResult(ParkingStatus.PARKED, processor_id, slot_id, car_id, transaction)
 
+    def park_any(self, processor_id, car_id):
+        """
+        Estaciona um carro na vaga livre de menor identificador.
+
+        :param processor_id: Identificador do processador que está realizando a operação.
+        :param car_id: Identificador do carro a ser estacionado.
+        :return: Mensagem indicando o resultado da operação.
+        """
+        return self.park_any_result(processor_id, car_id).message
+
+    def park_any_result(self, processor_id, car_id):
+        """
+        Estaciona um carro na vaga livre de menor identificador, sem percorrer as vagas.
+
+        :param processor_id: Identificador do processador que está realizando a operação.
+        :param car_id: Identificador do carro a ser estacionado.
+        :return: ParkingResult com o resultado da operação.
+        """
+        if self.parking_lot.is_car_parked(car_id):
+            return ParkingResult(ParkingStatus.CAR_ALREADY_PARKED, processor_id, None, car_id)
+        slot_id = self.parking_lot.lowest_free_slot()
+        if slot_id is None:
+            return ParkingResult(ParkingStatus.LOT_FULL, processor_id, None, car_id)
         transaction = self.perform_park_car(processor_id, car_id, slot_id)
-        texto = f"Carro {car_id} estacionado na Vaga {slot_id} pelo Processador {processor_id}  {transaction}"
-        return texto
+        return ParkingResult(ParkingStatus.PARKED, processor_id, slot_id, car_id, transaction)
 
     def perform_park_car(self, processor_id, car_id, slot_id):
         """
@@ -146,7 +394,7 @@ class ParkingManager:
         slot_address = slot_id
         transaction = self.cache_manager.handle_write(processor_id, slot_address, car.id, self.cache_manager.memory)
 
-        self.parking_lot.slots[slot_id].occupied_by = car
+        self.parking_lot.occupy(slot_id, car)
         return transaction
 
     def remove_car(self, processor_id, slot_id):
@@ -157,17 +405,25 @@ class ParkingManager:
         :param slot_id: Identificador da vaga de onde o carro será removido.
         :return: Mensagem indicando o resultado da operação.
         """
+        return self.remove_car_result(processor_id, slot_id).message
+
+    def remove_car_result(self, processor_id, slot_id):
+        """
+        Remove o carro de uma vaga específica.
+
+        :param processor_id: Identificador do processador que está realizando a operação.
+        :param slot_id: Identificador da vaga de onde o carro será removido.
+        :return: ParkingResult com o resultado da operação.
+        """
         slot = self.parking_lot.slots[slot_id]
-        if slot.is_occupied():
-            if slot.occupied_by.processor_id == processor_id:
-                texto = self.perform_remove_car(processor_id, slot_id)
-            else:
-                texto = f"Erro: Somente o Processador {slot.occupied_by.processor_id} pode remover o Carro {slot.occupied_by.id}"
-                return texto
-        else:
-            texto = f"Erro: Vaga {slot_id} já está livre"
-        
-        return texto
+        if not slot.is_occupied():
+            return ParkingResult(ParkingStatus.SLOT_FREE, processor_id, slot_id)
+        car = slot.occupied_by
+        if car.processor_id != processor_id:
+            return ParkingResult(ParkingStatus.NOT_OWNER, processor_id, slot_id, car.id, owner_id=car.processor_id)
+
+        transaction = self.perform_remove_car(processor_id, slot_id)
+        return ParkingResult(ParkingStatus.REMOVED, processor_id, slot_id, car.id, transaction)
 
     def perform_remove_car(self, processor_id, slot_id):
         """
@@ -175,25 +431,38 @@ class ParkingManager:
 
         :param processor_id: Identificador do processador que está realizando a operação.
         :param slot_id: Identificador da vaga de onde o carro será removido.
-        :return: Mensagem indicando o resultado da operação e o código da transação realizada pelo cache.
+        :return: Código da transação realizada pelo cache.
         """
         transaction = self.cache_manager.handle_write(processor_id, slot_id, 0, self.cache_manager.memory)
-        self.parking_lot.slots[slot_id].occupied_by = None
-        texto = f"Carro removido da Vaga {slot_id} pelo Processador {processor_id} - {transaction}"
-        return texto
+        self.parking_lot.release(slot_id)
+        return transaction
 
-    def check_slot(self, processor_id, slot_id):
+    def check_slot(self, processor_id, slot_id, snoop=False):
         """
         Verifica o estado de uma vaga específica e lê a informação do cache.
 
         :param processor_id: Identificador do processador que está realizando a operação.
         :param slot_id: Identificador da vaga a ser verificada.
+        :param snoop: Se True, faz uma leitura de monitoramento (veja check_slot_result).
         :return: Mensagem indicando o estado da vaga e o código da transação realizada pelo cache.
         """
+        return self.check_slot_result(processor_id, slot_id, snoop).message
+
+    def check_slot_result(self, processor_id, slot_id, snoop=False):
+        """
+        Verifica o estado de uma vaga específica e lê a informação do cache.
+
+        :param processor_id: Identificador do processador que está realizando a operação.
+        :param slot_id: Identificador da vaga a ser verificada.
+        :param snoop: Se True, lê o valor com CacheManager.snoop_read, sem alocar linha no cache do processador,
+                      sem alterar os estados dos outros caches e sem contar acertos ou faltas.
+        :return: ParkingResult cujo car_id é o dado lido (0 para vaga livre) e cuja transação é a do cache
+                 (None numa leitura de monitoramento).
+        """
+        if snoop:
+            return ParkingResult(ParkingStatus.CHECKED, processor_id, slot_id, self.cache_manager.snoop_read(slot_id))
         car_id, transaction = self.cache_manager.handle_read(processor_id, slot_id, self.cache_manager.memory)
-        status = f"Ocupada por Carro {car_id}" if car_id != 0 else "Livre"
-        texto = f"Vaga {slot_id} está {status} {transaction}"
-        return texto
+        return ParkingResult(ParkingStatus.CHECKED, processor_id, slot_id, car_id, transaction)
 
     def move_car(self, processor_id, from_slot_id, to_slot_id):
         """
@@ -204,17 +473,109 @@ class ParkingManager:
         :param to_slot_id: Identificador da vaga de destino.
         :return: Mensagem indicando o resultado da operação.
         """
+        return self.move_car_result(processor_id, from_slot_id, to_slot_id).message
+
+    def move_car_result(self, processor_id, from_slot_id, to_slot_id):
+        """
+        Move um carro de uma vaga para outra.
+
+        :param processor_id: Identificador do processador que está realizando a operação.
+        :param from_slot_id: Identificador da vaga de origem.
+        :param to_slot_id: Identificador da vaga de destino.
+        :return: ParkingResult com o resultado da operação.
+        """
         car = self.parking_lot.slots[from_slot_id].occupied_by
         if not car:
-            texto = f"Erro: Vaga {from_slot_id} está livre"
-            return texto
+            return ParkingResult(ParkingStatus.SLOT_FREE, processor_id, from_slot_id, to_slot_id=to_slot_id)
         if self.parking_lot.slots[to_slot_id].occupied_by:
-            texto = f"Erro: Vaga {to_slot_id} já está ocupada"
-            return texto
+            return ParkingResult(ParkingStatus.SLOT_OCCUPIED, processor_id, from_slot_id, car.id, to_slot_id=to_slot_id)
         if car.processor_id == processor_id:
-            self.remove_car(processor_id, from_slot_id)
-            self.park_car(processor_id, car.id, to_slot_id)
-            return "Carro alterado de vaga"
-        
-        texto = f"Erro: Somente o Processador {self.parking_lot.slots[from_slot_id].occupied_by.processor_id} pode remover o Carro {self.parking_lot.slots[from_slot_id].occupied_by.id}"
-        return texto
+            self.remove_car_result(processor_id, from_slot_id)
+            self.park_car_result(processor_id, car.id, to_slot_id)
+            return ParkingResult(ParkingStatus.MOVED, processor_id, from_slot_id, car.id, to_slot_id=to_slot_id)
+
+        return ParkingResult(ParkingStatus.NOT_OWNER, processor_id, from_slot_id, car.id, owner_id=car.processor_id)
+
+    def park_many(self, processor_id, requests):
+        """
+        Estaciona vários carros de um processador num único lote, com o mesmo resultado que park_car_result
+        (ou park_any_result, quando a vaga é None) chamado para cada pedido, na ordem. Todos os pedidos são
+        validados antes pela ocupação do estacionamento, e as escritas dos válidos vão juntas para
+        CacheManager.handle_writes.
+
+        :param processor_id: Identificador do processador que está realizando as operações.
+        :param requests: Iterável de tuplas (carro, vaga); vaga None estaciona na vaga livre de menor identificador.
+        :return: Lista de ParkingResult, na ordem dos pedidos.
+        """
+        parking_lot = self.parking_lot
+        results = []
+        parked = []
+        writes = []
+        for car_id, slot_id in requests:
+            if parking_lot.is_car_parked(car_id):
+                results.append(ParkingResult(ParkingStatus.CAR_ALREADY_PARKED, processor_id, slot_id, car_id))
+                continue
+            if slot_id is None:
+                slot_id = parking_lot.lowest_free_slot()
+                if slot_id is None:
+                    results.append(ParkingResult(ParkingStatus.LOT_FULL, processor_id, None, car_id))
+                    continue
+            elif not parking_lot.is_slot_free(slot_id):
+                results.append(ParkingResult(ParkingStatus.SLOT_OCCUPIED, processor_id, slot_id,
+                                             parking_lot.slots[slot_id].occupied_by.id))
+                continue
+            car = Car(car_id)
+            car.processor_id = processor_id
+            parking_lot.occupy(slot_id, car)
+            result = ParkingResult(ParkingStatus.PARKED, processor_id, slot_id, car_id)
+            results.append(result)
+            parked.append(result)
+            writes.append((slot_id, car_id))
+        for result, transaction in zip(parked, self.cache_manager.handle_writes(processor_id, writes)):
+            result.transaction = transaction
+        return results
+
+    def remove_many(self, processor_id, slot_ids):
+        """
+        Remove os carros de várias vagas num único lote, com o mesmo resultado que remove_car_result chamado para
+        cada vaga, na ordem. As escritas das remoções válidas vão juntas para CacheManager.handle_writes.
+
+        :param processor_id: Identificador do processador que está realizando as operações.
+        :param slot_ids: Iterável de identificadores de vagas.
+        :return: Lista de ParkingResult, na ordem das vagas.
+        """
+        parking_lot = self.parking_lot
+        results = []
+        removed = []
+        writes = []
+        for slot_id in slot_ids:
+            car = parking_lot.slots[slot_id].occupied_by
+            if car is None:
+                results.append(ParkingResult(ParkingStatus.SLOT_FREE, processor_id, slot_id))
+                continue
+            if car.processor_id != processor_id:
+                results.append(ParkingResult(ParkingStatus.NOT_OWNER, processor_id, slot_id, car.id,
+                                             owner_id=car.processor_id))
+                continue
+            parking_lot.release(slot_id)
+            result = ParkingResult(ParkingStatus.REMOVED, processor_id, slot_id, car.id)
+            results.append(result)
+            removed.append(result)
+            writes.append((slot_id, 0))
+        for result, transaction in zip(removed, self.cache_manager.handle_writes(processor_id, writes)):
+            result.transaction = transaction
+        return results
+
+    def check_many(self, processor_id, slot_ids):
+        """
+        Verifica várias vagas num único lote, com o mesmo resultado que check_slot_result chamado para cada vaga,
+        na ordem, usando CacheManager.handle_reads.
+
+        :param processor_id: Identificador do processador que está realizando as operações.
+        :param slot_ids: Iterável de identificadores de vagas.
+        :return: Lista de ParkingResult cujo car_id é o dado lido (0 para vaga livre), na ordem das vagas.
+        """
+        slot_ids = list(slot_ids)
+        return [ParkingResult(ParkingStatus.CHECKED, processor_id, slot_id, car_id, transaction)
+                for slot_id, (car_id, transaction) in zip(slot_ids,
+                                                          self.cache_manager.handle_reads(processor_id, slot_ids))]
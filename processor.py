@@ -1,8 +1,11 @@
-from cacheManager import CacheManager
+import logging
+
 from cache import Cache
 
+logger = logging.getLogger(__name__)
+
 class Processor:
-    def __init__(self, id, cache_size, memory, cache_manager):
+    def __init__(self, id, cache_size, memory, cache_manager, policy='fifo', seed=None, ways=None, block_size=1):
         """
         Inicializa um objeto Processor.
 
@@ -11,10 +14,14 @@ class Processor:
             cache_size (int): O tamanho da cache do processador.
             memory (Memory): O objeto Memory que representa a memória principal.
             cache_manager (CacheManager): O objeto CacheManager responsável por gerenciar as caches.
+            policy (str): A política de substituição da cache ('fifo', 'lru', 'plru', 'clock' ou 'random').
+            seed (int): A semente da política 'random'.
+            ways (int): O número de linhas por conjunto da cache (None para totalmente associativa).
+            block_size (int): O número de endereços consecutivos em cada linha da cache.
 
         """
         self.id = id
-        self.cache = Cache(cache_size)
+        self.cache = Cache(cache_size, policy, seed, ways, block_size)
         self.memory = memory
         self.cache_manager = cache_manager
         cache_manager.register_cache(self.id, self.cache)
@@ -31,7 +38,8 @@ class Processor:
 
         """
         data, transaction = self.cache_manager.handle_read(self.id, address, self.memory)
-        print(f"Processador {self.id} lê o endereço {address} com dado {data} ({transaction})\n")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Processador %s lê o endereço %s com dado %s (%s)", self.id, address, data, transaction)
         return data
 
     def write(self, address, value):
@@ -44,7 +52,8 @@ class Processor:
 
         """
         transaction = self.cache_manager.handle_write(self.id, address, value, self.memory)
-        print(f"Processador {self.id} escreve o valor {value} no endereço {address} ({transaction})\n")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Processador %s escreve o valor %s no endereço %s (%s)", self.id, value, address, transaction)
 
     def print_cache(self):
         """
@@ -0,0 +1,91 @@
+from cache import State
+
+# Eventos da tabela de transições: acessos do próprio processador e acessos de outro processador observados
+# no barramento
+READ, WRITE, SNOOP_READ, SNOOP_WRITE = 'read', 'write', 'snoop_read', 'snoop_write'
+EVENTS = (READ, WRITE, SNOOP_READ, SNOOP_WRITE)
+
+class Protocol:
+    """
+    Protocolo de coerência descrito por uma tabela de transições, usado pelo CacheManager.
+
+    A tabela dá o novo estado de uma linha válida para cada evento. Além dela, o protocolo define o estado de uma
+    linha preenchida por uma leitura quando outros caches têm cópias, os estados que respondem a leituras de
+    outros caches (quando nenhum responde, a memória responde) e os estados sujos, cujos dados precisam voltar
+    para a memória quando a linha é removida ou quando uma transição a deixa limpa. Os protocolos são de
+    invalidação: a escrita sempre deixa a linha em MODIFIED.
+    """
+    def __init__(self, name, transitions, shared_fill, suppliers, dirty):
+        """
+        Cria o protocolo.
+
+        :param name: Nome do protocolo.
+        :param transitions: Dicionário estado -> tupla com os novos estados para READ, WRITE, SNOOP_READ e
+                            SNOOP_WRITE, nessa ordem.
+        :param shared_fill: Estado de uma linha lida quando outros caches têm cópias válidas.
+        :param suppliers: Estados que fornecem os dados a outro cache numa leitura.
+        :param dirty: Estados cujos dados podem ser diferentes dos da memória.
+        :raises ValueError: Se a tabela não tiver as quatro transições de algum estado ou se alguma escrita não
+                            levar a MODIFIED.
+        """
+        self.name = name
+        self.transitions = {}
+        for state, targets in transitions.items():
+            if len(targets) != len(EVENTS):
+                raise ValueError(f"O estado {state.value} do protocolo {name} deve ter {len(EVENTS)} transições")
+            if targets[EVENTS.index(WRITE)] != State.MODIFIED:
+                raise ValueError(f"No protocolo {name}, a escrita em {state.value} deve levar a linha a MODIFIED")
+            self.transitions.update(((state, event), target) for event, target in zip(EVENTS, targets))
+        self.states = tuple(transitions) + (State.INVALID,)
+        self.shared_fill = shared_fill
+        self.suppliers = frozenset(suppliers)
+        self.dirty = frozenset(dirty)
+
+    def next_state(self, state, event):
+        """
+        Obtém o novo estado de uma linha válida.
+
+        :param state: Estado atual da linha.
+        :param event: READ, WRITE, SNOOP_READ ou SNOOP_WRITE.
+        :return: Novo estado.
+        """
+        return self.transitions[state, event]
+
+M, O, E, S, I, F = State.MODIFIED, State.OWNED, State.EXCLUSIVE, State.SHARED, State.INVALID, State.FORWARD
+
+#                      READ  WRITE  SNOOP_READ  SNOOP_WRITE
+MESI = Protocol('mesi', {
+    M:                 (M,   M,     S,          I),  # Compartilhar uma linha modificada a escreve de volta
+    E:                 (E,   M,     S,          I),
+    S:                 (S,   M,     S,          I),
+}, shared_fill=S, suppliers=(M, E, S), dirty=(M,))
+
+MOESI = Protocol('moesi', {
+    M:                 (M,   M,     O,          I),  # Compartilhar uma linha modificada a torna dona, sem escrita
+    O:                 (O,   M,     O,          I),
+    E:                 (E,   M,     S,          I),
+    S:                 (S,   M,     S,          I),
+}, shared_fill=S, suppliers=(M, O, E, S), dirty=(M, O))
+
+MESIF = Protocol('mesif', {
+    M:                 (M,   M,     S,          I),
+    E:                 (E,   M,     S,          I),
+    S:                 (S,   M,     S,          I),
+    F:                 (F,   M,     S,          I),  # O último cache a ler passa a ser o encaminhador
+}, shared_fill=F, suppliers=(M, E, F), dirty=(M,))
+
+PROTOCOLS = {protocol.name: protocol for protocol in (MESI, MOESI, MESIF)}
+
+def get_protocol(protocol):
+    """
+    Obtém um protocolo pelo nome.
+
+    :param protocol: Nome do protocolo ('mesi', 'moesi' ou 'mesif'), uma instância de Protocol ou None.
+    :return: Instância de Protocol, ou None quando protocol é None.
+    :raises ValueError: Se o protocolo não existir.
+    """
+    if protocol is None or isinstance(protocol, Protocol):
+        return protocol
+    if protocol not in PROTOCOLS:
+        raise ValueError(f"Protocolo de coerência desconhecido: {protocol}")
+    return PROTOCOLS[protocol]
@@ -0,0 +1,372 @@
+import argparse
+from collections import Counter
+import json
+import struct
+import sys
+import time
+
+from cache import State
+from simulator import Simulator
+
+MAGIC = b'MESIREC1'
+# Cabeçalho: tamanho de cada registro, número de caches e tamanho da configuração em JSON. Seguem os
+# identificadores dos processadores (na ordem de registro dos caches) e a configuração.
+HEADER = struct.Struct('<8sIII')
+# Registro: instante (ns desde o início da gravação), endereço, valor lido ou escrito, processador, operação,
+# transação, leituras e escritas na memória principal durante a operação. Seguem um byte por cache com o
+# estado anterior (4 bits altos) e o novo estado (4 bits baixos) da linha do endereço, e bytes de alinhamento
+# até um múltiplo de 8.
+RECORD = struct.Struct('<qqqHBBBBxx')
+OPERATIONS = ('read', 'write')
+OPERATION_CODES = {op: code for code, op in enumerate(OPERATIONS)}
+TRANSACTIONS = ('RH', 'RM', 'WH', 'WM')
+TRANSACTION_CODES = {transaction: code for code, transaction in enumerate(TRANSACTIONS)}
+# Código 0 indica que o cache não tem linha para o endereço; os demais são os estados de cache.State
+STATES = [None] + list(State)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+def record_size(num_caches):
+    """
+    Calcula o tamanho de um registro.
+
+    :param num_caches: Número de caches gravados.
+    :return: Tamanho em bytes, múltiplo de 8.
+    """
+    return -(-(RECORD.size + num_caches) // 8) * 8
+
+class TraceRecorder:
+    """
+    Grava num arquivo binário, em registros de tamanho fixo, cada leitura e escrita tratada por um CacheManager:
+    instante, processador, endereço, operação, valor, transação, estado anterior e novo da linha em cada cache e
+    acessos à memória principal (inclusive write-backs).
+
+    Os registros são montados num buffer em memória e escritos em blocos. Enquanto o gravador está ligado, as
+    operações em lote do CacheManager passam pelas operações individuais, para que nenhuma fique de fora.
+    """
+    def __init__(self, cache_manager, path, config=None, buffer_records=65536):
+        """
+        Cria o arquivo e liga o gravador ao gerenciador de cache.
+
+        :param cache_manager: CacheManager a ser gravado; seus caches devem estar registrados.
+        :param path: Arquivo de destino.
+        :param config: Argumentos nomeados de Simulator guardados no cabeçalho, usados por replay_recording.
+        :param buffer_records: Número de registros acumulados antes de cada escrita no arquivo.
+        """
+        self.cache_manager = cache_manager
+        self.stats = cache_manager.stats
+        self.caches = list(cache_manager.caches.values())
+        self.lookups = [cache.index.get for cache in self.caches]  # Busca direta no índice de cada cache
+        self.block_size = cache_manager.block_size
+        self.size = record_size(len(self.caches))
+        self.buffer = bytearray(self.size * buffer_records)
+        self.position = 0
+        self.count = 0
+        config = json.dumps(config or {}).encode()
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, self.size, len(self.caches), len(config)))
+        self.file.write(struct.pack(f'<{len(self.caches)}q', *cache_manager.caches))
+        self.file.write(config)
+        self.start = time.perf_counter_ns()
+        cache_manager.recorder = self
+
+    def states(self, address):
+        """
+        Obtém o código do estado da linha do endereço em cada cache.
+
+        :param address: Endereço de memória.
+        :return: Lista de códigos (veja STATES), na ordem de registro dos caches.
+        """
+        codes = STATE_CODES
+        address -= address % self.block_size
+        return [0 if line is None else codes[line.state] for line in [lookup(address) for lookup in self.lookups]]
+
+    def begin(self, address):
+        """
+        Guarda o que é preciso antes de uma operação para gravá-la depois com record.
+
+        :param address: Endereço da operação.
+        :return: Tupla (leituras na memória, escritas na memória, estados dos caches).
+        """
+        stats = self.stats
+        return stats.memory_reads, stats.memory_writes, self.states(address)
+
+    def record(self, processor_id, op, address, value, transaction, before):
+        """
+        Grava uma operação concluída.
+
+        :param processor_id: Identificador do processador.
+        :param op: 'read' ou 'write'.
+        :param address: Endereço da operação.
+        :param value: Valor lido ou escrito.
+        :param transaction: Código da transação ('RH', 'RM', 'WH' ou 'WM').
+        :param before: Valor retornado por begin antes da operação.
+        """
+        memory_reads, memory_writes, prior = before
+        stats = self.stats
+        position = self.position
+        buffer = self.buffer
+        RECORD.pack_into(buffer, position, time.perf_counter_ns() - self.start, address, value, processor_id,
+                         OPERATION_CODES[op], TRANSACTION_CODES[transaction],
+                         min(stats.memory_reads - memory_reads, 255), min(stats.memory_writes - memory_writes, 255))
+        start = position + RECORD.size
+        buffer[start:start + len(prior)] = bytes(old << 4 | new for old, new in zip(prior, self.states(address)))
+        self.position = position + self.size
+        self.count += 1
+        if self.position == len(buffer):
+            self.flush()
+
+    def flush(self):
+        """
+        Escreve no arquivo os registros acumulados.
+        """
+        self.file.write(memoryview(self.buffer)[:self.position])
+        self.position = 0
+
+    def close(self):
+        """
+        Escreve os registros pendentes, fecha o arquivo e desliga o gravador do gerenciador de cache.
+        """
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+        if self.cache_manager.recorder is self:
+            self.cache_manager.recorder = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def decode_record(block, offset, num_caches):
+    """
+    Decodifica um registro.
+
+    :param block: Bytes que contêm o registro.
+    :param offset: Posição do registro em block.
+    :param num_caches: Número de caches gravados.
+    :return: Tupla (instante, processador, operação, endereço, valor, transação, leituras na memória, escritas na
+             memória, estados), em que estados é uma tupla de pares (estado anterior, novo estado) por cache,
+             com None para cache sem linha do endereço.
+    """
+    timestamp, address, value, processor_id, op, transaction, memory_reads, memory_writes = \
+        RECORD.unpack_from(block, offset)
+    start = offset + RECORD.size
+    states = tuple((STATES[code >> 4], STATES[code & 15]) for code in block[start:start + num_caches])
+    return (timestamp, processor_id, OPERATIONS[op], address, value, TRANSACTIONS[transaction], memory_reads,
+            memory_writes, states)
+
+class Recording:
+    """
+    Leitura de um arquivo gravado por TraceRecorder, em blocos de registros, sem carregá-lo inteiro na memória.
+    """
+    def __init__(self, path):
+        """
+        Abre o arquivo e lê o cabeçalho.
+
+        :param path: Arquivo gravado por TraceRecorder.
+        :raises ValueError: Se o arquivo não for uma gravação.
+        """
+        self.file = open(path, 'rb')
+        magic, self.size, num_caches, config_length = HEADER.unpack(self.file.read(HEADER.size))
+        if magic != MAGIC:
+            self.file.close()
+            raise ValueError(f"{path} não é uma gravação de transações")
+        self.processors = list(struct.unpack(f'<{num_caches}q', self.file.read(8 * num_caches)))
+        self.config = json.loads(self.file.read(config_length))
+        self.num_caches = num_caches
+
+    def chunks(self, records=65536):
+        """
+        Lê os registros em blocos. Um registro incompleto no fim do arquivo (gravação interrompida) é ignorado.
+
+        :param records: Número de registros por bloco.
+        :return: Gerador de bytearray com um número inteiro de registros cada.
+        """
+        size = self.size
+        while True:
+            block = bytearray(self.file.read(size * records))
+            block = block[:len(block) - len(block) % size]  # Descarta um registro incompleto no fim do arquivo
+            if not block:
+                return
+            yield block
+
+    def __iter__(self):
+        size = self.size
+        num_caches = self.num_caches
+        for block in self.chunks():
+            for offset in range(0, len(block), size):
+                yield decode_record(block, offset, num_caches)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def replay_recording(path, output=None):
+    """
+    Reproduz as leituras e escritas de uma gravação num simulador novo, criado com a configuração do cabeçalho.
+
+    :param path: Arquivo gravado por TraceRecorder.
+    :param output: Se informado, arquivo onde a reprodução é gravada, para compará-la com diff_recordings.
+    :return: Tupla (simulador, número de operações reproduzidas).
+    :raises ValueError: Se os processadores da gravação não existirem no simulador.
+    """
+    with Recording(path) as recording:
+        simulator = Simulator(**recording.config)
+        manager = simulator.cache_manager
+        if list(manager.caches) != recording.processors:
+            raise ValueError(f"Processadores da gravação ({recording.processors}) diferentes dos do simulador "
+                             f"({list(manager.caches)})")
+        recorder = TraceRecorder(manager, output, recording.config) if output else None
+        memory = simulator.memory
+        count = 0
+        try:
+            for _, processor_id, op, address, value, *_ in recording:
+                if op == 'read':
+                    manager.handle_read(processor_id, address, memory)
+                else:
+                    manager.handle_write(processor_id, address, value, memory)
+                count += 1
+        finally:
+            if recorder is not None:
+                recorder.close()
+    return simulator, count
+
+def diff_recordings(path_a, path_b, records=65536):
+    """
+    Compara duas gravações em fluxo e encontra o primeiro registro diferente, ignorando os instantes.
+    Blocos iguais são comparados de uma vez, sem decodificar os registros.
+
+    :param path_a: Primeira gravação.
+    :param path_b: Segunda gravação.
+    :param records: Número de registros por bloco.
+    :return: None se as gravações forem iguais, ou tupla (índice, registro de a, registro de b), com None no
+             lugar do registro da gravação que terminou antes.
+    :raises ValueError: Se as gravações tiverem números de caches diferentes.
+    """
+    with Recording(path_a) as a, Recording(path_b) as b:
+        if a.size != b.size or a.num_caches != b.num_caches:
+            raise ValueError("As gravações têm números de caches diferentes")
+        size = a.size
+        index = 0
+        for block_a, block_b in zip_chunks(a.chunks(records), b.chunks(records)):
+            length = min(len(block_a), len(block_b))
+            count = length // size
+            for block in (block_a, block_b):
+                for byte in range(8):  # Zera os instantes, que mudam de uma execução para outra
+                    block[byte:length:size] = bytes(count)
+            if block_a[:length] == block_b[:length] and len(block_a) == len(block_b):
+                index += count
+                continue
+            for offset in range(0, length, size):
+                if block_a[offset:offset + size] != block_b[offset:offset + size]:
+                    return (index + offset // size, decode_record(block_a, offset, a.num_caches),
+                            decode_record(block_b, offset, b.num_caches))
+            index += count
+            record_a = decode_record(block_a, length, a.num_caches) if len(block_a) > length else None
+            record_b = decode_record(block_b, length, b.num_caches) if len(block_b) > length else None
+            return index, record_a, record_b
+    return None
+
+def zip_chunks(chunks_a, chunks_b):
+    """
+    Percorre dois geradores de blocos juntos, continuando com um bloco vazio quando um deles termina antes.
+
+    :return: Gerador de pares de bytearray.
+    """
+    for block_a in chunks_a:
+        yield block_a, next(chunks_b, bytearray())
+    for block_b in chunks_b:
+        yield bytearray(), block_b
+
+def hot_addresses(path, top=10, records=65536):
+    """
+    Resume uma gravação: endereços mais acessados, total de cada transação e acessos à memória principal.
+    Os campos são lidos direto dos blocos, sem decodificar cada registro.
+
+    :param path: Arquivo gravado por TraceRecorder.
+    :param top: Número de endereços listados.
+    :param records: Número de registros por bloco.
+    :return: Dicionário com 'events', 'transactions' (código -> total), 'memory_reads', 'memory_writes' e
+             'hot' (lista de tuplas (endereço, operações), da mais acessada para a menos).
+    """
+    addresses = Counter()
+    transactions = Counter()
+    memory_reads = memory_writes = events = 0
+    with Recording(path) as recording:
+        size = recording.size
+        for block in recording.chunks(records):
+            events += len(block) // size
+            addresses.update(memoryview(block).cast('q')[1::size // 8])
+            transactions.update(block[27::size])
+            memory_reads += sum(block[28::size])
+            memory_writes += sum(block[29::size])
+    return {
+        'events': events,
+        'transactions': {code: transactions[index] for index, code in enumerate(TRANSACTIONS)},
+        'memory_reads': memory_reads,
+        'memory_writes': memory_writes,
+        'hot': addresses.most_common(top),
+    }
+
+def format_record(record):
+    """
+    Formata um registro decodificado numa linha de texto.
+    """
+    _, processor_id, op, address, value, transaction, memory_reads, memory_writes, states = record
+    changes = " ".join(f"{old.value if old else '-'}>{new.value if new else '-'}" for old, new in states)
+    return (f"P{processor_id} {op} {address}={value} {transaction} memória {memory_reads}L/{memory_writes}E "
+            f"caches [{changes}]")
+
+def main(argv=None):
+    """
+    Ponto de entrada de linha de comando: reproduz, compara ou resume gravações de transações.
+
+    :return: Código de saída (1 quando diff encontra uma diferença).
+    """
+    parser = argparse.ArgumentParser(description="Ferramentas para gravações de transações de coerência.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    replay_parser = commands.add_parser("replay", help="Reproduz uma gravação num simulador novo")
+    replay_parser.add_argument("recording")
+    replay_parser.add_argument("--output", help="Grava a reprodução neste arquivo")
+    diff_parser = commands.add_parser("diff", help="Encontra o primeiro registro diferente entre duas gravações")
+    diff_parser.add_argument("first")
+    diff_parser.add_argument("second")
+    hot_parser = commands.add_parser("hot", help="Resume os endereços mais acessados")
+    hot_parser.add_argument("recording")
+    hot_parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "replay":
+        start = time.perf_counter()
+        simulator, count = replay_recording(args.recording, args.output)
+        print(f"Operações: {count} em {time.perf_counter() - start:.3f} s")
+        for code, total in simulator.cache_manager.stats.transactions.items():
+            print(f"{code}: {total}")
+    elif args.command == "diff":
+        divergence = diff_recordings(args.first, args.second)
+        if divergence is None:
+            print("Gravações iguais")
+            return 0
+        index, record_a, record_b = divergence
+        print(f"Primeira diferença no registro {index}:")
+        print(f"  {args.first}: {format_record(record_a) if record_a else 'fim da gravação'}")
+        print(f"  {args.second}: {format_record(record_b) if record_b else 'fim da gravação'}")
+        return 1
+    else:
+        summary = hot_addresses(args.recording, args.top)
+        print(f"Operações: {summary['events']}")
+        print(" ".join(f"{code}: {total}" for code, total in summary['transactions'].items()))
+        print(f"Leituras na memória: {summary['memory_reads']}  Escritas na memória: {summary['memory_writes']}")
+        for address, count in summary['hot']:
+            print(f"{address:>10}: {count}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+from collections import OrderedDict, deque
+import random
+
+class ReplacementPolicy:
+    """
+    Interface das políticas de substituição de linhas de cache. As linhas são identificadas pelo
+    seu índice (0 a size - 1). Todas as operações são O(1) ou O(log n).
+    """
+    def __init__(self, size):
+        """
+        Inicializa a política para um conjunto de linhas.
+
+        :param size: Número de linhas controladas pela política.
+        """
+        self.size = size
+
+    def insert(self, index):
+        """
+        Informa que a linha com o índice especificado recebeu um novo endereço.
+
+        :param index: Índice da linha preenchida.
+        """
+
+    def touch(self, index):
+        """
+        Informa que a linha com o índice especificado foi acessada.
+
+        :param index: Índice da linha acessada.
+        """
+
+    def victim(self):
+        """
+        Escolhe a linha a ser substituída. Só é chamado quando todas as linhas estão ocupadas.
+
+        :return: Índice da linha escolhida.
+        """
+        raise NotImplementedError
+
+    def get_state(self):
+        """
+        Exporta o estado interno da política, para snapshots.
+
+        :return: Lista de inteiros que, passada a set_state numa política do mesmo tipo e tamanho,
+                 reproduz exatamente as próximas escolhas.
+        """
+        return []
+
+    def set_state(self, values):
+        """
+        Restaura o estado exportado por get_state.
+
+        :param values: Lista de inteiros retornada por get_state.
+        """
+
+class FIFOPolicy(ReplacementPolicy):
+    """
+    Substitui a linha preenchida há mais tempo.
+    """
+    def __init__(self, size):
+        super().__init__(size)
+        self.queue = deque()
+
+    def insert(self, index):
+        self.queue.append(index)
+
+    def victim(self):
+        return self.queue.popleft()
+
+    def get_state(self):
+        return list(self.queue)
+
+    def set_state(self, values):
+        self.queue = deque(values)
+
+class LRUPolicy(ReplacementPolicy):
+    """
+    Substitui a linha acessada há mais tempo.
+    """
+    def __init__(self, size):
+        super().__init__(size)
+        self.order = OrderedDict()
+
+    def insert(self, index):
+        self.order[index] = None
+        self.order.move_to_end(index)
+
+    def touch(self, index):
+        self.order.move_to_end(index)
+
+    def victim(self):
+        return self.order.popitem(last=False)[0]
+
+    def get_state(self):
+        return list(self.order)
+
+    def set_state(self, values):
+        self.order = OrderedDict.fromkeys(values)
+
+class PLRUPolicy(ReplacementPolicy):
+    """
+    Pseudo-LRU em árvore: cada nó interno guarda um bit apontando para a subárvore menos usada recentemente.
+    Tamanhos que não são potência de dois são completados com folhas que nunca são escolhidas.
+    """
+    def __init__(self, size):
+        super().__init__(size)
+        self.leaves = 1
+        while self.leaves < size:
+            self.leaves *= 2
+        self.bits = bytearray(self.leaves)  # Nós internos em heap (índice 1 é a raiz)
+
+    def touch(self, index):
+        node = 1
+        low, high = 0, self.leaves
+        while node < self.leaves:
+            middle = (low + high) // 2
+            if index < middle:
+                self.bits[node] = 1  # Próxima vítima à direita
+                node, high = 2 * node, middle
+            else:
+                self.bits[node] = 0  # Próxima vítima à esquerda
+                node, low = 2 * node + 1, middle
+
+    insert = touch
+
+    def victim(self):
+        node = 1
+        low, high = 0, self.leaves
+        while node < self.leaves:
+            middle = (low + high) // 2
+            if self.bits[node] and middle < self.size:
+                node, low = 2 * node + 1, middle
+            else:
+                node, high = 2 * node, middle
+        return low
+
+    def get_state(self):
+        return list(self.bits)
+
+    def set_state(self, values):
+        self.bits = bytearray(values)
+
+class ClockPolicy(ReplacementPolicy):
+    """
+    Algoritmo do relógio (segunda chance): um ponteiro percorre as linhas limpando o bit de referência
+    e substitui a primeira linha que não foi referenciada desde a última passagem.
+    """
+    def __init__(self, size):
+        super().__init__(size)
+        self.referenced = bytearray(size)
+        self.hand = 0
+
+    def touch(self, index):
+        self.referenced[index] = 1
+
+    insert = touch
+
+    def victim(self):
+        referenced = self.referenced
+        hand = self.hand
+        while referenced[hand]:
+            referenced[hand] = 0
+            hand = (hand + 1) % self.size
+        self.hand = (hand + 1) % self.size
+        return hand
+
+    def get_state(self):
+        return [self.hand] + list(self.referenced)
+
+    def set_state(self, values):
+        self.hand = values[0]
+        self.referenced = bytearray(values[1:])
+
+class RandomPolicy(ReplacementPolicy):
+    """
+    Substitui uma linha aleatória, usando um gerador próprio com semente para ser reproduzível.
+    """
+    def __init__(self, size, seed=None):
+        super().__init__(size)
+        self.random = random.Random(seed)
+
+    def victim(self):
+        return self.random.randrange(self.size)
+
+    def get_state(self):
+        # Estado do Mersenne Twister: versão, 625 palavras e gauss_next (sempre None, pois só randrange é usado)
+        version, words, _ = self.random.getstate()
+        return [version] + list(words)
+
+    def set_state(self, values):
+        self.random.setstate((values[0], tuple(values[1:]), None))
+
+POLICIES = {
+    'fifo': FIFOPolicy,
+    'lru': LRUPolicy,
+    'plru': PLRUPolicy,
+    'clock': ClockPolicy,
+    'random': RandomPolicy,
+}
+
+def make_policy(name, size, seed=None):
+    """
+    Cria uma política de substituição pelo nome.
+
+    :param name: Nome da política ('fifo', 'lru', 'plru', 'clock' ou 'random').
+    :param size: Número de linhas controladas pela política.
+    :param seed: Semente do gerador aleatório (usada apenas pela política 'random').
+    :return: Instância de ReplacementPolicy.
+    :raises ValueError: Se a política não existir.
+    """
+    if name not in POLICIES:
+        raise ValueError(f"Política de substituição desconhecida: {name}")
+    if name == 'random':
+        return RandomPolicy(size, seed)
+    return POLICIES[name](size)
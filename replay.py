@@ -0,0 +1,123 @@
+import argparse
+import sys
+import time
+
+from protocol import PROTOCOLS
+from replacement import POLICIES
+from simulator import Simulator
+
+OPERATIONS = ('read', 'write', 'park', 'park_any', 'remove', 'check', 'move')
+
+def read_trace(lines):
+    """
+    Lê um trace de forma preguiçosa, um registro por linha no formato "processador operação vaga [valor]".
+    Linhas vazias e linhas iniciadas por '#' são ignoradas.
+
+    Operações suportadas: read e write (Processor.read/write no endereço da vaga), park (valor = ID do carro),
+    park_any (valor = ID do carro; a vaga é ignorada), remove, check e move (valor = vaga de destino).
+
+    :param lines: Iterável de linhas de texto (por exemplo, um arquivo aberto).
+    :return: Gerador de tuplas (processador, operação, vaga, valor).
+    :raises ValueError: Se uma linha tiver formato ou operação inválidos.
+    """
+    for number, line in enumerate(lines, 1):
+        fields = line.split()
+        if not fields or fields[0].startswith('#'):
+            continue
+        if len(fields) not in (3, 4) or fields[1] not in OPERATIONS:
+            raise ValueError(f"Linha {number} do trace inválida: {line.strip()!r}")
+        value = int(fields[3]) if len(fields) == 4 else 0
+        yield int(fields[0]), fields[1], int(fields[2]), value
+
+def replay(simulator, records):
+    """
+    Executa os registros de um trace no simulador, um de cada vez.
+
+    :param simulator: Instância de Simulator.
+    :param records: Iterável de tuplas (processador, operação, vaga, valor).
+    :return: Número de operações executadas.
+    :raises ValueError: Se um registro referenciar um processador inexistente.
+    """
+    processors = simulator.processors
+    parking_manager = simulator.parking_manager
+    count = 0
+    for processor_id, op, slot, value in records:
+        processor = processors.get(processor_id)
+        if processor is None:
+            raise ValueError(f"Processador {processor_id} não existe")
+        if op == 'read':
+            processor.read(slot)
+        elif op == 'write':
+            processor.write(slot, value)
+        elif op == 'park':
+            parking_manager.park_car_result(processor_id, value, slot)
+        elif op == 'park_any':
+            parking_manager.park_any_result(processor_id, value)
+        elif op == 'remove':
+            parking_manager.remove_car_result(processor_id, slot)
+        elif op == 'check':
+            parking_manager.check_slot_result(processor_id, slot)
+        else:
+            parking_manager.move_car_result(processor_id, slot, value)
+        count += 1
+    return count
+
+def main(argv=None):
+    """
+    Ponto de entrada de linha de comando: reproduz um trace sem interface gráfica e mostra a vazão
+    e as contagens de transações RH/RM/WH/WM ao final.
+    """
+    parser = argparse.ArgumentParser(description="Reproduz um trace de operações no simulador MESI.")
+    parser.add_argument("trace", help="Arquivo de trace ('-' para a entrada padrão)")
+    parser.add_argument("--processors", type=int, default=3)
+    parser.add_argument("--cache-size", type=int, default=5)
+    parser.add_argument("--memory-size", type=int, default=50)
+    parser.add_argument("--slots", type=int, default=10)
+    parser.add_argument("--directory", action="store_true", help="Usa o modo diretório no CacheManager")
+    parser.add_argument("--policy", default="fifo", choices=sorted(POLICIES), help="Política de substituição dos caches")
+    parser.add_argument("--seed", type=int, default=None, help="Semente da política 'random'")
+    parser.add_argument("--ways", type=int, default=None, help="Linhas por conjunto (padrão: totalmente associativo)")
+    parser.add_argument("--block-size", type=int, default=1, help="Endereços por linha de cache")
+    parser.add_argument("--write-buffer", type=int, default=0,
+                        help="Capacidade do buffer de escrita entre os caches e a memória (0 para não usar)")
+    parser.add_argument("--protocol", choices=sorted(PROTOCOLS), default=None,
+                        help="Protocolo de coerência por tabela (padrão: implementação MESI original)")
+    parser.add_argument("--record", help="Grava cada leitura e escrita neste arquivo (veja recorder.py)")
+    parser.add_argument("--stats-json", help="Arquivo onde as estatísticas de coerência serão salvas em JSON")
+    parser.add_argument("--stats-csv", help="Arquivo onde as estatísticas de coerência serão salvas em CSV")
+    args = parser.parse_args(argv)
+
+    config = {'num_processors': args.processors, 'cache_size': args.cache_size, 'memory_size': args.memory_size,
+              'num_slots': args.slots, 'directory': args.directory, 'policy': args.policy, 'seed': args.seed,
+              'ways': args.ways, 'block_size': args.block_size, 'write_buffer': args.write_buffer,
+              'protocol': args.protocol}
+    simulator = Simulator(**config)
+    recorder = None
+    if args.record:
+        from recorder import TraceRecorder
+        recorder = TraceRecorder(simulator.cache_manager, args.record, config)
+    trace = sys.stdin if args.trace == '-' else open(args.trace)
+    try:
+        start = time.perf_counter()
+        count = replay(simulator, read_trace(trace))
+        simulator.cache_manager.fence()
+        elapsed = time.perf_counter() - start
+    finally:
+        if trace is not sys.stdin:
+            trace.close()
+        if recorder is not None:
+            recorder.close()
+
+    print(f"Operações: {count}")
+    print(f"Tempo: {elapsed:.3f} s")
+    print(f"Vazão: {count / elapsed if elapsed else 0:.0f} ops/s")
+    stats = simulator.cache_manager.stats
+    for code, total in stats.transactions.items():
+        print(f"{code}: {total}")
+    if args.stats_json:
+        stats.to_json(args.stats_json)
+    if args.stats_csv:
+        stats.to_csv(args.stats_csv)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import itertools
+import multiprocessing
+import queue
+import time
+
+from cache import State
+from replay import replay
+from simulator import Simulator
+from stats import READ_HITS, READ_MISSES, WRITE_HITS, WRITE_MISSES
+from workload import WorkloadGenerator
+
+def progress(simulator, operations, elapsed):
+    """
+    Resume o andamento de uma execução.
+
+    :param simulator: Instância de Simulator em execução.
+    :param operations: Operações executadas até agora.
+    :param elapsed: Segundos desde o início da execução.
+    :return: Dicionário com operações, tempo, operações/s, taxa de acerto de cada processador e número de linhas
+             ocupadas dos caches em cada estado MESI.
+    """
+    hit_rates = {}
+    for pid, counters in simulator.cache_manager.stats.processors.items():
+        accesses = counters[READ_HITS] + counters[READ_MISSES] + counters[WRITE_HITS] + counters[WRITE_MISSES]
+        hit_rates[pid] = (counters[READ_HITS] + counters[WRITE_HITS]) / accesses if accesses else 0.0
+    states = dict.fromkeys((state.value for state in State), 0)
+    for processor in simulator.processors.values():
+        for line in processor.cache.index.values():
+            states[line.state.value] += 1
+    return {
+        'operations': operations,
+        'elapsed': elapsed,
+        'rate': operations / elapsed if elapsed else 0.0,
+        'hit_rates': hit_rates,
+        'states': states,
+        'done': False,
+    }
+
+def run_batch(config, workload, updates, stop, report_every=2000):
+    """
+    Executa uma carga de trabalho num simulador próprio, enviando o andamento por uma fila. Feita para rodar em
+    outro processo: recebe apenas dados simples e não toca na interface.
+
+    :param config: Argumentos nomeados de Simulator.
+    :param workload: Argumentos nomeados de WorkloadGenerator.
+    :param updates: Fila onde os resumos de progress são colocados; o último tem 'done' igual a True
+                    e, em caso de erro, a chave 'error'.
+    :param stop: Evento que interrompe a execução no próximo resumo.
+    :param report_every: Número de operações entre dois resumos.
+    """
+    operations = 0
+    start = time.perf_counter()
+    simulator = None
+    try:
+        simulator = Simulator(**config)
+        records = iter(WorkloadGenerator(**workload))
+        while not stop.is_set():
+            count = replay(simulator, itertools.islice(records, report_every))
+            operations += count
+            if count < report_every:
+                break
+            updates.put(progress(simulator, operations, time.perf_counter() - start))
+        summary = progress(simulator, operations, time.perf_counter() - start)
+    except Exception as error:  # O erro é repassado à interface em vez de sumir no outro processo
+        summary = progress(simulator, operations, time.perf_counter() - start) if simulator else {}
+        summary['error'] = f"{type(error).__name__}: {error}"
+    summary['done'] = True
+    updates.put(summary)
+
+class BackgroundRun:
+    """
+    Execução de uma carga de trabalho num processo separado, para que a interface continue respondendo.
+    O andamento é lido sem bloquear com poll, tipicamente a partir de root.after.
+    """
+    def __init__(self, config, workload, report_every=2000):
+        """
+        Inicia a execução.
+
+        :param config: Argumentos nomeados de Simulator.
+        :param workload: Argumentos nomeados de WorkloadGenerator (deve ser finito ou ser interrompido com stop).
+        :param report_every: Número de operações entre dois resumos.
+        """
+        # 'spawn' evita herdar o estado do Tk, que não é seguro num processo criado por fork
+        context = multiprocessing.get_context('spawn')
+        self.updates = context.Queue()
+        self.stop_event = context.Event()
+        self.process = context.Process(target=run_batch, args=(config, workload, self.updates, self.stop_event,
+                                                               report_every), daemon=True)
+        self.process.start()
+        self.finished = False
+
+    def poll(self):
+        """
+        Lê, sem bloquear, os resumos recebidos desde a última chamada.
+
+        :return: Lista de resumos (veja progress), possivelmente vazia.
+        """
+        received = []
+        alive = self.process.is_alive()  # Consultado antes de ler a fila, para não perder o resumo final
+        while True:
+            try:
+                update = self.updates.get_nowait()
+            except queue.Empty:
+                break
+            received.append(update)
+            if update['done']:
+                self.finished = True
+                self.process.join()
+        if not self.finished and not alive:
+            self.finished = True  # O processo terminou sem enviar o resumo final
+            received.append({'done': True, 'error': f"Processo terminou com código {self.process.exitcode}"})
+        return received
+
+    def stop(self):
+        """
+        Pede a interrupção da execução; o resumo final ainda chega por poll.
+        """
+        self.stop_event.set()
@@ -0,0 +1,324 @@
+import itertools
+import multiprocessing
+
+from parking import Car, ParkingLot, ParkingResult, ParkingStatus
+from simulator import Simulator
+
+def execute_ops(simulator, ops):
+    """
+    Executa, num shard, operações já validadas pelo roteador.
+
+    :param simulator: Simulator do shard.
+    :param ops: Lista de tuplas (processador, operação, vaga local, valor), como em replay.read_trace.
+    :return: Lista de tuplas (status, dado, transação), uma por operação: status é o valor de ParkingStatus
+             (None para read/write), dado é o carro envolvido ou o valor lido.
+    """
+    parking_manager = simulator.parking_manager
+    cache_manager = simulator.cache_manager
+    memory = simulator.memory
+    results = []
+    for processor_id, op, slot, value in ops:
+        if op == 'read':
+            data, transaction = cache_manager.handle_read(processor_id, slot, memory)
+            results.append((None, data, transaction))
+            continue
+        if op == 'write':
+            results.append((None, value, cache_manager.handle_write(processor_id, slot, value, memory)))
+            continue
+        if op == 'park':
+            result = parking_manager.park_car_result(processor_id, value, slot)
+        elif op == 'remove':
+            result = parking_manager.remove_car_result(processor_id, slot)
+        elif op == 'check':
+            result = parking_manager.check_slot_result(processor_id, slot)
+        else:
+            result = parking_manager.move_car_result(processor_id, slot, value)
+        results.append((result.status.value, result.car_id, result.transaction))
+    return results
+
+def shard_worker(connection, config):
+    """
+    Laço de um shard executado em outro processo: recebe listas de operações pela conexão e devolve os
+    resultados de execute_ops. A mensagem 'stats' devolve as estatísticas de coerência e None encerra o laço.
+
+    :param connection: Extremidade de um multiprocessing.Pipe.
+    :param config: Argumentos nomeados de Simulator.
+    """
+    simulator = Simulator(**config)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        if message == 'stats':
+            simulator.cache_manager.fence()
+            connection.send(simulator.cache_manager.stats.to_dict())
+        else:
+            connection.send(execute_ops(simulator, message))
+    connection.close()
+
+class LocalShard:
+    """
+    Shard executado no próprio processo do roteador.
+    """
+    def __init__(self, config):
+        """
+        :param config: Argumentos nomeados de Simulator.
+        """
+        self.simulator = Simulator(**config)
+        self.results = None
+
+    def submit(self, ops):
+        self.results = execute_ops(self.simulator, ops)
+
+    def collect(self):
+        results, self.results = self.results, None
+        return results
+
+    def stats(self):
+        self.simulator.cache_manager.fence()
+        return self.simulator.cache_manager.stats.to_dict()
+
+    def close(self):
+        pass
+
+class ProcessShard:
+    """
+    Shard executado num processo próprio. submit envia as operações sem esperar, de modo que todos os shards
+    trabalham em paralelo até que collect leia os resultados.
+    """
+    def __init__(self, config):
+        """
+        :param config: Argumentos nomeados de Simulator.
+        """
+        context = multiprocessing.get_context('spawn')
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=shard_worker, args=(child, config), daemon=True)
+        self.process.start()
+        child.close()
+
+    def submit(self, ops):
+        self.connection.send(ops)
+
+    def collect(self):
+        return self.connection.recv()
+
+    def stats(self):
+        self.connection.send('stats')
+        return self.connection.recv()
+
+    def close(self):
+        if self.process.is_alive():
+            self.connection.send(None)
+            self.process.join()
+        self.connection.close()
+
+class ShardedParkingManager:
+    """
+    Estacionamento dividido em shards, cada um com seu próprio ParkingLot, CacheManager e Memory (um domínio de
+    coerência independente), e um roteador que despacha cada operação para o shard dono da vaga.
+
+    O roteador mantém a ocupação de todas as vagas num ParkingLot global e decide por ele o resultado de cada
+    operação (carro já estacionado em outro shard, vaga ocupada, dono do carro, menor vaga livre), com a mesma
+    semântica de ParkingManager. Os shards só executam as operações válidas, que produzem o tráfego de coerência;
+    uma mudança entre shards vira uma remoção no shard de origem e um estacionamento no de destino.
+
+    As operações são despachadas em lotes: cada lote é dividido por shard e, com processes=True, os shards
+    executam suas partes em paralelo, em processos separados.
+    """
+    def __init__(self, num_shards, num_slots, partition='range', processes=False, **config):
+        """
+        Cria os shards.
+
+        :param num_shards: Número de shards.
+        :param num_slots: Número total de vagas.
+        :param partition: 'range' (cada shard com um intervalo contínuo de vagas) ou 'hash' (vaga % num_shards).
+        :param processes: Se True, cada shard executa num processo próprio.
+        :param config: Demais argumentos nomeados de Simulator para cada shard (processadores, caches, etc.).
+        :raises ValueError: Se a partição for desconhecida.
+        """
+        if partition not in ('range', 'hash'):
+            raise ValueError(f"Partição desconhecida: {partition!r}")
+        self.num_shards = num_shards
+        self.partition = partition
+        self.parking_lot = ParkingLot(num_slots)
+        self.shard_slots = -(-num_slots // num_shards)  # Vagas por shard, arredondado para cima
+        block_size = config.get('block_size', 1)
+        memory_size = -(-self.shard_slots // block_size) * block_size
+        config = dict(config, num_slots=self.shard_slots, memory_size=memory_size)
+        shard_class = ProcessShard if processes else LocalShard
+        self.shards = [shard_class(config) for _ in range(num_shards)]
+
+    def locate(self, slot_id):
+        """
+        Determina o shard dono de uma vaga.
+
+        :param slot_id: Identificador global da vaga.
+        :return: Tupla (índice do shard, vaga local no shard).
+        """
+        if self.partition == 'range':
+            return divmod(slot_id, self.shard_slots)
+        return slot_id % self.num_shards, slot_id // self.num_shards
+
+    def route(self, record, pending):
+        """
+        Decide o resultado de uma operação pela ocupação global e acrescenta aos lotes dos shards as operações
+        que eles devem executar.
+
+        :param record: Tupla (processador, operação, vaga, valor), como em replay.read_trace.
+        :param pending: Lista, por shard, das operações do lote atual.
+        :return: Tupla (resultado, lista de (shard, posição no lote) cujo resultado completa o da operação).
+                 O resultado é None para read/write.
+        """
+        processor_id, op, slot_id, value = record
+        lot = self.parking_lot
+
+        if op in ('read', 'write', 'check'):
+            shard, local = self.locate(slot_id)
+            pending[shard].append((processor_id, op, local, value))
+            result = ParkingResult(ParkingStatus.CHECKED, processor_id, slot_id) if op == 'check' else None
+            return result, [(shard, len(pending[shard]) - 1)]
+
+        if op in ('park', 'park_any'):
+            if lot.is_car_parked(value):
+                return ParkingResult(ParkingStatus.CAR_ALREADY_PARKED, processor_id,
+                                     slot_id if op == 'park' else None, value), []
+            if op == 'park_any':
+                slot_id = lot.lowest_free_slot()
+                if slot_id is None:
+                    return ParkingResult(ParkingStatus.LOT_FULL, processor_id, None, value), []
+            elif lot.slots[slot_id].occupied_by is not None:
+                return ParkingResult(ParkingStatus.SLOT_OCCUPIED, processor_id, slot_id,
+                                     lot.slots[slot_id].occupied_by.id), []
+            car = Car(value)
+            car.processor_id = processor_id
+            lot.occupy(slot_id, car)
+            shard, local = self.locate(slot_id)
+            pending[shard].append((processor_id, 'park', local, value))
+            return ParkingResult(ParkingStatus.PARKED, processor_id, slot_id, value), [(shard, len(pending[shard]) - 1)]
+
+        car = lot.slots[slot_id].occupied_by
+        if op == 'remove':
+            if car is None:
+                return ParkingResult(ParkingStatus.SLOT_FREE, processor_id, slot_id), []
+            if car.processor_id != processor_id:
+                return ParkingResult(ParkingStatus.NOT_OWNER, processor_id, slot_id, car.id,
+                                     owner_id=car.processor_id), []
+            lot.release(slot_id)
+            shard, local = self.locate(slot_id)
+            pending[shard].append((processor_id, 'remove', local, 0))
+            return ParkingResult(ParkingStatus.REMOVED, processor_id, slot_id, car.id), [(shard, len(pending[shard]) - 1)]
+
+        to_slot_id = value
+        if car is None:
+            return ParkingResult(ParkingStatus.SLOT_FREE, processor_id, slot_id, to_slot_id=to_slot_id), []
+        if lot.slots[to_slot_id].occupied_by is not None:
+            return ParkingResult(ParkingStatus.SLOT_OCCUPIED, processor_id, slot_id, car.id, to_slot_id=to_slot_id), []
+        if car.processor_id != processor_id:
+            return ParkingResult(ParkingStatus.NOT_OWNER, processor_id, slot_id, car.id, owner_id=car.processor_id), []
+        lot.release(slot_id)
+        lot.occupy(to_slot_id, car)
+        from_shard, from_local = self.locate(slot_id)
+        to_shard, to_local = self.locate(to_slot_id)
+        if from_shard == to_shard:
+            pending[from_shard].append((processor_id, 'move', from_local, to_local))
+            parts = [(from_shard, len(pending[from_shard]) - 1)]
+        else:
+            # Mudança entre shards: remove do shard de origem e estaciona no de destino
+            pending[from_shard].append((processor_id, 'remove', from_local, 0))
+            pending[to_shard].append((processor_id, 'park', to_local, car.id))
+            parts = [(from_shard, len(pending[from_shard]) - 1), (to_shard, len(pending[to_shard]) - 1)]
+        return ParkingResult(ParkingStatus.MOVED, processor_id, slot_id, car.id, to_slot_id=to_slot_id), parts
+
+    def run(self, records, batch_size=10000):
+        """
+        Executa operações em lotes, na ordem, e gera seus resultados.
+
+        :param records: Iterável de tuplas (processador, operação, vaga, valor), como em replay.read_trace.
+        :param batch_size: Número de operações por lote.
+        :return: Gerador de ParkingResult (None para read/write), na ordem das operações. Nas verificações, car_id
+                 é o dado lido pelo shard; nas demais (exceto mudanças), transaction é a transação do shard.
+        :raises RuntimeError: Se um shard chegar a um resultado diferente do decidido pelo roteador.
+        """
+        records = iter(records)
+        while True:
+            batch = list(itertools.islice(records, batch_size))
+            if not batch:
+                return
+            pending = [[] for _ in self.shards]
+            routed = [self.route(record, pending) for record in batch]
+            for shard, ops in zip(self.shards, pending):
+                shard.submit(ops)
+            outcomes = [shard.collect() for shard in self.shards]
+            for result, parts in routed:
+                for shard, position in parts:
+                    status, data, transaction = outcomes[shard][position]
+                    if result is None:
+                        continue
+                    if result.status == ParkingStatus.MOVED:
+                        continue  # Entre shards, a mudança é uma remoção e um estacionamento; não há transação
+                    if status != result.status.value:
+                        raise RuntimeError(f"Shard {shard} divergiu do roteador: {status} em vez de "
+                                           f"{result.status.value}")
+                    if result.status == ParkingStatus.CHECKED:
+                        result.car_id = data
+                    result.transaction = transaction
+                yield result
+
+    def execute(self, processor_id, op, slot_id, value=0):
+        """
+        Executa uma única operação.
+
+        :return: ParkingResult da operação (None para read/write).
+        """
+        return next(self.run([(processor_id, op, slot_id, value)]))
+
+    def park_car_result(self, processor_id, car_id, slot_id):
+        return self.execute(processor_id, 'park', slot_id, car_id)
+
+    def park_any_result(self, processor_id, car_id):
+        return self.execute(processor_id, 'park_any', 0, car_id)
+
+    def remove_car_result(self, processor_id, slot_id):
+        return self.execute(processor_id, 'remove', slot_id)
+
+    def check_slot_result(self, processor_id, slot_id):
+        return self.execute(processor_id, 'check', slot_id)
+
+    def move_car_result(self, processor_id, from_slot_id, to_slot_id):
+        return self.execute(processor_id, 'move', from_slot_id, to_slot_id)
+
+    def park_car(self, processor_id, car_id, slot_id):
+        return self.park_car_result(processor_id, car_id, slot_id).message
+
+    def park_any(self, processor_id, car_id):
+        return self.park_any_result(processor_id, car_id).message
+
+    def remove_car(self, processor_id, slot_id):
+        return self.remove_car_result(processor_id, slot_id).message
+
+    def check_slot(self, processor_id, slot_id):
+        return self.check_slot_result(processor_id, slot_id).message
+
+    def move_car(self, processor_id, from_slot_id, to_slot_id):
+        return self.move_car_result(processor_id, from_slot_id, to_slot_id).message
+
+    def stats(self):
+        """
+        Obtém as estatísticas de coerência de cada shard, após esvaziar seus buffers de escrita.
+
+        :return: Lista de dicionários de CoherenceStats.to_dict, um por shard.
+        """
+        return [shard.stats() for shard in self.shards]
+
+    def close(self):
+        """
+        Encerra os shards (e seus processos, quando houver).
+        """
+        for shard in self.shards:
+            shard.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
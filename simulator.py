@@ -0,0 +1,44 @@
+from memory import Memory
+from cacheManager import CacheManager
+from processor import Processor
+from parking import ParkingLot, ParkingManager
+
+class Simulator:
+    """
+    Agrupa os componentes de uma simulação completa: memória principal, gerenciador de cache,
+    processadores e estacionamento. A configuração padrão é a mesma usada pela interface gráfica.
+    """
+    def __init__(self, num_processors=3, cache_size=5, memory_size=50, num_slots=10, directory=False,
+                 policy='fifo', seed=None, ways=None, block_size=1, write_buffer=0, memory=None, protocol=None):
+        """
+        Cria a memória, o gerenciador de cache, os processadores (identificados de 1 a num_processors)
+        e o estacionamento.
+
+        :param num_processors: Número de processadores.
+        :param cache_size: Número de linhas do cache de cada processador.
+        :param memory_size: Tamanho da memória principal.
+        :param num_slots: Número de vagas do estacionamento.
+        :param directory: Se True, o gerenciador de cache usa o modo diretório.
+        :param policy: Política de substituição dos caches ('fifo', 'lru', 'plru', 'clock' ou 'random').
+        :param seed: Semente da política 'random'; cada processador usa seed + id.
+        :param ways: Número de linhas por conjunto dos caches (None para totalmente associativos).
+        :param block_size: Número de endereços consecutivos em cada linha dos caches.
+        :param write_buffer: Capacidade do buffer de escrita do gerenciador de cache (0 para não usar).
+        :param memory: Memória principal já existente (por exemplo, restaurada de um snapshot). Se informada,
+                       memory_size é ignorado e uma nova memória não é criada.
+        :param protocol: Protocolo de coerência do gerenciador de cache ('mesi', 'moesi', 'mesif' ou None para a
+                         implementação MESI original).
+        :raises ValueError: Se o tamanho da memória não for múltiplo do tamanho de bloco.
+        """
+        if memory is not None:
+            memory_size = memory.size
+        if memory_size % block_size:
+            raise ValueError(f"O tamanho da memória ({memory_size}) deve ser múltiplo do tamanho de bloco ({block_size})")
+        self.memory = Memory(memory_size) if memory is None else memory
+        self.cache_manager = CacheManager(self.memory, directory=directory, write_buffer=write_buffer,
+                                          protocol=protocol)
+        self.parking_lot = ParkingLot(num_slots)
+        self.parking_manager = ParkingManager(self.parking_lot, self.cache_manager)
+        self.processors = {pid: Processor(pid, cache_size, self.memory, self.cache_manager, policy,
+                                          None if seed is None else seed + pid, ways, block_size)
+                           for pid in range(1, num_processors + 1)}
@@ -0,0 +1,225 @@
+from array import array
+import mmap
+import struct
+
+from cache import State
+from memory import Memory
+from parking import Car
+from simulator import Simulator
+from stats import ADDRESS_COUNTERS, COUNTERS
+
+MAGIC = b'MESISNP2'
+# Configuração: processadores, linhas, linhas por conjunto, tamanho de bloco, memória, vagas, diretório,
+# buffer de escrita, estatísticas por endereço, latência, nome da política e nome do protocolo (vazio para o
+# MESI original)
+HEADER = struct.Struct('<8s10q16s8s')
+STATES = list(State)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+def encode_simulator(simulator):
+    """
+    Converte o estado dos caches, das estatísticas, do buffer de escrita e do estacionamento numa sequência de
+    inteiros. A memória principal não faz parte da sequência.
+
+    :param simulator: Instância de Simulator.
+    :return: array('q') com o estado.
+    """
+    values = array('q')
+    processors = simulator.processors
+    values.extend(processors)
+    for processor in processors.values():
+        cache = processor.cache
+        padding = [0] * cache.block_size
+        for line in cache.lines:
+            if line.address is None:
+                values.extend((-1, STATE_CODES[line.state]))
+                values.extend(padding)
+                continue
+            values.extend((line.address, STATE_CODES[line.state]))
+            if cache.block_size == 1:
+                values.append(line.data)
+            else:
+                values.extend(line.data)
+        for free_lines in cache.free_lines:
+            values.append(len(free_lines))
+            values.extend(free_lines)
+        for policy in cache.policies:
+            state = policy.get_state()
+            values.append(len(state))
+            values.extend(state)
+
+    manager = simulator.cache_manager
+    stats = manager.stats
+    values.extend(stats.transactions.values())
+    values.extend((stats.memory_reads, stats.memory_writes, len(stats.processors)))
+    for pid, counters in stats.processors.items():
+        values.append(pid)
+        values.extend(counters)
+    values.append(len(stats.addresses))
+    for address, counters in stats.addresses.items():
+        values.append(address)
+        values.extend(counters)
+    for histogram in stats.histograms.values():
+        values.extend(histogram)
+
+    buffer = manager.write_buffer
+    if buffer is not None:
+        values.extend((buffer.writes, buffer.coalesced, buffer.drains, buffer.read_hits, len(buffer.entries)))
+        for address, value in buffer.entries.items():
+            values.extend((address, value))
+
+    for slot in simulator.parking_lot.slots:
+        car = slot.occupied_by
+        if car is None:
+            values.extend((0, 0, -1))
+        else:
+            values.extend((1, car.id, -1 if car.processor_id is None else car.processor_id))
+    return values
+
+def decode_simulator(simulator, values):
+    """
+    Restaura, num simulador recém-criado com a mesma configuração, o estado produzido por encode_simulator.
+
+    :param simulator: Instância de Simulator com caches e estacionamento vazios.
+    :param values: Sequência de inteiros produzida por encode_simulator.
+    :raises ValueError: Se os processadores do snapshot não corresponderem aos do simulador.
+    """
+    values = values.tolist() if isinstance(values, array) else list(values)
+    position = 0
+
+    def take(count):
+        nonlocal position
+        position += count
+        return values[position - count:position]
+
+    processors = simulator.processors
+    if take(len(processors)) != list(processors):
+        raise ValueError("Os processadores do snapshot não correspondem aos do simulador")
+    for processor in processors.values():
+        cache = processor.cache
+        block_size = cache.block_size
+        record = 2 + block_size  # Endereço, estado e palavras de cada linha
+        lines = take(cache.size * record)
+        index = cache.index
+        for base, line in zip(range(0, len(lines), record), cache.lines):
+            address = lines[base]
+            if address < 0:
+                continue  # Linhas do simulador recém-criado já estão vazias
+            line.address = address
+            line.state = STATES[lines[base + 1]]
+            line.data = lines[base + 2] if block_size == 1 else lines[base + 2:base + record]
+            index[address] = line
+        cache.free_lines = [take(take(1)[0]) for _ in range(cache.num_sets)]
+        for policy in cache.policies:
+            policy.set_state(take(take(1)[0]))
+
+    manager = simulator.cache_manager
+    if manager.directory is not None:
+        for pid, cache in manager.caches.items():
+            bit = manager.processor_bits[pid]
+            for address in cache.index:
+                manager.directory[address] = manager.directory.get(address, 0) | bit
+
+    stats = manager.stats
+    stats.transactions = dict(zip(stats.transactions, take(len(stats.transactions))))
+    stats.memory_reads, stats.memory_writes, count = take(3)
+    stats.processors = {}
+    for _ in range(count):
+        pid = take(1)[0]
+        stats.processors[pid] = take(len(COUNTERS))
+    stats.addresses = {}
+    for _ in range(take(1)[0]):
+        address = take(1)[0]
+        stats.addresses[address] = take(len(ADDRESS_COUNTERS))
+    for operation, histogram in stats.histograms.items():
+        stats.histograms[operation] = take(len(histogram))
+
+    buffer = manager.write_buffer
+    if buffer is not None:
+        buffer.writes, buffer.coalesced, buffer.drains, buffer.read_hits, count = take(5)
+        for _ in range(count):
+            address, value = take(2)
+            buffer.entries[address] = value
+
+    lot = simulator.parking_lot
+    for slot in lot.slots:
+        occupied, car_id, processor_id = take(3)
+        if occupied:
+            car = Car(car_id)
+            car.processor_id = None if processor_id < 0 else processor_id
+            lot.occupy(slot.id, car)
+
+def save_snapshot(simulator, path):
+    """
+    Salva o estado completo de um simulador num arquivo binário: cabeçalho com a configuração, estado dos caches
+    (linhas, estados, políticas de substituição e linhas livres), registros do gerenciador, estatísticas,
+    buffer de escrita, ocupação do estacionamento e, alinhada a uma página, a imagem da memória principal.
+
+    Escritas pendentes no buffer de escrita são salvas como pendentes, sem serem levadas à memória.
+
+    :param simulator: Instância de Simulator.
+    :param path: Arquivo de destino.
+    """
+    processors = list(simulator.processors.values())
+    cache = processors[0].cache
+    manager = simulator.cache_manager
+    memory = simulator.memory
+    header = HEADER.pack(MAGIC, len(processors), cache.size, cache.ways, cache.block_size, memory.size,
+                         len(simulator.parking_lot.slots), manager.directory is not None,
+                         0 if manager.write_buffer is None else manager.write_buffer.capacity,
+                         manager.stats.per_address, manager.stats.latency, cache.policy.encode(),
+                         b'' if manager.protocol is None else manager.protocol.name.encode())
+    values = encode_simulator(simulator)
+    with open(path, 'wb') as file:
+        file.write(header)
+        file.write(struct.pack('<q', len(values)))
+        file.write(values)
+        file.write(bytes(-file.tell() % mmap.ALLOCATIONGRANULARITY))
+        file.write(memoryview(memory.data).cast('B'))
+
+def load_snapshot(path, copy_on_write=False):
+    """
+    Restaura um simulador salvo por save_snapshot. O simulador restaurado é idêntico ao original, de modo que
+    reproduzir as mesmas operações nos dois produz exatamente os mesmos resultados.
+
+    :param path: Arquivo do snapshot.
+    :param copy_on_write: Se True, a memória principal é mapeada do próprio arquivo em modo cópia na escrita, em
+                          vez de copiada: cada simulador restaurado assim é uma bifurcação independente que só
+                          ocupa memória para as páginas que alterar, e o arquivo nunca é modificado.
+    :return: Instância de Simulator.
+    :raises ValueError: Se o arquivo não for um snapshot.
+    """
+    with open(path, 'rb') as file:
+        (magic, num_processors, cache_size, ways, block_size, memory_size, num_slots, directory, write_buffer,
+         per_address, latency, policy, protocol) = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} não é um snapshot do simulador")
+        count = struct.unpack('<q', file.read(8))[0]
+        values = array('q')
+        values.frombytes(file.read(count * values.itemsize))
+        offset = file.tell() + -file.tell() % mmap.ALLOCATIONGRANULARITY
+        if copy_on_write:
+            memory = Memory(memory_size, path, offset, copy_on_write=True)
+        else:
+            memory = Memory(memory_size)
+            file.seek(offset)
+            file.readinto(memoryview(memory.data).cast('B'))
+
+    simulator = Simulator(num_processors, cache_size, memory_size, num_slots, bool(directory),
+                          policy.rstrip(b'\0').decode(), None, ways, block_size, write_buffer, memory,
+                          protocol.rstrip(b'\0').decode() or None)
+    simulator.cache_manager.stats.per_address = bool(per_address)
+    simulator.cache_manager.stats.latency = bool(latency)
+    decode_simulator(simulator, values)
+    return simulator
+
+def fork(path, count=1):
+    """
+    Cria bifurcações independentes a partir de um snapshot, para explorar alternativas ("e se") sem repetir
+    a execução até o ponto salvo. As memórias principais compartilham as páginas do arquivo até serem escritas.
+
+    :param path: Arquivo do snapshot.
+    :param count: Número de bifurcações.
+    :return: Lista de instâncias de Simulator.
+    """
+    return [load_snapshot(path, copy_on_write=True) for _ in range(count)]
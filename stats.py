@@ -0,0 +1,145 @@
+# Contadores mantidos para cada processador, na ordem em que são guardados
+COUNTERS = (
+    'read_hits',           # Leituras atendidas pelo próprio cache
+    'read_misses',         # Leituras que precisaram de outro cache ou da memória
+    'write_hits',          # Escritas em linha válida do próprio cache
+    'write_misses',        # Escritas que precisaram preencher uma linha
+    'invalidations_sent',  # Linhas válidas de outros caches invalidadas por este processador
+    'write_backs',         # Linhas escritas de volta na memória (remoções e descargas de blocos modificados)
+    'downgrades',          # Linhas deste cache rebaixadas de EXCLUSIVE para SHARED
+    'evictions',           # Linhas removidas deste cache para dar lugar a outra
+    'bus_transactions',    # Transações no barramento iniciadas por este processador
+)
+READ_HITS, READ_MISSES, WRITE_HITS, WRITE_MISSES, INVALIDATIONS_SENT, WRITE_BACKS, DOWNGRADES, EVICTIONS, \
+    BUS_TRANSACTIONS = range(len(COUNTERS))
+
+# Contadores mantidos para cada endereço
+ADDRESS_COUNTERS = ('reads', 'writes', 'invalidations')
+ADDRESS_READS, ADDRESS_WRITES, ADDRESS_INVALIDATIONS = range(len(ADDRESS_COUNTERS))
+
+class CoherenceStats:
+    """
+    Estatísticas de coerência coletadas pelo CacheManager: contadores por processador e por endereço,
+    contagem das transações RH/RM/WH/WM, acessos à memória e histograma de latência por tipo de operação.
+    """
+    def __init__(self, per_address=True, latency=False):
+        """
+        Inicializa as estatísticas zeradas.
+
+        :param per_address: Se True, mantém contadores por endereço.
+        :param latency: Se True, mede a latência de cada leitura e escrita (tem custo por operação).
+        """
+        self.per_address = per_address
+        self.latency = latency
+        self.reset()
+
+    def reset(self):
+        """
+        Zera todos os contadores e histogramas, para reutilizar as estatísticas entre execuções.
+        """
+        self.transactions = {'RH': 0, 'RM': 0, 'WH': 0, 'WM': 0}
+        self.memory_reads = 0
+        self.memory_writes = 0
+        self.processors = {}
+        self.addresses = {}
+        # Histograma logarítmico: a posição i conta operações que levaram de 2**(i-1) a 2**i - 1 nanossegundos
+        self.histograms = {'read': [0] * 64, 'write': [0] * 64}
+
+    def processor(self, processor_id):
+        """
+        Obtém a lista de contadores de um processador, criando-a se necessário.
+
+        :param processor_id: Identificador do processador.
+        :return: Lista de contadores, indexada pelas constantes deste módulo (READ_HITS, ...).
+        """
+        counters = self.processors.get(processor_id)
+        if counters is None:
+            counters = self.processors.setdefault(processor_id, [0] * len(COUNTERS))
+        return counters
+
+    def address(self, address):
+        """
+        Obtém a lista de contadores de um endereço, criando-a se necessário.
+
+        :param address: Endereço de memória.
+        :return: Lista de contadores, indexada por ADDRESS_READS, ADDRESS_WRITES e ADDRESS_INVALIDATIONS.
+        """
+        counters = self.addresses.get(address)
+        if counters is None:
+            counters = self.addresses.setdefault(address, [0] * len(ADDRESS_COUNTERS))
+        return counters
+
+    def record_latency(self, operation, nanoseconds):
+        """
+        Registra a latência de uma operação no histograma correspondente.
+
+        :param operation: 'read' ou 'write'.
+        :param nanoseconds: Duração da operação em nanossegundos.
+        """
+        self.histograms[operation][min(nanoseconds.bit_length(), 63)] += 1
+
+    def to_dict(self):
+        """
+        Converte as estatísticas num dicionário serializável.
+
+        :return: Dicionário com transações, acessos à memória, contadores por processador e por endereço
+                 e histogramas (limite superior do intervalo em ns -> contagem).
+        """
+        return {
+            'transactions': dict(self.transactions),
+            'memory_reads': self.memory_reads,
+            'memory_writes': self.memory_writes,
+            'processors': {str(pid): dict(zip(COUNTERS, counters)) for pid, counters in self.processors.items()},
+            'addresses': {str(address): dict(zip(ADDRESS_COUNTERS, counters))
+                          for address, counters in sorted(self.addresses.items())},
+            'latency_ns': {operation: {str(2 ** i - 1): count for i, count in enumerate(histogram) if count}
+                           for operation, histogram in self.histograms.items()},
+        }
+
+    def to_json(self, path=None):
+        """
+        Exporta as estatísticas em JSON.
+
+        :param path: Arquivo de destino. Se None, o JSON é retornado como string.
+        :return: String JSON, quando path é None.
+        """
+        import json  # Importado só aqui para não pesar na inicialização do simulador
+
+        if path is None:
+            return json.dumps(self.to_dict(), indent=2)
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def rows(self):
+        """
+        Gera as estatísticas como linhas (escopo, identificador, contador, valor).
+
+        :return: Gerador de tuplas.
+        """
+        for code, total in self.transactions.items():
+            yield 'transaction', '', code, total
+        yield 'memory', '', 'reads', self.memory_reads
+        yield 'memory', '', 'writes', self.memory_writes
+        for pid, counters in self.processors.items():
+            for name, value in zip(COUNTERS, counters):
+                yield 'processor', pid, name, value
+        for address, counters in sorted(self.addresses.items()):
+            for name, value in zip(ADDRESS_COUNTERS, counters):
+                yield 'address', address, name, value
+        for operation, histogram in self.histograms.items():
+            for i, count in enumerate(histogram):
+                if count:
+                    yield 'latency_ns', operation, 2 ** i - 1, count
+
+    def to_csv(self, path):
+        """
+        Exporta as estatísticas em CSV, com as colunas scope, id, counter e value.
+
+        :param path: Arquivo de destino.
+        """
+        import csv  # Importado só aqui para não pesar na inicialização do simulador
+
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(('scope', 'id', 'counter', 'value'))
+            writer.writerows(self.rows())
@@ -0,0 +1,282 @@
+import argparse
+import csv
+import itertools
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from protocol import PROTOCOLS
+from replacement import POLICIES
+from replay import replay
+from simulator import Simulator
+from stats import COUNTERS, EVICTIONS, INVALIDATIONS_SENT, WRITE_BACKS
+
+logger = logging.getLogger(__name__)
+
+# Campos de uma configuração, na ordem em que aparecem na tabela de resultados
+CONFIG_FIELDS = ('processors', 'cache_size', 'memory_size', 'slots', 'directory', 'policy', 'ways', 'block_size',
+                 'protocol', 'workload', 'operations', 'seed')
+
+DEFAULT_CONFIG = {
+    'processors': 3,
+    'cache_size': 5,
+    'memory_size': 50,
+    'slots': 10,
+    'directory': False,
+    'policy': 'fifo',
+    'ways': None,
+    'block_size': 1,
+    'protocol': None,
+    'workload': 'balanced',
+    'operations': 10000,
+    'seed': 0,
+}
+
+# Pesos relativos de cada operação do trace em cada mistura de carga de trabalho
+WORKLOADS = {
+    'balanced': {'read': 1, 'write': 1, 'park': 2, 'remove': 2, 'check': 2, 'move': 1},
+    'read_heavy': {'read': 4, 'check': 4, 'park': 1, 'remove': 1},
+    'write_heavy': {'write': 4, 'park': 3, 'remove': 3, 'move': 2, 'check': 1},
+    'churn': {'park': 3, 'park_any': 2, 'remove': 4, 'move': 1},
+}
+
+# Colunas de resultado de cada execução, após as colunas de configuração
+RESULT_FIELDS = ('RH', 'RM', 'WH', 'WM', 'memory_reads', 'memory_writes', 'invalidations', 'write_backs',
+                 'evictions', 'hit_rate', 'elapsed')
+
+def config_error(config):
+    """
+    Verifica se uma configuração pode ser executada pelo simulador.
+
+    :param config: Dicionário de configuração.
+    :return: Mensagem com o motivo de a configuração ser inválida, ou None se ela for válida.
+    """
+    ways = config['ways']
+    if config['processors'] < 1 or config['cache_size'] < 1:
+        return "é preciso ao menos um processador e uma linha de cache"
+    if ways is not None and (ways < 1 or config['cache_size'] % ways):
+        return f"o tamanho do cache ({config['cache_size']}) deve ser múltiplo da associatividade ({ways})"
+    if config['block_size'] < 1 or config['memory_size'] % config['block_size']:
+        return (f"o tamanho da memória ({config['memory_size']}) deve ser múltiplo do tamanho de bloco "
+                f"({config['block_size']})")
+    if not 1 <= config['slots'] <= config['memory_size']:
+        return f"as vagas ({config['slots']}) devem caber na memória ({config['memory_size']})"
+    return None
+
+def expand_grid(grid):
+    """
+    Gera todas as combinações de uma grade de configurações, completando os campos ausentes com DEFAULT_CONFIG.
+    Combinações inválidas (veja config_error) são puladas com um aviso no log.
+
+    :param grid: Dicionário campo -> lista de valores.
+    :return: Gerador de dicionários de configuração, em ordem determinística.
+    :raises ValueError: Se a grade tiver um campo desconhecido.
+    """
+    unknown = set(grid) - set(CONFIG_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos desconhecidos na grade: {', '.join(sorted(unknown))}")
+    fields = [field for field in CONFIG_FIELDS if field in grid]
+    for values in itertools.product(*(grid[field] for field in fields)):
+        config = dict(DEFAULT_CONFIG)
+        config.update(zip(fields, values))
+        error = config_error(config)
+        if error is not None:
+            logger.warning("Configuração ignorada (%s): %s", error, config)
+            continue
+        yield config
+
+def config_key(config):
+    """
+    Calcula a chave que identifica uma configuração na tabela de resultados.
+
+    :param config: Dicionário de configuração (valores originais ou lidos do CSV). Campos ausentes, como em
+                   tabelas gravadas antes de o campo existir, valem como None.
+    :return: Tupla de strings, uma por campo de CONFIG_FIELDS.
+    """
+    return tuple('' if config.get(field) is None else str(config[field]) for field in CONFIG_FIELDS)
+
+def generate_operations(config, rng):
+    """
+    Gera as operações de uma execução a partir da mistura de carga de trabalho da configuração.
+
+    :param config: Dicionário de configuração.
+    :param rng: Instância de random.Random usada em todas as escolhas.
+    :return: Gerador de tuplas (processador, operação, vaga, valor), no formato de replay.read_trace.
+    """
+    weights = WORKLOADS[config['workload']]
+    operations = list(weights)
+    cumulative = list(itertools.accumulate(weights.values()))
+    processors = config['processors']
+    slots = config['slots']
+    next_car = 1
+    for _ in range(config['operations']):
+        op = rng.choices(operations, cum_weights=cumulative)[0]
+        processor_id = rng.randint(1, processors)
+        slot = rng.randrange(slots)
+        value = 0
+        if op in ('park', 'park_any'):
+            value = next_car
+            next_car += 1
+        elif op == 'write':
+            value = rng.randrange(1, 1000)
+        elif op == 'move':
+            value = rng.randrange(slots)
+        yield processor_id, op, slot, value
+
+def run_config(config):
+    """
+    Executa uma configuração do início ao fim. A execução depende apenas da configuração (inclusive da semente),
+    de modo que repeti-la produz as mesmas estatísticas.
+
+    :param config: Dicionário de configuração.
+    :return: Dicionário com os campos de CONFIG_FIELDS e RESULT_FIELDS.
+    """
+    seed = config['seed']
+    simulator = Simulator(config['processors'], config['cache_size'], config['memory_size'], config['slots'],
+                          config['directory'], config['policy'], seed, config['ways'], config['block_size'],
+                          protocol=config['protocol'])
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    replay(simulator, generate_operations(config, rng))
+    elapsed = time.perf_counter() - start
+
+    stats = simulator.cache_manager.stats
+    row = {field: config[field] for field in CONFIG_FIELDS}
+    row.update(stats.transactions)
+    row['memory_reads'] = stats.memory_reads
+    row['memory_writes'] = stats.memory_writes
+    totals = [sum(column) for column in zip(*stats.processors.values())] or [0] * len(COUNTERS)
+    row['invalidations'] = totals[INVALIDATIONS_SENT]
+    row['write_backs'] = totals[WRITE_BACKS]
+    row['evictions'] = totals[EVICTIONS]
+    accesses = sum(stats.transactions.values())
+    hits = stats.transactions['RH'] + stats.transactions['WH']
+    row['hit_rate'] = round(hits / accesses, 6) if accesses else 0.0
+    row['elapsed'] = round(elapsed, 6)
+    return row
+
+def completed_keys(path):
+    """
+    Lê as configurações já executadas de uma tabela de resultados existente.
+
+    :param path: Arquivo CSV de resultados.
+    :return: Conjunto de chaves (config_key) das linhas presentes no arquivo.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline='') as file:
+        return {config_key(row) for row in csv.DictReader(file)}
+
+def upgrade_results(path):
+    """
+    Regrava uma tabela de resultados cujo cabeçalho difere de CONFIG_FIELDS + RESULT_FIELDS, como as gravadas
+    antes de um campo de configuração existir, para que as novas linhas sejam acrescentadas sob as colunas
+    certas. Os campos ausentes ficam vazios, o que config_key lê como None.
+
+    :param path: Arquivo CSV de resultados.
+    :return: True se o arquivo foi regravado.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return False
+    fieldnames = CONFIG_FIELDS + RESULT_FIELDS
+    with open(path, newline='') as file:
+        reader = csv.DictReader(file)
+        if tuple(reader.fieldnames or ()) == fieldnames:
+            return False
+        rows = list(reader)
+    temporary = path + '.tmp'
+    with open(temporary, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(temporary, path)  # A tabela antiga só é substituída depois de a nova estar completa
+    return True
+
+def sweep(grid, path, workers=None):
+    """
+    Executa todas as configurações de uma grade em paralelo num ProcessPoolExecutor e grava cada resultado
+    numa tabela CSV assim que ele fica pronto. Configurações que já estão na tabela são puladas, de modo que
+    uma varredura interrompida pode ser retomada chamando a função novamente com os mesmos argumentos. Uma
+    tabela com colunas de uma versão anterior é antes regravada no formato atual (veja upgrade_results). Uma
+    execução que falha é registrada no log e não interrompe as demais.
+
+    :param grid: Dicionário campo -> lista de valores (veja expand_grid).
+    :param path: Arquivo CSV de resultados.
+    :param workers: Número de processos. Se None, usa todos os núcleos.
+    :return: Número de configurações executadas com sucesso nesta chamada.
+    """
+    upgrade_results(path)
+    done = completed_keys(path)
+    pending = [config for config in expand_grid(grid) if config_key(config) not in done]
+    if not pending:
+        return 0
+
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    count = 0
+    with open(path, 'a', newline='') as file, ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = csv.DictWriter(file, fieldnames=CONFIG_FIELDS + RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        futures = {executor.submit(run_config, config): config for config in pending}
+        try:
+            for future in as_completed(futures):
+                try:
+                    row = future.result()
+                except Exception:
+                    # Uma configuração com erro não interrompe as demais; ela é tentada de novo ao retomar
+                    logger.exception("Falha ao executar a configuração %s", futures[future])
+                    continue
+                writer.writerow(row)
+                file.flush()  # Cada linha gravada é uma configuração que não será repetida ao retomar
+                count += 1
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+    return count
+
+def main(argv=None):
+    """
+    Ponto de entrada de linha de comando: executa a varredura de uma grade de configurações.
+    """
+    parser = argparse.ArgumentParser(description="Executa uma varredura de configurações do simulador MESI.")
+    parser.add_argument("results", help="Arquivo CSV de resultados (retomado se já existir)")
+    parser.add_argument("--processors", type=int, nargs="+", default=[DEFAULT_CONFIG['processors']])
+    parser.add_argument("--cache-size", type=int, nargs="+", default=[DEFAULT_CONFIG['cache_size']])
+    parser.add_argument("--memory-size", type=int, nargs="+", default=[DEFAULT_CONFIG['memory_size']])
+    parser.add_argument("--slots", type=int, nargs="+", default=[DEFAULT_CONFIG['slots']])
+    parser.add_argument("--directory", choices=("no", "yes", "both"), default="no",
+                        help="Modo do CacheManager: broadcast, diretório ou ambos")
+    parser.add_argument("--policy", nargs="+", default=[DEFAULT_CONFIG['policy']], choices=sorted(POLICIES))
+    parser.add_argument("--ways", type=int, nargs="+", default=[DEFAULT_CONFIG['ways']])
+    parser.add_argument("--block-size", type=int, nargs="+", default=[DEFAULT_CONFIG['block_size']])
+    parser.add_argument("--protocol", nargs="+", default=["original"], choices=["original"] + sorted(PROTOCOLS),
+                        help="Protocolos de coerência ('original' é a implementação MESI original)")
+    parser.add_argument("--workload", nargs="+", default=[DEFAULT_CONFIG['workload']], choices=sorted(WORKLOADS))
+    parser.add_argument("--operations", type=int, nargs="+", default=[DEFAULT_CONFIG['operations']])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[DEFAULT_CONFIG['seed']])
+    parser.add_argument("--workers", type=int, default=None, help="Número de processos (padrão: todos os núcleos)")
+    args = parser.parse_args(argv)
+
+    grid = {
+        'processors': args.processors,
+        'cache_size': args.cache_size,
+        'memory_size': args.memory_size,
+        'slots': args.slots,
+        'directory': {'no': [False], 'yes': [True], 'both': [False, True]}[args.directory],
+        'policy': args.policy,
+        'ways': args.ways,
+        'block_size': args.block_size,
+        'protocol': [None if protocol == "original" else protocol for protocol in args.protocol],
+        'workload': args.workload,
+        'operations': args.operations,
+        'seed': args.seeds,
+    }
+    start = time.perf_counter()
+    count = sweep(grid, args.results, args.workers)
+    print(f"Configurações executadas: {count}")
+    print(f"Tempo: {time.perf_counter() - start:.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import tkinter as tk
+from tkinter import ttk
+
+class VirtualTable(ttk.Frame):
+    """
+    Tabela virtualizada: um Treeview com um número fixo de linhas visíveis, reaproveitadas conforme a barra de
+    rolagem se move. Apenas as linhas visíveis existem no Treeview, de modo que o custo de desenhar não depende
+    do número total de linhas.
+
+    Os dados vêm de uma função que monta os valores de uma linha pelo índice. Alterações são informadas com
+    invalidate; as linhas visíveis afetadas são redesenhadas juntas quando o Tk fica ocioso.
+    """
+    def __init__(self, master, columns, row_count, row_values, height=20):
+        """
+        Cria a tabela.
+
+        :param master: Widget pai.
+        :param columns: Lista de tuplas (título, largura em pixels) das colunas.
+        :param row_count: Número total de linhas.
+        :param row_values: Função que recebe o índice de uma linha e retorna a tupla de valores das colunas.
+        :param height: Número de linhas visíveis.
+        """
+        super().__init__(master)
+        self.row_count = row_count
+        self.row_values = row_values
+        self.height = height
+        self.offset = 0
+        self.dirty = set()
+        self.pending = None
+
+        names = [f"c{i}" for i in range(len(columns))]
+        self.tree = ttk.Treeview(self, columns=names, show="headings", height=height, selectmode="none")
+        for name, (title, width) in zip(names, columns):
+            self.tree.heading(name, text=title)
+            self.tree.column(name, width=width, stretch=False)
+        for row in range(height):
+            self.tree.insert("", tk.END, iid=str(row))
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+        self.scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_to(self.offset - event.delta // 120 * 3))
+        self.tree.bind("<Button-4>", lambda event: self.scroll_to(self.offset - 3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_to(self.offset + 3))
+        self.refresh()
+
+    def yview(self, *args):
+        """
+        Trata os comandos da barra de rolagem ('moveto' fração ou 'scroll' n 'units'/'pages').
+        """
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * self.row_count))
+        elif args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def scroll_to(self, offset):
+        """
+        Rola a tabela para que a linha especificada seja a primeira visível.
+
+        :param offset: Índice da primeira linha visível.
+        """
+        offset = max(0, min(offset, self.row_count - self.height))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def set_row_count(self, row_count):
+        """
+        Altera o número total de linhas e redesenha a tabela.
+
+        :param row_count: Novo número de linhas.
+        """
+        self.row_count = row_count
+        self.offset = max(0, min(self.offset, row_count - self.height))
+        self.refresh()
+
+    def refresh(self):
+        """
+        Redesenha todas as linhas visíveis e atualiza a barra de rolagem.
+        """
+        self.dirty.clear()
+        for row in range(self.height):
+            index = self.offset + row
+            self.tree.item(str(row), values=self.row_values(index) if index < self.row_count else ())
+        if self.row_count:
+            self.scrollbar.set(self.offset / self.row_count, min(1.0, (self.offset + self.height) / self.row_count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def invalidate(self, index, count=1):
+        """
+        Informa que linhas mudaram. Só as visíveis são marcadas e redesenhadas, quando o Tk ficar ocioso.
+
+        :param index: Índice da primeira linha alterada.
+        :param count: Número de linhas alteradas.
+        """
+        first = max(index, self.offset)
+        last = min(index + count, self.offset + self.height, self.row_count)
+        if first >= last:
+            return
+        self.dirty.update(range(first, last))
+        if self.pending is None:
+            self.pending = self.after_idle(self.flush)
+
+    def flush(self):
+        """
+        Redesenha as linhas marcadas por invalidate que continuam visíveis.
+        """
+        self.pending = None
+        offset = self.offset
+        for index in self.dirty:
+            row = index - offset
+            if 0 <= row < self.height:
+                self.tree.item(str(row), values=self.row_values(index))
+        self.dirty.clear()
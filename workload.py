@@ -0,0 +1,265 @@
+import argparse
+import bisect
+import itertools
+import random
+import sys
+
+DISTRIBUTIONS = ('uniform', 'zipf')
+SHARING = ('none', 'true', 'false')
+
+class SlotSampler:
+    """
+    Sorteia vagas segundo uma popularidade uniforme ou de Zipf. Na distribuição de Zipf a k-ésima vaga mais
+    popular tem peso 1 / k**s, e a ordem de popularidade é uma permutação sorteada das vagas, para que as vagas
+    populares não fiquem todas no início da memória.
+    """
+    def __init__(self, slots, rng, distribution='uniform', zipf_s=1.0):
+        """
+        Inicializa o sorteador. A memória usada é proporcional ao número de vagas, nunca ao de operações.
+
+        :param slots: Conjunto de vagas (um range ou uma lista).
+        :param rng: Instância de random.Random usada nos sorteios.
+        :param distribution: 'uniform' ou 'zipf'.
+        :param zipf_s: Expoente da distribuição de Zipf.
+        :raises ValueError: Se a distribuição for desconhecida ou o conjunto de vagas estiver vazio.
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Distribuição desconhecida: {distribution!r}")
+        if not len(slots):
+            raise ValueError("O conjunto de vagas não pode ser vazio")
+        self.rng = rng
+        self.slots = slots
+        self.cumulative = None
+        if distribution == 'zipf':
+            self.slots = list(slots)
+            rng.shuffle(self.slots)
+            self.cumulative = list(itertools.accumulate(1 / k ** zipf_s for k in range(1, len(slots) + 1)))
+
+    def sample(self):
+        """
+        Sorteia uma vaga.
+
+        :return: Número da vaga.
+        """
+        if self.cumulative is None:
+            return self.slots[self.rng.randrange(len(self.slots))]
+        index = bisect.bisect_right(self.cumulative, self.rng.random() * self.cumulative[-1])
+        return self.slots[min(index, len(self.slots) - 1)]
+
+class WorkloadGenerator:
+    """
+    Gerador preguiçoso de operações de estacionamento no formato de replay.read_trace
+    (processador, operação, vaga, valor).
+
+    Cada operação é uma leitura (check) com probabilidade read_ratio ou uma escrita (park, remove ou move).
+    Um modelo interno do estacionamento, com memória proporcional ao número de vagas, garante que as remoções
+    e mudanças partam de vagas ocupadas por carros do próprio processador. Opcionalmente:
+
+    - affinity: probabilidade de cada processador usar as vagas da sua própria região do estacionamento;
+    - rush_period/rush_length: a cada rush_period operações, as rush_length primeiras são um horário de pico
+      de chegadas (quase só park) e as rush_length seguintes um pico de saídas (quase só remove);
+    - sharing: com probabilidade sharing_ratio a operação vira um read/write direto num endereço compartilhado,
+      o mesmo para todos os processadores ('true') ou um endereço distinto por processador dentro do mesmo
+      bloco de cache ('false').
+
+    Com compartilhamento, os shared_blocks * block_size primeiros endereços ficam reservados aos acessos
+    compartilhados e as operações de estacionamento usam apenas as vagas seguintes, até slots - 1; assim as
+    escritas diretas nunca sobrescrevem um carro estacionado.
+    """
+    def __init__(self, processors=3, slots=10, seed=None, operations=None, read_ratio=0.5, distribution='uniform',
+                 zipf_s=1.0, affinity=0.0, rush_period=0, rush_length=0, move_ratio=0.1, sharing='none',
+                 sharing_ratio=0.0, shared_blocks=1, block_size=1):
+        """
+        Inicializa o gerador.
+
+        :param processors: Número de processadores (identificados de 1 a processors).
+        :param slots: Número de vagas do estacionamento.
+        :param seed: Semente do gerador aleatório; a mesma semente produz a mesma sequência.
+        :param operations: Número de operações a gerar. Se None, o gerador é infinito.
+        :param read_ratio: Fração das operações que são leituras.
+        :param distribution: Popularidade das vagas, 'uniform' ou 'zipf'.
+        :param zipf_s: Expoente da distribuição de Zipf.
+        :param affinity: Probabilidade de um processador escolher uma vaga da sua região.
+        :param rush_period: Período, em operações, dos horários de pico. 0 desativa os picos.
+        :param rush_length: Duração, em operações, de cada pico de chegadas e de saídas.
+        :param move_ratio: Fração das escritas fora dos picos que são mudanças de vaga.
+        :param sharing: Padrão de compartilhamento: 'none', 'true' ou 'false'.
+        :param sharing_ratio: Fração das operações que acessam os endereços compartilhados.
+        :param shared_blocks: Número de blocos de cache com endereços compartilhados, no início da memória e
+                              fora das vagas usadas pelas operações de estacionamento.
+        :param block_size: Tamanho de bloco dos caches, usado pelo compartilhamento falso.
+        :raises ValueError: Se o padrão de compartilhamento for desconhecido ou os endereços compartilhados não
+                            deixarem ao menos uma vaga livre para as operações de estacionamento.
+        """
+        if sharing not in SHARING:
+            raise ValueError(f"Padrão de compartilhamento desconhecido: {sharing!r}")
+        if sharing != 'none' and shared_blocks * block_size >= slots:
+            raise ValueError("Os blocos compartilhados devem deixar vagas livres para o estacionamento")
+        self.processors = processors
+        self.slots = slots
+        self.seed = seed
+        self.operations = operations
+        self.read_ratio = read_ratio
+        self.distribution = distribution
+        self.zipf_s = zipf_s
+        self.affinity = affinity
+        self.rush_period = rush_period
+        self.rush_length = rush_length
+        self.move_ratio = move_ratio
+        self.sharing = sharing
+        self.sharing_ratio = sharing_ratio
+        self.shared_blocks = shared_blocks
+        self.block_size = block_size
+
+    def phase(self, number):
+        """
+        Determina a fase de horário de pico de uma operação.
+
+        :param number: Posição da operação na sequência.
+        :return: 'arrivals', 'departures' ou None fora dos picos.
+        """
+        if not self.rush_period:
+            return None
+        offset = number % self.rush_period
+        if offset < self.rush_length:
+            return 'arrivals'
+        if offset < 2 * self.rush_length:
+            return 'departures'
+        return None
+
+    def __iter__(self):
+        """
+        Gera as operações. Cada iteração recomeça a sequência a partir da semente.
+
+        :return: Gerador de tuplas (processador, operação, vaga, valor).
+        """
+        rng = random.Random(self.seed)
+        first = self.shared_blocks * self.block_size if self.sharing != 'none' else 0  # Primeira vaga de carros
+        sampler = SlotSampler(range(first, self.slots), rng, self.distribution, self.zipf_s)
+        regions = {}
+        if self.affinity:
+            width = max(1, (self.slots - first) // self.processors)
+            for pid in range(1, self.processors + 1):
+                start = min(first + (pid - 1) * width, self.slots - 1)
+                region = range(start, min(start + width, self.slots) if pid < self.processors else self.slots)
+                regions[pid] = SlotSampler(region, rng, self.distribution, self.zipf_s)
+
+        occupied = bytearray(self.slots)           # Modelo do estacionamento: 1 para vaga ocupada
+        parked = {pid: [] for pid in range(1, self.processors + 1)}  # Vagas ocupadas por cada processador
+        next_car = 1
+        counter = range(self.operations) if self.operations is not None else itertools.count()
+        for number in counter:
+            processor_id = rng.randint(1, self.processors)
+
+            if self.sharing != 'none' and rng.random() < self.sharing_ratio:
+                block = rng.randrange(self.shared_blocks)
+                offset = 0 if self.sharing == 'true' else (processor_id - 1) % self.block_size
+                address = block * self.block_size + offset
+                if rng.random() < self.read_ratio:
+                    yield processor_id, 'read', address, 0
+                else:
+                    yield processor_id, 'write', address, rng.randrange(1, 1000)
+                continue
+
+            region = regions.get(processor_id)
+            slot = (region if region is not None and rng.random() < self.affinity else sampler).sample()
+            if rng.random() < self.read_ratio:
+                yield processor_id, 'check', slot, 0
+                continue
+
+            own = parked[processor_id]
+            phase = self.phase(number)
+            if phase == 'arrivals':
+                op = 'park' if rng.random() < 0.9 else 'remove'
+            elif phase == 'departures':
+                op = 'remove' if rng.random() < 0.9 else 'park'
+            elif rng.random() < self.move_ratio:
+                op = 'move'
+            else:
+                op = 'park' if rng.random() < 0.5 else 'remove'
+            if op != 'park' and not own:
+                op = 'park'
+
+            if op == 'park':
+                if not occupied[slot]:
+                    occupied[slot] = 1
+                    own.append(slot)
+                yield processor_id, 'park', slot, next_car
+                next_car += 1
+                continue
+
+            # Remoções e mudanças partem de uma vaga sorteada entre as do próprio processador
+            index = rng.randrange(len(own))
+            from_slot = own[index]
+            if op == 'remove':
+                own[index] = own[-1]
+                own.pop()
+                occupied[from_slot] = 0
+                yield processor_id, 'remove', from_slot, 0
+            else:
+                if not occupied[slot]:
+                    occupied[from_slot] = 0
+                    occupied[slot] = 1
+                    own[index] = slot
+                yield processor_id, 'move', from_slot, slot
+
+def format_record(record):
+    """
+    Formata uma operação como uma linha de trace.
+
+    :param record: Tupla (processador, operação, vaga, valor).
+    :return: Linha no formato "processador operação vaga valor".
+    """
+    processor_id, op, slot, value = record
+    return f"{processor_id} {op} {slot} {value}\n"
+
+def write_trace(records, file):
+    """
+    Grava operações num arquivo de trace legível por replay.read_trace, sem acumulá-las em memória.
+
+    :param records: Iterável de tuplas (processador, operação, vaga, valor).
+    :param file: Arquivo aberto para escrita.
+    :return: Número de operações gravadas.
+    """
+    count = 0
+    for record in records:
+        file.write(format_record(record))
+        count += 1
+    return count
+
+def main(argv=None):
+    """
+    Ponto de entrada de linha de comando: grava um trace sintético na saída padrão ou num arquivo.
+    """
+    parser = argparse.ArgumentParser(description="Gera um trace sintético de operações de estacionamento.")
+    parser.add_argument("operations", type=int, help="Número de operações")
+    parser.add_argument("-o", "--output", help="Arquivo de saída (padrão: saída padrão)")
+    parser.add_argument("--processors", type=int, default=3)
+    parser.add_argument("--slots", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--read-ratio", type=float, default=0.5)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default='uniform')
+    parser.add_argument("--zipf-s", type=float, default=1.0)
+    parser.add_argument("--affinity", type=float, default=0.0)
+    parser.add_argument("--rush-period", type=int, default=0)
+    parser.add_argument("--rush-length", type=int, default=0)
+    parser.add_argument("--move-ratio", type=float, default=0.1)
+    parser.add_argument("--sharing", choices=SHARING, default='none')
+    parser.add_argument("--sharing-ratio", type=float, default=0.0)
+    parser.add_argument("--shared-blocks", type=int, default=1)
+    parser.add_argument("--block-size", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    generator = WorkloadGenerator(args.processors, args.slots, args.seed, args.operations, args.read_ratio,
+                                  args.distribution, args.zipf_s, args.affinity, args.rush_period, args.rush_length,
+                                  args.move_ratio, args.sharing, args.sharing_ratio, args.shared_blocks,
+                                  args.block_size)
+    file = sys.stdout if args.output is None else open(args.output, 'w')
+    try:
+        write_trace(generator, file)
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+if __name__ == "__main__":
+    main()
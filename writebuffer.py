@@ -0,0 +1,102 @@
+class WriteBackBuffer:
+    """
+    Buffer de escrita entre os caches e a memória principal.
+
+    As escritas destinadas à memória (remoções de linhas modificadas e escritas diretas) são guardadas por
+    endereço; uma nova escrita num endereço que já está no buffer substitui o valor anterior (coalescência).
+    O buffer é esvaziado de uma só vez quando atinge a capacidade ou quando drain é chamado, agrupando os
+    endereços consecutivos em escritas de bloco. Leituras de endereços presentes no buffer são atendidas por ele.
+    """
+    def __init__(self, memory, capacity=16):
+        """
+        Inicializa o buffer vazio.
+
+        :param memory: Instância da memória principal.
+        :param capacity: Número de endereços guardados antes de o buffer ser esvaziado.
+        :raises ValueError: Se a capacidade não for positiva.
+        """
+        if capacity < 1:
+            raise ValueError("A capacidade do buffer de escrita deve ser positiva")
+        self.memory = memory
+        self.capacity = capacity
+        self.entries = {}    # endereço -> valor pendente
+        self.writes = 0      # Escritas recebidas
+        self.coalesced = 0   # Escritas que substituíram um valor pendente do mesmo endereço
+        self.drains = 0      # Vezes em que o buffer foi esvaziado
+        self.read_hits = 0   # Leituras atendidas pelo buffer
+
+    def write(self, address, data):
+        """
+        Guarda uma escrita no buffer, esvaziando-o se a capacidade for atingida.
+
+        :param address: Endereço inicial da escrita.
+        :param data: Um valor, ou uma lista de valores para endereços consecutivos.
+        :return: Número de escritas feitas na memória principal (0 se o buffer não foi esvaziado).
+        """
+        entries = self.entries
+        values = data if isinstance(data, list) else (data,)
+        for offset, value in enumerate(values):
+            if address + offset in entries:
+                self.coalesced += 1
+            entries[address + offset] = value
+        self.writes += 1
+        if len(entries) >= self.capacity:
+            return self.drain()
+        return 0
+
+    def read(self, address):
+        """
+        Lê um endereço, preferindo o valor pendente no buffer ao da memória principal.
+
+        :param address: Endereço a ser lido.
+        :return: Valor do endereço.
+        """
+        value = self.entries.get(address)
+        if value is None:
+            return self.memory.read(address)
+        self.read_hits += 1
+        return value
+
+    def read_block(self, address, size):
+        """
+        Lê um bloco da memória principal, sobrepondo os valores pendentes no buffer.
+
+        :param address: Endereço inicial do bloco.
+        :param size: Número de endereços do bloco.
+        :return: Lista com os valores do bloco.
+        """
+        block = self.memory.read_block(address, size)
+        entries = self.entries
+        if entries:
+            for offset in range(size):
+                value = entries.get(address + offset)
+                if value is not None:
+                    block[offset] = value
+                    self.read_hits += 1
+        return block
+
+    def drain(self):
+        """
+        Esvazia o buffer, gravando na memória principal uma escrita por trecho de endereços consecutivos.
+
+        :return: Número de escritas feitas na memória principal.
+        """
+        entries = self.entries
+        if not entries:
+            return 0
+        memory = self.memory
+        count = 0
+        addresses = sorted(entries)
+        start = 0
+        for i in range(1, len(addresses) + 1):
+            if i < len(addresses) and addresses[i] == addresses[i - 1] + 1:
+                continue
+            if i - start == 1:
+                memory.write(addresses[start], entries[addresses[start]])
+            else:
+                memory.write_block(addresses[start], [entries[address] for address in addresses[start:i]])
+            count += 1
+            start = i
+        entries.clear()
+        self.drains += 1
+        return count